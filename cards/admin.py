@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import PCBuild, GeneratedCard
+from django.utils.html import format_html, format_html_join
+from .models import PCBuild, GeneratedCard, RenderJob, StoredFile
 
 
 @admin.register(PCBuild)
@@ -32,10 +33,10 @@ class PCBuildAdmin(admin.ModelAdmin):
 class GeneratedCardAdmin(admin.ModelAdmin):
     """Админка для сгенерированных карточек"""
     
-    list_display = ('build', 'style', 'card_number', 'created_at')
+    list_display = ('build', 'style', 'card_number', 'render_ms', 'created_at')
     list_filter = ('style', 'created_at', 'card_number')
     search_fields = ('build__name', 'build__cpu', 'build__gpu')
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'stage_breakdown')
     
     fieldsets = (
         ('Основная информация', {
@@ -44,8 +45,73 @@ class GeneratedCardAdmin(admin.ModelAdmin):
         ('Изображение', {
             'fields': ('image',)
         }),
+        ('Рендеринг', {
+            'fields': ('stage_breakdown',),
+            'classes': ('collapse',)
+        }),
         ('Метаданные', {
             'fields': ('created_at',),
             'classes': ('collapse',)
         }),
     )
+
+    @admin.display(description='Рендеринг, мс')
+    def render_ms(self, obj):
+        return obj.render_timings.get('total_ms', '—')
+    
+    @admin.display(description='Время этапов')
+    def stage_breakdown(self, obj):
+        """Таблица этапов рендеринга с долей от общего времени"""
+        stages = obj.render_timings.get('stages')
+        if not stages:
+            return 'Нет данных (включите CARDS_PROFILE_STAGES)'
+        
+        total = obj.render_timings.get('total_ms') or 1
+        rows = format_html_join(
+            '',
+            '<tr><td>{}</td><td style="text-align:right">{}</td>'
+            '<td style="text-align:right">{}</td><td style="text-align:right">{}%</td></tr>',
+            (
+                (name, stage['calls'], f"{stage['ms']:.1f}", f"{100 * stage['ms'] / total:.0f}")
+                for name, stage in stages.items()
+            ),
+        )
+        return format_html(
+            '<table><thead><tr><th>Этап</th><th>Вызовов</th><th>мс</th><th>Доля</th></tr></thead>'
+            '<tbody>{}</tbody><tfoot><tr><th>Итого</th><th></th><th style="text-align:right">{}</th><th></th></tr></tfoot></table>',
+            rows,
+            f'{total:.1f}',
+        )
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    """Админка для файлов карточек (счётчики ссылок ведутся автоматически)"""
+    
+    list_display = ('name', 'size', 'refcount', 'created_at', 'released_at')
+    list_filter = ('created_at',)
+    search_fields = ('name',)
+    readonly_fields = ('name', 'size', 'refcount', 'created_at', 'released_at')
+
+
+@admin.register(RenderJob)
+class RenderJobAdmin(admin.ModelAdmin):
+    """Админка для задач фонового рендеринга"""
+    
+    list_display = ('id', 'build', 'style', 'status', 'priority', 'progress', 'total', 'attempts', 'created_at')
+    list_filter = ('status', 'style', 'priority')
+    search_fields = ('build__name',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'worker', 'error')
+    
+    fieldsets = (
+        ('Основная информация', {
+            'fields': ('build', 'style', 'status', 'priority')
+        }),
+        ('Выполнение', {
+            'fields': ('progress', 'total', 'attempts', 'max_attempts', 'available_at', 'worker', 'error')
+        }),
+        ('Метаданные', {
+            'fields': ('created_at', 'started_at', 'finished_at'),
+            'classes': ('collapse',)
+        }),
+    )
@@ -1,7 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cards'
     verbose_name = 'Карточки ПАРТМАРТ'
+
+    def ready(self):
+        # Счётчик ссылок карточек на файлы хранилища
+        from . import signals  # noqa: F401
+        
+        # Прогреваем кэши рендеринга (и шрифты), чтобы не платить за них на первой
+        # карточке: после fork воркеры получают прогретое состояние copy-on-write.
+        # Без CARDS_WARM_UP старт не загружает Pillow - команды вроде migrate его не ждут
+        if getattr(settings, 'CARDS_WARM_UP', False):
+            from .generators import warmup
+            warmup.warm_up(freeze=True)
@@ -0,0 +1,221 @@
+"""
+ZIP-архивы серий карточек
+
+Архив отдаётся потоком: записи пишутся клиенту по мере чтения файлов,
+без сжатия (PNG/JPEG/WebP уже сжаты), поэтому память на скачивание не
+зависит ни от размера серии, ни от числа одновременных загрузок.
+
+При CARDS_SERIES_ARCHIVES архив серии собирается один раз после рендеринга
+и дальше отдаётся как обычный файл (FileResponse -> wsgi.file_wrapper/sendfile).
+Имя архива - хэш имён файлов карточек, так что одинаковые серии (из кэша
+рендеринга) делят один архив. Архив удаляется вместе с карточками серии
+(cards.signals), а архивы без серии убирает collect() при сборке мусора
+хранилища.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+import zipfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .models import GeneratedCard
+from .generators.registry import registry
+
+
+ARCHIVE_DIR = 'archives'
+
+# Размер блока чтения файлов карточек
+CHUNK_SIZE = 64 * 1024
+
+
+def is_enabled():
+    return getattr(settings, 'CARDS_SERIES_ARCHIVES', False)
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Приёмник для ZipFile без seek: накапливает записанное до следующего drain()
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arcname(card):
+    """
+    Имя карточки внутри архива: card_<номер>.<расширение файла>
+    """
+    ext = os.path.splitext(card.image.name)[1]
+    return f'card_{card.card_number}{ext}'
+
+
+def stream_zip(cards):
+    """
+    Генератор байтов ZIP-архива из карточек (ZIP_STORED, потоково)
+    """
+    buffer = _StreamBuffer()
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        for card in cards:
+            if not card.image:
+                continue
+
+            info = zipfile.ZipInfo(arcname(card), _date_time(card))
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = card.image.size
+
+            with card.image.open('rb') as source, archive.open(info, 'w') as entry:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    entry.write(chunk)
+                    yield buffer.drain()
+
+            yield buffer.drain()
+
+    # Центральный каталог
+    yield buffer.drain()
+
+
+def _date_time(card):
+    created = getattr(card, 'created_at', None)
+    if created is None:
+        return time.localtime()[:6]
+    return created.timetuple()[:6]
+
+
+def series_cards(build_id, style):
+    """
+    Карточки серии сборки в стиле style в порядке архива
+    """
+    return list(
+        GeneratedCard.objects
+        .filter(build_id=build_id, style=style)
+        .exclude(image='')
+        .order_by('card_number')
+    )
+
+
+def series_archive_name(cards):
+    """
+    Имя готового архива серии в хранилище
+    """
+    digest = hashlib.sha256()
+    for card in cards:
+        digest.update(f'{arcname(card)}={card.image.name}\n'.encode('utf-8'))
+    key = digest.hexdigest()
+    return f'{ARCHIVE_DIR}/{key[:2]}/{key}.zip'
+
+
+def find_series_archive(cards):
+    """
+    Имя готового архива серии или None
+    """
+    name = series_archive_name(cards)
+    if default_storage.exists(name):
+        return name
+    return None
+
+
+def build_series_archive(cards):
+    """
+    Собирает архив серии в хранилище (если его ещё нет) и возвращает имя
+    """
+    cards = list(cards)
+    name = series_archive_name(cards)
+    if default_storage.exists(name):
+        return name
+
+    with tempfile.TemporaryFile() as tmp:
+        for chunk in stream_zip(cards):
+            tmp.write(chunk)
+        tmp.seek(0)
+        saved = default_storage.save(name, File(tmp))
+
+    if saved != name:
+        # Параллельная сборка того же архива - содержимое одинаковое
+        default_storage.delete(saved)
+    return name
+
+
+def discard_series_archive(build_id, style):
+    """
+    Удаляет архив текущей серии сборки после коммита транзакции
+    Если к тому времени у сборки та же серия (перерендер из кэша), архив остаётся
+    """
+    cards = series_cards(build_id, style)
+    if not cards:
+        return
+    name = series_archive_name(cards)
+
+    def discard():
+        current = series_cards(build_id, style)
+        if not current or series_archive_name(current) != name:
+            default_storage.delete(name)
+
+    transaction.on_commit(discard)
+
+
+def archive_names():
+    """
+    Имена всех архивов в хранилище
+    """
+    if not default_storage.exists(ARCHIVE_DIR):
+        return []
+    shards, _ = default_storage.listdir(ARCHIVE_DIR)
+    names = []
+    for shard in shards:
+        _, files = default_storage.listdir(f'{ARCHIVE_DIR}/{shard}')
+        names.extend(f'{ARCHIVE_DIR}/{shard}/{name}' for name in files)
+    return names
+
+
+def collect():
+    """
+    Удаляет архивы, которые не соответствуют ни одной текущей серии
+    (карточки удалены или перерендерены, файлы собраны collect хранилища)
+    Возвращает (архивов, байт) удалено
+    """
+    # Сначала список файлов, потом серии: архив появляется только после
+    # коммита своих карточек, поэтому свежий архив не будет принят за лишний
+    names = archive_names()
+    if not names:
+        return 0, 0
+
+    series = {}
+    cards = (
+        GeneratedCard.objects
+        .filter(style__in=registry.series_styles())
+        .exclude(image='')
+        .only('id', 'build_id', 'style', 'card_number', 'image')
+        .order_by('build_id', 'style', 'card_number')
+    )
+    for card in cards.iterator():
+        series.setdefault((card.build_id, card.style), []).append(card)
+    current = {series_archive_name(build_cards) for build_cards in series.values()}
+
+    deleted = freed = 0
+    for name in names:
+        if name in current:
+            continue
+        freed += default_storage.size(name)
+        default_storage.delete(name)
+        deleted += 1
+    return deleted, freed
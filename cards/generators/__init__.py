@@ -1,8 +1,12 @@
-from .msi_style import MSIStyleGenerator
-from .steam_style import SteamStyleGenerator
-from .apple_style import AppleStyleGenerator
-from .spotify_style import SpotifyStyleGenerator
-from .mixpc_series import MIXPCSeriesGenerator
+"""
+Генераторы карточек
+
+Модули стилей импортируются лениво (см. registry): импорт пакета не тянет
+Pillow и генераторы, from cards.generators import MSIStyleGenerator
+загружает только msi_style.
+"""
+
+from .registry import BUILTIN_STYLES, import_generator
 
 __all__ = [
     'MSIStyleGenerator',
@@ -11,3 +15,19 @@ __all__ = [
     'SpotifyStyleGenerator',
     'MIXPCSeriesGenerator',
 ]
+
+# Имя класса -> путь к нему
+_GENERATOR_PATHS = {path.rpartition('.')[2]: path for path in BUILTIN_STYLES.values()}
+
+
+def __getattr__(name):
+    path = _GENERATOR_PATHS.get(name)
+    if path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    generator_class = import_generator(path)
+    globals()[name] = generator_class
+    return generator_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
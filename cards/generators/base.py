@@ -1,7 +1,8 @@
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image
 from abc import ABC, abstractmethod
 import os
 from django.conf import settings
+from . import fonts, gradients, photos
 
 
 class BaseCardGenerator(ABC):
@@ -20,60 +21,17 @@ class BaseCardGenerator(ABC):
         if self.fonts_loaded:
             return
         
-        try:
-            # Пытаемся загрузить системные шрифты
-            font_paths = [
-                '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-                '/System/Library/Fonts/Supplemental/Arial Bold.ttf',
-                'C:\\Windows\\Fonts\\arialbd.ttf',
-            ]
-            
-            font_path = None
-            for path in font_paths:
-                if os.path.exists(path):
-                    font_path = path
-                    break
-            
-            if font_path:
-                self.fonts['title'] = ImageFont.truetype(font_path, 72)
-                self.fonts['large'] = ImageFont.truetype(font_path, 48)
-                self.fonts['medium'] = ImageFont.truetype(font_path, 36)
-                self.fonts['small'] = ImageFont.truetype(font_path, 28)
-                self.fonts['tiny'] = ImageFont.truetype(font_path, 20)
-            else:
-                # Fallback на стандартный шрифт
-                self.fonts['title'] = ImageFont.load_default()
-                self.fonts['large'] = ImageFont.load_default()
-                self.fonts['medium'] = ImageFont.load_default()
-                self.fonts['small'] = ImageFont.load_default()
-                self.fonts['tiny'] = ImageFont.load_default()
-            
-            self.fonts_loaded = True
-        except Exception as e:
-            print(f"Error loading fonts: {e}")
-            # Используем стандартный шрифт
-            default_font = ImageFont.load_default()
-            self.fonts = {k: default_font for k in ['title', 'large', 'medium', 'small', 'tiny']}
-            self.fonts_loaded = True
+        # Шрифты берутся из общего реестра процесса
+        sizes = {'title': 72, 'large': 48, 'medium': 36, 'small': 28, 'tiny': 20}
+        for name, size in sizes.items():
+            self.fonts[name] = fonts.get_font(size, bold=True)
+        
+        self.fonts_loaded = True
     
     def load_and_resize_photo(self, target_size):
         """Загрузка и изменение размера фото ПК"""
         try:
-            photo = Image.open(self.pc_build.photo.path)
-            
-            # Конвертируем в RGB если нужно
-            if photo.mode != 'RGB':
-                photo = photo.convert('RGB')
-            
-            # Масштабируем с сохранением пропорций
-            photo.thumbnail(target_size, Image.Resampling.LANCZOS)
-            
-            # Создаем новое изображение с центрированием
-            result = Image.new('RGB', target_size, (0, 0, 0))
-            offset = ((target_size[0] - photo.width) // 2, (target_size[1] - photo.height) // 2)
-            result.paste(photo, offset)
-            
-            return result
+            return photos.load_photo(self.pc_build.photo.path, target_size)
         except Exception as e:
             print(f"Error loading photo: {e}")
             # Возвращаем черное изображение при ошибке
@@ -93,17 +51,7 @@ class BaseCardGenerator(ABC):
     
     def add_gradient_overlay(self, image, color1, color2, direction='vertical'):
         """Добавление градиентного оверлея"""
-        gradient = Image.new('RGBA', image.size, color=(0, 0, 0, 0))
-        draw = ImageDraw.Draw(gradient)
-        
-        if direction == 'vertical':
-            for i in range(image.height):
-                ratio = i / image.height
-                r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-                g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-                b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-                a = int(color1[3] * (1 - ratio) + color2[3] * ratio) if len(color1) > 3 else 255
-                draw.line([(0, i), (image.width, i)], fill=(r, g, b, a))
+        gradient = gradients.gradient(image.size, [color1, color2], direction, mode='RGBA')
         
         return Image.alpha_composite(image.convert('RGBA'), gradient)
     
@@ -1,7 +1,9 @@
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import os
 from django.conf import settings
+from . import blur, fonts, gradients, photos, profiling, render_plan
 
 
 class BaseCardGenerator(ABC):
@@ -12,9 +14,32 @@ class BaseCardGenerator(ABC):
     # Размер карточки для Авито
     CARD_SIZE = (1200, 1200)
     
-    def __init__(self, pc_build):
+    # Версия рендеринга: увеличивайте при любом изменении внешнего вида карточек
+    # стиля - от неё зависит ключ кэша готовых карточек
+    VERSION = 4
+    
+    # Методы карточек серии по порядку; пусто - одна карточка generate()
+    SERIES_CARDS = ()
+    
+    # Номера карточек, которые вообще не читают сборку: рендерятся один раз
+    # на версию генератора и разделяются всеми сборками (см. rendering)
+    SHARED_CARDS = ()
+    
+    def __init__(self, pc_build, scale=1, quality=None):
         self.build = pc_build
-        self.width, self.height = self.CARD_SIZE
+        # Масштаб рендеринга относительно CARD_SIZE (макеты рисуются в любом)
+        self.scale = scale
+        # Качество ресемплинга и размытия фото: None - CARDS_BLUR_QUALITY,
+        # 'draft' - дешёвые фильтры для превью
+        self.quality = quality
+        self.width, self.height = render_plan.scaled(self.CARD_SIZE, scale)
+        # Замеры этапов карточек серии {номер: StageTimings} (см. generate_series)
+        self.stage_timings = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # generate*, _draw_*, _add_* и т.п. стилей - этапы для profiling
+        profiling.instrument(cls)
         
     @abstractmethod
     def generate(self):
@@ -23,59 +48,96 @@ class BaseCardGenerator(ABC):
         """
         pass
     
+    def generate_series(self, workers=None, numbers=None):
+        """
+        Генерирует карточки серии (SERIES_CARDS) по порядку
+        workers: сколько карточек рендерить параллельно (по умолчанию
+        CARDS_RENDER_WORKERS); 1 - последовательно в текущем потоке
+        numbers: номера карточек (с 1), если нужна только часть серии
+        """
+        if numbers is None:
+            numbers = range(1, len(self.SERIES_CARDS) + 1)
+        numbers = list(numbers)
+        
+        if workers is None:
+            workers = getattr(settings, 'CARDS_RENDER_WORKERS', None) or os.cpu_count() or 1
+        workers = min(workers, len(numbers))
+        
+        # Замеры этапов по номерам карточек (при CARDS_PROFILE_STAGES)
+        self.stage_timings = {}
+        
+        if workers <= 1:
+            return [self._render_card(number) for number in numbers]
+        
+        # Карточки независимы; Pillow отпускает GIL в тяжёлых операциях
+        # (resize, filter, paste, convert), поэтому потоков достаточно,
+        # а готовые изображения не нужно передавать между процессами
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='series') as pool:
+            futures = [pool.submit(self._render_card, number) for number in numbers]
+            return [future.result() for future in futures]
+    
+    def _render_card(self, number):
+        """
+        Одна карточка серии по номеру (с 1)
+        """
+        method = getattr(self, self.SERIES_CARDS[number - 1])
+        image, timings = profiling.run(method)
+        if timings is not None:
+            self.stage_timings[number] = timings
+        return image
+    
+    @classmethod
+    def layouts(cls):
+        """
+        Макеты карточек стиля: имя -> layout.Layout
+        """
+        return {}
+    
+    def render_layout(self, name):
+        """
+        Рисует карточку по макету name
+        Макет компилируется один раз на процесс: статичный префикс берётся
+        из кэша, на карточку выполняются только динамические элементы
+        """
+        with profiling.stage('compile_layout'):
+            plan = render_plan.compile_layout(type(self), name, self.scale)
+        return plan.render(self)
+    
+    @profiling.timed
     def load_and_prepare_photo(self, target_size=None):
         """
         Загружает и подготавливает фото ПК
+        Фото декодируется один раз на сборку, размеры берутся из кэша
         """
         if target_size is None:
             target_size = (self.width, int(self.height * 0.6))
         
-        photo = Image.open(self.build.photo.path)
-        photo = photo.convert('RGB')
-        
-        # Масштабируем с сохранением пропорций
-        photo.thumbnail(target_size, Image.Resampling.LANCZOS)
-        
-        # Создаем центрированное изображение
-        result = Image.new('RGB', target_size, (0, 0, 0))
-        offset = ((target_size[0] - photo.width) // 2, 
-                  (target_size[1] - photo.height) // 2)
-        result.paste(photo, offset)
-        
-        return result
+        return photos.load_photo(self.build.photo.path, target_size, quality=self.quality)
+    
+    @profiling.timed
+    def load_blurred_photo(self, target_size, radius):
+        """
+        Размытое фото ПК; размытие считается один раз на сборку
+        """
+        return photos.load_derived(
+            self.build.photo.path,
+            target_size,
+            ('blur', radius, blur.resolve_quality(self.quality)),
+            lambda photo: blur.blur(photo, radius, quality=self.quality),
+            quality=self.quality
+        )
     
+    @profiling.timed
     def create_gradient(self, direction='vertical', colors=None):
         """
         Создает градиентный фон
-        direction: 'vertical', 'horizontal', 'diagonal'
-        colors: [(r,g,b), (r,g,b)] - начальный и конечный цвета
+        direction: 'vertical', 'horizontal', 'diagonal', 'radial'
+        colors: [(r,g,b), (r,g,b), ...] - цвета остановок от начала к концу
         """
         if colors is None:
             colors = [(0, 0, 0), (40, 40, 40)]
         
-        img = Image.new('RGB', self.CARD_SIZE, colors[0])
-        draw = ImageDraw.Draw(img)
-        
-        if direction == 'vertical':
-            for i in range(self.height):
-                ratio = i / self.height
-                color = self._interpolate_color(colors[0], colors[1], ratio)
-                draw.line([(0, i), (self.width, i)], fill=color)
-        elif direction == 'horizontal':
-            for i in range(self.width):
-                ratio = i / self.width
-                color = self._interpolate_color(colors[0], colors[1], ratio)
-                draw.line([(i, 0), (i, self.height)], fill=color)
-        elif direction == 'diagonal':
-            for i in range(self.width + self.height):
-                ratio = i / (self.width + self.height)
-                color = self._interpolate_color(colors[0], colors[1], ratio)
-                for x in range(self.width):
-                    y = i - x
-                    if 0 <= y < self.height:
-                        draw.point((x, y), fill=color)
-        
-        return img
+        return gradients.gradient((self.width, self.height), colors, direction)
     
     def _interpolate_color(self, color1, color2, ratio):
         """
@@ -83,12 +145,13 @@ class BaseCardGenerator(ABC):
         """
         return tuple(int(color1[i] + (color2[i] - color1[i]) * ratio) for i in range(3))
     
+    @profiling.timed
     def add_glass_effect(self, img, blur_radius=10, opacity=180):
         """
         Добавляет эффект матового стекла (frosted glass)
         """
-        # Создаем размытую версию
-        blurred = img.filter(ImageFilter.GaussianBlur(blur_radius))
+        # Создаем размытую версию (в уменьшенном масштабе, см. generators.blur)
+        blurred = blur.blur(img, blur_radius, quality=self.quality)
         
         # Создаем полупрозрачный белый слой
         glass_overlay = Image.new('RGBA', img.size, (255, 255, 255, opacity))
@@ -122,31 +185,9 @@ class BaseCardGenerator(ABC):
     
     def get_font(self, size, bold=False):
         """
-        Загружает шрифт нужного размера
-        """
-        try:
-            if bold:
-                # Попытка загрузить жирный шрифт
-                font_paths = [
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-                    'C:\\Windows\\Fonts\\arialbd.ttf',
-                    '/System/Library/Fonts/Helvetica.ttc',
-                ]
-            else:
-                font_paths = [
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-                    'C:\\Windows\\Fonts\\arial.ttf',
-                    '/System/Library/Fonts/Helvetica.ttc',
-                ]
-            
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    return ImageFont.truetype(font_path, size)
-            
-            # Fallback на дефолтный
-            return ImageFont.load_default()
-        except:
-            return ImageFont.load_default()
+        Возвращает шрифт нужного размера из реестра шрифтов
+        """
+        return fonts.get_font(size, bold=bold)
     
     def format_price(self, price):
         """
@@ -0,0 +1,138 @@
+"""
+Кэши готовых изображений на уровне процесса
+
+Фоны, спрайты и прочие заготовки, которые зависят только от констант стиля,
+рендерятся один раз на воркер. Наружу всегда отдаётся copy() - закэшированный
+оригинал никто не меняет.
+"""
+
+from collections import OrderedDict
+import threading
+
+from django.conf import settings
+
+
+_registry = {}
+
+
+class ImageCache:
+    """
+    Ограниченный LRU-кэш изображений со счётчиками попаданий/промахов
+    """
+
+    def __init__(self, name, maxsize=32):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def get(self, key, factory, copy=True):
+        """
+        Возвращает копию изображения по ключу, при промахе строит его через factory()
+        copy=False отдаёт сам закэшированный объект - только для чтения
+        """
+        image = self._lookup(key)
+
+        if image is None:
+            # Параллельные промахи по одному ключу строят изображение один раз
+            with self._pending_lock(key):
+                image = self._peek(key)
+                if image is None:
+                    try:
+                        image = factory()
+                        # Декодируем заранее, чтобы копии не тянули ленивую загрузку
+                        image.load()
+                        self._store(key, image)
+                    finally:
+                        with self._lock:
+                            self._pending.pop(key, None)
+
+        return image.copy() if copy else image
+
+    def _lookup(self, key):
+        with self._lock:
+            image = self._items.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def _peek(self, key):
+        with self._lock:
+            return self._items.get(key)
+
+    def _pending_lock(self, key):
+        with self._lock:
+            return self._pending.setdefault(key, threading.Lock())
+
+    def _store(self, key, image):
+        with self._lock:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        """
+        Очищает кэш и сбрасывает счётчики
+        """
+        with self._lock:
+            self._items.clear()
+            self._pending.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Счётчики кэша для логов и диагностики
+        """
+        return {
+            'name': self.name,
+            'size': len(self._items),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def stats():
+    """
+    Счётчики всех кэшей изображений процесса
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def clear_all():
+    """
+    Очищает все кэши изображений процесса
+    """
+    for cache in _registry.values():
+        cache.clear()
+
+
+# Фоны макетов со статичным префиксом (generators.render_plan): ключ (стиль, макет, размер, версия)
+backgrounds = ImageCache(
+    'backgrounds',
+    maxsize=getattr(settings, 'CARDS_BACKGROUND_CACHE_SIZE', 24)
+)
+
+# Спрайты статичных групп макетов (логотипы, заголовки, декор поверх фото):
+# ключ (стиль, макет, размер, версия, группа, полоса)
+static_layers = ImageCache(
+    'static_layers',
+    maxsize=getattr(settings, 'CARDS_STATIC_LAYER_CACHE_SIZE', 32)
+)
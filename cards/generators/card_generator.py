@@ -1,10 +1,5 @@
-from PIL import Image
-import os
-from django.conf import settings
-from .msi_style import MSIStyleGenerator
-from .steam_style import SteamStyleGenerator
-from .apple_style import AppleStyleGenerator
-from .spotify_style import SpotifyStyleGenerator
+from . import encoders, profiling
+from .registry import registry
 
 
 class CardGenerator:
@@ -12,16 +7,14 @@ class CardGenerator:
     Главный класс для генерации карточек в разных стилях
     """
     
-    GENERATORS = {
-        'msi': MSIStyleGenerator,
-        'steam': SteamStyleGenerator,
-        'apple': AppleStyleGenerator,
-        'spotify': SpotifyStyleGenerator,
-    }
+    # Стиль -> класс генератора; модули стилей импортируются при первом обращении
+    GENERATORS = registry
     
-    def __init__(self, pc_build):
+    def __init__(self, pc_build, style=None):
         self.build = pc_build
-        self.style = pc_build.style
+        self.style = style or getattr(pc_build, 'style', 'msi')
+        # Замеры этапов {(стиль, номер): StageTimings} при CARDS_PROFILE_STAGES
+        self.stage_timings = {}
         
     def generate(self):
         """
@@ -32,21 +25,52 @@ class CardGenerator:
             raise ValueError(f"Неизвестный стиль: {self.style}")
         
         generator = generator_class(self.build)
-        output_path = self._get_output_path()
+        profile = encoders.profile_for(self.style)
         
         # Генерируем изображение
         img = generator.generate()
         
-        # Сохраняем
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        img.save(output_path, 'PNG', quality=95, optimize=True)
+        # Сохраняем в формате профиля стиля, имя - хэш содержимого
+        from .. import storage
+        encoded = encoders.encode(img, profile)
         
-        # Возвращаем относительный путь для Django
-        return os.path.relpath(output_path, settings.MEDIA_ROOT)
+        # Возвращаем имя файла в хранилище для ImageField
+        return storage.save(encoded.data, encoded.ext).name
     
-    def _get_output_path(self):
+    def generate_all(self, styles=None, workers=None):
         """
-        Генерирует путь для сохранения карточки
+        Рендерит сборку во всех (или перечисленных) стилях за один проход
+        Фото декодируется один раз, шрифты и размытия берутся из общих
+        кэшей процесса, поэтому каждый следующий стиль дешевле первого
+        Возвращает {стиль: [изображения]} в порядке стилей
         """
-        filename = f"partmart_{self.build.pk}_{self.style}.png"
-        return os.path.join(settings.MEDIA_ROOT, 'generated', filename)
+        styles = styles or list(self.GENERATORS)
+        
+        return {
+            style: list(self.render(style, workers=workers).values())
+            for style in styles
+        }
+    
+    def render(self, style=None, numbers=None, workers=None):
+        """
+        Рендерит карточки одного стиля
+        numbers: номера карточек серии (для стилей с одной карточкой - только 1)
+        Возвращает {номер карточки: изображение}
+        """
+        style = style or self.style
+        generator_class = self.GENERATORS.get(style)
+        if not generator_class:
+            raise ValueError(f"Неизвестный стиль: {style}")
+        
+        generator = generator_class(self.build)
+        if generator.SERIES_CARDS:
+            numbers = list(numbers or range(1, len(generator.SERIES_CARDS) + 1))
+            images = generator.generate_series(workers=workers, numbers=numbers)
+            for number, timings in generator.stage_timings.items():
+                self.stage_timings[(style, number)] = timings
+            return dict(zip(numbers, images))
+        
+        image, timings = profiling.run(generator.generate)
+        if timings is not None:
+            self.stage_timings[(style, 1)] = timings
+        return {1: image}
@@ -0,0 +1,211 @@
+"""
+Кодирование готовых карточек
+
+Профиль вывода задаёт формат и параметры кодека. Карточки с фото по
+умолчанию сохраняются в progressive JPEG (в разы быстрее и меньше PNG),
+плоские информационные карточки MIXPC - в PNG с палитрой. WebP и AVIF
+доступны как профили и включаются через CARDS_OUTPUT_PROFILES.
+
+Кодеки Pillow отпускают GIL, поэтому submit() кодирует в пуле потоков,
+пока поток рендеринга рисует следующие карточки.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import threading
+import time
+
+from django.conf import settings
+
+
+PROFILES = {
+    'png': {
+        'format': 'PNG',
+        'ext': 'png',
+        'options': {'compress_level': 6},
+    },
+    # Плоские карточки без фото: 256 цветов без дизеринга
+    'palette': {
+        'format': 'PNG',
+        'ext': 'png',
+        'colors': 256,
+        'options': {'optimize': True},
+    },
+    'jpeg': {
+        'format': 'JPEG',
+        'ext': 'jpg',
+        'options': {'quality': 90, 'progressive': True, 'optimize': True},
+    },
+    # Превью формы создания: быстрое кодирование важнее размера
+    'preview': {
+        'format': 'JPEG',
+        'ext': 'jpg',
+        'options': {'quality': 80},
+    },
+    'webp': {
+        'format': 'WEBP',
+        'ext': 'webp',
+        'options': {'quality': 85, 'method': 4},
+    },
+    'avif': {
+        'format': 'AVIF',
+        'ext': 'avif',
+        'options': {'quality': 70, 'speed': 6},
+        # Pillow без libavif
+        'fallback': 'webp',
+    },
+}
+
+# Профиль по стилю или по 'стиль:номер' для отдельных карточек серии
+DEFAULT_STYLE_PROFILES = {
+    'msi': 'jpeg',
+    'steam': 'jpeg',
+    'apple': 'jpeg',
+    'spotify': 'jpeg',
+    'mixpc': 'jpeg',
+    'mixpc:2': 'palette',
+    'mixpc:3': 'palette',
+    'mixpc:5': 'palette',
+    'mixpc:6': 'palette',
+}
+
+DEFAULT_PROFILE = 'png'
+
+# Форматы Pillow, для которых нужен отдельный модуль кодека
+_FEATURES = {'WEBP': 'webp', 'AVIF': 'avif'}
+
+Encoded = namedtuple('Encoded', ['data', 'profile', 'format', 'ext', 'seconds'])
+
+
+def style_profiles():
+    """
+    Профили по стилям с учётом CARDS_OUTPUT_PROFILES
+    """
+    profiles = dict(DEFAULT_STYLE_PROFILES)
+    profiles.update(getattr(settings, 'CARDS_OUTPUT_PROFILES', {}))
+    return profiles
+
+
+def profile_for(style, number=1):
+    """
+    Имя профиля для карточки стиля style с номером number
+    """
+    profiles = style_profiles()
+    name = profiles.get(f'{style}:{number}') or profiles.get(style) or DEFAULT_PROFILE
+    return resolve(name)
+
+
+def resolve(name):
+    """
+    Имя профиля, который реально поддерживается сборкой Pillow
+    """
+    seen = set()
+    while name not in seen:
+        seen.add(name)
+        profile = PROFILES.get(name)
+        if profile is None:
+            raise ValueError(f"Неизвестный профиль вывода: {name}")
+        if is_supported(name):
+            return name
+        name = profile.get('fallback', DEFAULT_PROFILE)
+    return DEFAULT_PROFILE
+
+
+def is_supported(name):
+    # Pillow импортируется при первом кодировании, а не вместе с профилями:
+    # модуль читают URLconf и модели (через render_cache и rendering)
+    from PIL import features
+
+    feature = _FEATURES.get(PROFILES[name]['format'])
+    return feature is None or features.check(feature)
+
+
+def extension(name):
+    return PROFILES[name]['ext']
+
+
+def encode(image, name):
+    """
+    Кодирует изображение по профилю name
+    Метаданные не пишутся, поэтому одинаковые изображения дают одинаковые байты
+    """
+    from PIL import Image
+
+    profile = PROFILES[name]
+    started = time.perf_counter()
+
+    if profile.get('colors'):
+        image = image.convert('RGB').quantize(profile['colors'], dither=Image.Dither.NONE)
+    elif profile['format'] == 'JPEG' or image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, profile['format'], **profile['options'])
+
+    return Encoded(
+        data=buffer.getvalue(),
+        profile=name,
+        format=profile['format'],
+        ext=profile['ext'],
+        seconds=time.perf_counter() - started,
+    )
+
+
+def encode_file(image, path, name):
+    """
+    Кодирует и записывает в файл; возвращает Encoded
+    """
+    encoded = encode(image, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(encoded.data)
+    return encoded
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Пул кодирования процесса; после fork создаётся заново
+    """
+    global _executor, _executor_pid
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            workers = getattr(settings, 'CARDS_ENCODE_WORKERS', None) or os.cpu_count() or 1
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='card-encode')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def submit(image, name):
+    """
+    Кодирует в фоновом потоке; возвращает Future с Encoded
+    """
+    return _get_executor().submit(encode, image, name)
+
+
+def report(image, names=None):
+    """
+    Размер и время кодирования изображения во всех (или перечисленных) профилях
+    Возвращает список {'profile', 'format', 'bytes', 'seconds'};
+    неподдерживаемые профили пропускаются
+    """
+    names = names or list(PROFILES)
+    results = []
+    for name in names:
+        if not is_supported(name):
+            continue
+        encoded = encode(image, name)
+        results.append({
+            'profile': name,
+            'format': encoded.format,
+            'bytes': len(encoded.data),
+            'seconds': encoded.seconds,
+        })
+    return results
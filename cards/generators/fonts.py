@@ -0,0 +1,151 @@
+"""
+Реестр шрифтов
+
+Пути к шрифтам ищутся один раз, объекты FreeTypeFont кэшируются по
+(семейство, начертание, размер) на весь процесс. Шрифты, положенные в
+cards/fonts/ (или в каталоги из CARDS_FONT_DIRS), имеют приоритет над
+системными.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from PIL import ImageFont
+
+
+# Каталог со шрифтами, которые поставляются вместе с проектом
+BUNDLED_FONTS_DIR = Path(__file__).resolve().parent.parent / 'fonts'
+
+# Семейства: имена файлов для поиска в каталогах проекта и системные пути
+FONT_FAMILIES = {
+    'sans': {
+        'regular': {
+            'files': ['DejaVuSans.ttf', 'arial.ttf'],
+            'system': [
+                '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+                'C:\\Windows\\Fonts\\arial.ttf',
+                '/System/Library/Fonts/Helvetica.ttc',
+            ],
+        },
+        'bold': {
+            'files': ['DejaVuSans-Bold.ttf', 'arialbd.ttf'],
+            'system': [
+                '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+                'C:\\Windows\\Fonts\\arialbd.ttf',
+                '/System/Library/Fonts/Helvetica.ttc',
+            ],
+        },
+    },
+}
+
+# Размеры, которые используют стили - их загружаем при старте
+PRELOAD_SIZES = {
+    'regular': [14, 18, 20, 22, 24, 28, 32, 48],
+    'bold': [15, 16, 18, 20, 22, 26, 28, 32, 36, 38, 42, 48, 56, 64, 68, 72, 88],
+}
+
+
+class FontRegistry:
+    """
+    Кэш путей к шрифтам и загруженных объектов FreeTypeFont
+    """
+
+    def __init__(self, families=None):
+        self.families = families or FONT_FAMILIES
+        self._paths = {}
+        self._fonts = {}
+        self._lock = threading.Lock()
+
+    def font_dirs(self):
+        """
+        Каталоги проекта, в которых ищутся шрифты
+        """
+        dirs = [Path(path) for path in getattr(settings, 'CARDS_FONT_DIRS', [])]
+        dirs.append(BUNDLED_FONTS_DIR)
+        return dirs
+
+    def resolve(self, family='sans', weight='regular'):
+        """
+        Путь к файлу шрифта или None, если ничего не найдено
+        """
+        key = (family, weight)
+        if key not in self._paths:
+            self._paths[key] = self._find_path(family, weight)
+        return self._paths[key]
+
+    def _find_path(self, family, weight):
+        variants = self.families.get(family, {}).get(weight)
+        if not variants:
+            return None
+
+        for font_dir in self.font_dirs():
+            for filename in variants['files']:
+                path = font_dir / filename
+                if path.exists():
+                    return str(path)
+
+        for path in variants['system']:
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    def get(self, size, family='sans', weight='regular'):
+        """
+        Шрифт нужного размера; загружается только при первом обращении
+        """
+        key = (family, weight, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            return font
+
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                font = self._load(size, family, weight)
+                self._fonts[key] = font
+        return font
+
+    def _load(self, size, family, weight):
+        path = self.resolve(family, weight)
+        if path:
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                pass
+        # Fallback на встроенный шрифт Pillow
+        return ImageFont.load_default(size)
+
+    def preload(self, sizes=None, family='sans'):
+        """
+        Заранее загружает шрифты, чтобы первая карточка не платила за них
+        sizes: {'regular': [...], 'bold': [...]}, по умолчанию PRELOAD_SIZES
+        Возвращает количество загруженных шрифтов
+        """
+        sizes = sizes or PRELOAD_SIZES
+        count = 0
+        for weight, weight_sizes in sizes.items():
+            for size in weight_sizes:
+                self.get(size, family, weight)
+                count += 1
+        return count
+
+    def clear(self):
+        """
+        Сбрасывает найденные пути и загруженные шрифты
+        """
+        with self._lock:
+            self._paths.clear()
+            self._fonts.clear()
+
+
+registry = FontRegistry()
+
+
+def get_font(size, bold=False, family='sans'):
+    """
+    Шрифт из реестра процесса
+    """
+    return registry.get(size, family, 'bold' if bold else 'regular')
@@ -0,0 +1,149 @@
+"""
+Движок градиентов и альфа-рамп
+
+Все градиенты строятся целиком на стороне Pillow (C-код), без попиксельных
+и построчных циклов на Python:
+
+1. Геометрия градиента - это 'L'-рампа, где значение пикселя (0..255)
+   означает позицию t от начала до конца градиента. Рампы получаются из
+   Image.linear_gradient / Image.radial_gradient с последующим resize.
+2. Цвет накладывается через таблицы (LUT) по каждому каналу - один
+   вызов point() на канал.
+"""
+
+from PIL import Image, ImageChops
+
+
+DIRECTIONS = ('vertical', 'horizontal', 'diagonal', 'radial')
+
+
+def ramp(size, direction='vertical', start=0.0, end=1.0):
+    """
+    Создаёт 'L'-рампу заданного размера
+    direction: 'vertical', 'horizontal', 'diagonal', 'radial'
+    start, end: доли (0..1) по направлению градиента, между которыми идёт
+    переход 0 -> 255; до start значение 0, после end - 255
+    """
+    width, height = size
+
+    if direction == 'vertical':
+        result = Image.linear_gradient('L').resize(size, Image.Resampling.BILINEAR)
+    elif direction == 'horizontal':
+        result = Image.linear_gradient('L').transpose(Image.Transpose.ROTATE_90)
+        result = result.resize(size, Image.Resampling.BILINEAR)
+    elif direction == 'diagonal':
+        # t = (x + y) / (w + h): сумма горизонтальной и вертикальной рамп,
+        # каждая масштабирована пропорционально своей стороне
+        share_x = width / (width + height)
+        horizontal = ramp(size, 'horizontal').point(lambda v: int(v * share_x))
+        vertical = ramp(size, 'vertical').point(lambda v: int(v * (1 - share_x)))
+        result = ImageChops.add(horizontal, vertical)
+    elif direction == 'radial':
+        # 0 в центре, 255 в углах
+        result = Image.radial_gradient('L').resize(size, Image.Resampling.BILINEAR)
+    else:
+        raise ValueError(f"Неизвестное направление градиента: {direction}")
+
+    if start > 0.0 or end < 1.0:
+        result = result.point(_window_lut(start, end))
+
+    return result
+
+
+def gradient(size, colors, direction='vertical', mode='RGB', start=0.0, end=1.0):
+    """
+    Создаёт цветной градиент
+    colors: список цветов, равномерно распределённых по градиенту,
+    или список пар (позиция 0..1, цвет) для multi-stop градиента
+    mode: 'RGB' или 'RGBA'
+    """
+    return colorize(ramp(size, direction, start, end), colors, mode)
+
+
+def alpha_ramp(size, start_alpha=0, end_alpha=255, direction='vertical', start=0.0, end=1.0):
+    """
+    Создаёт 'L'-маску прозрачности от start_alpha к end_alpha
+    Удобна как mask для paste() или как альфа-канал через putalpha()
+    """
+    mask = ramp(size, direction, start, end)
+    if start_alpha == 0 and end_alpha == 255:
+        return mask
+    return mask.point(_channel_lut([(0.0, start_alpha), (1.0, end_alpha)]))
+
+
+def colorize(mask, colors, mode='RGB'):
+    """
+    Раскрашивает 'L'-рампу по списку цветовых остановок
+    """
+    stops = _normalize_stops(colors)
+    channels = len(mode)
+
+    bands = []
+    for channel in range(channels):
+        values = [(position, _channel(color, channel)) for position, color in stops]
+        bands.append(mask.point(_channel_lut(values)))
+
+    return Image.merge(mode, bands)
+
+
+def _normalize_stops(colors):
+    """
+    Приводит цвета к списку (позиция, цвет), отсортированному по позиции
+    """
+    if not colors:
+        raise ValueError("Для градиента нужен хотя бы один цвет")
+
+    first = colors[0]
+    if len(first) == 2 and isinstance(first[1], (tuple, list)):
+        return sorted(colors, key=lambda stop: stop[0])
+
+    if len(colors) == 1:
+        return [(0.0, colors[0]), (1.0, colors[0])]
+
+    last = len(colors) - 1
+    return [(i / last, color) for i, color in enumerate(colors)]
+
+
+def _channel(color, index):
+    """
+    Значение канала цвета; отсутствующий альфа-канал считается непрозрачным
+    """
+    if index < len(color):
+        return color[index]
+    return 255
+
+
+def _channel_lut(stops):
+    """
+    Таблица из 256 значений канала с линейной интерполяцией между остановками
+    stops: [(позиция 0..1, значение 0..255), ...] по возрастанию позиции
+    """
+    lut = []
+    segment = 0
+    for i in range(256):
+        t = i / 255
+        while segment < len(stops) - 2 and t > stops[segment + 1][0]:
+            segment += 1
+
+        pos1, value1 = stops[segment]
+        pos2, value2 = stops[min(segment + 1, len(stops) - 1)]
+
+        if t <= pos1 or pos2 <= pos1:
+            value = value1 if t <= pos1 else value2
+        elif t >= pos2:
+            value = value2
+        else:
+            ratio = (t - pos1) / (pos2 - pos1)
+            value = value1 + (value2 - value1) * ratio
+        lut.append(int(value))
+
+    return lut
+
+
+def _window_lut(start, end):
+    """
+    Таблица, растягивающая участок [start, end] рампы на весь диапазон 0..255
+    """
+    lo = start * 255
+    span = max((end - start) * 255, 1)
+    return [min(255, max(0, int((i - lo) * 255 / span))) for i in range(256)]
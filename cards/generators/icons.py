@@ -0,0 +1,417 @@
+"""
+Атлас цветных иконок характеристик и fallback для эмодзи в тексте
+
+Названия характеристик (PCBuild.get_specs_list) и бонусы начинаются с
+эмодзи, которых нет в DejaVu - вместо них рисовались пустые квадраты.
+Иконки берутся из атласа: на каждый размер - один RGBA-лист со всеми
+иконками, который строится один раз на процесс. Вывод иконки - одно
+наложение спрайта.
+
+Источник иконки - PNG <ключ>.png из каталогов CARDS_ICON_DIRS или
+cards/icons/ (например, Twemoji или Noto Emoji нужного размера). Если
+PNG нет, иконка рисуется встроенной векторной отрисовкой в масштабе
+MASTER_SIZE и уменьшается.
+
+Текст со смесью эмодзи и кириллицы разбивается на прогоны (runs): эмодзи
+с иконкой - спрайт, символы, которые есть в шрифте - текст, остальные
+(квадраты) пропускаются. Наличие глифа проверяется один раз на
+(шрифт, символ).
+"""
+
+import functools
+import math
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, ImageDraw
+
+from .cache import ImageCache
+
+
+# Каталог с PNG иконками, которые поставляются вместе с проектом
+BUNDLED_ICONS_DIR = Path(__file__).resolve().parent.parent / 'icons'
+
+# Ключ иконки -> эмодзи
+ICONS = {
+    'cpu': '🖥',
+    'gpu': '🎮',
+    'ram': '💾',
+    'storage': '💿',
+    'motherboard': '🔌',
+    'psu': '⚡',
+    'case': '📦',
+    'cooling': '❄',
+    'gift': '🎁',
+    'sparkles': '✨',
+}
+
+EMOJI = {emoji: key for key, emoji in ICONS.items()}
+
+# Вариационный селектор эмодзи и соединитель - сами по себе не рисуются
+INVISIBLE = {'\ufe0f', '\ufe0e', '\u200d'}
+
+# Размер, в котором рисуются встроенные иконки перед уменьшением (сетка 128x128 x2)
+MASTER_SIZE = 256
+
+atlas = ImageCache(
+    'icons',
+    maxsize=getattr(settings, 'CARDS_ICON_CACHE_SIZE', 16)
+)
+
+
+class IconRun(str):
+    """
+    Прогон-иконка в тексте: строка - ключ иконки
+    """
+
+
+def icon_dirs():
+    dirs = [Path(path) for path in getattr(settings, 'CARDS_ICON_DIRS', [])]
+    dirs.append(BUNDLED_ICONS_DIR)
+    return dirs
+
+
+def key_for(text):
+    """
+    Ключ иконки для эмодзи (с вариационным селектором и пробелами) или самого ключа
+    """
+    text = ''.join(char for char in text.strip() if char not in INVISIBLE)
+    if text in ICONS:
+        return text
+    return EMOJI.get(text)
+
+
+def sheet(size):
+    """
+    Лист атласа для размера size: иконки в ряд, границы - в info['boxes']
+    Общий для процесса - не изменять
+    """
+    return atlas.get(size, lambda: _build_sheet(size), copy=False)
+
+
+def sprite(key, size):
+    """
+    Иконка key размера size x size (RGBA)
+    """
+    icons = sheet(size)
+    return icons.crop(icons.info['boxes'][key])
+
+
+def paste(card, key, xy, size):
+    """
+    Накладывает иконку на карточку одной операцией
+    """
+    icon = sprite(key, size)
+    card.paste(icon, tuple(xy), icon)
+
+
+def _build_sheet(size):
+    sheet_image = Image.new('RGBA', (size * len(ICONS), size), (0, 0, 0, 0))
+    boxes = {}
+    for i, key in enumerate(ICONS):
+        sheet_image.paste(_render(key, size), (i * size, 0))
+        boxes[key] = (i * size, 0, (i + 1) * size, size)
+    sheet_image.info['boxes'] = boxes
+    return sheet_image
+
+
+def _render(key, size):
+    master = _load_png(key) or _master(key)
+    return _fit(master, size)
+
+
+def _load_png(key):
+    for icon_dir in icon_dirs():
+        path = icon_dir / f'{key}.png'
+        if path.exists():
+            with Image.open(path) as image:
+                return image.convert('RGBA')
+    return None
+
+
+def _fit(image, size):
+    """
+    Вписывает иконку в квадрат size x size по центру
+    """
+    scale = size / max(image.size)
+    width = max(1, round(image.width * scale))
+    height = max(1, round(image.height * scale))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    result = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    result.paste(resized, ((size - width) // 2, (size - height) // 2))
+    return result
+
+
+# === Глифы ===
+
+_glyphs = {}
+_glyphs_lock = threading.Lock()
+
+
+def has_glyph(font, char):
+    """
+    Есть ли символ в шрифте (а не квадрат .notdef); кэшируется на (шрифт, символ)
+    """
+    path = getattr(font, 'path', None)
+    if path is None:
+        return True
+
+    key = (path, getattr(font, 'index', 0), char)
+    present = _glyphs.get(key)
+    if present is None:
+        present = _mask_key(font, char) != _mask_key(font, '\uffff')
+        with _glyphs_lock:
+            _glyphs[key] = present
+    return present
+
+
+def _mask_key(font, char):
+    mask = font.getmask(char)
+    return mask.size, bytes(mask)
+
+
+@functools.lru_cache(maxsize=4096)
+def runs(font, text):
+    """
+    Текст как кортеж прогонов: str - текст шрифтом, IconRun - иконка
+    Символы без глифа и без иконки пропускаются
+    """
+    result = []
+    buffer = []
+    for char in text:
+        if char in INVISIBLE:
+            continue
+        key = EMOJI.get(char)
+        if key is None:
+            if has_glyph(font, char):
+                buffer.append(char)
+            continue
+        if buffer:
+            result.append(''.join(buffer))
+            buffer = []
+        result.append(IconRun(key))
+    if buffer:
+        result.append(''.join(buffer))
+    return tuple(result)
+
+
+def is_plain(text_runs, text):
+    """
+    Текст рисуется шрифтом как есть - без иконок и пропущенных символов
+    """
+    return text_runs == (text,) or (not text and not text_runs)
+
+
+def icon_offset(font):
+    """
+    Размер иконки в строке шрифта и её сдвиг от верха строки
+    """
+    ascent, descent = font.getmetrics()
+    size = font.size
+    return size, (ascent + descent - size) // 2
+
+
+def runs_bbox(draw, xy, text_runs, font):
+    """
+    Границы текста с иконками, нарисованного в точке xy
+    """
+    x, y = xy
+    size, top = icon_offset(font)
+    left, upper, right, lower = x, y + top, x, y + top + size
+
+    cursor = x
+    for run in text_runs:
+        if isinstance(run, IconRun):
+            cursor += size
+            continue
+        box = draw.textbbox((cursor, y), run, font=font)
+        upper, lower = min(upper, box[1]), max(lower, box[3])
+        cursor += font.getlength(run)
+    return left, upper, max(right, round(cursor)), lower
+
+
+def draw_runs(card, draw, xy, text_runs, font, fill, icons=True):
+    """
+    Рисует текст с иконками; icons=False - только текст (для тени)
+    """
+    x, y = xy
+    size, top = icon_offset(font)
+
+    cursor = x
+    for run in text_runs:
+        if isinstance(run, IconRun):
+            if icons:
+                paste(card, run, (round(cursor), y + top), size)
+            cursor += size
+            continue
+        draw.text((round(cursor), y), run, fill=fill, font=font)
+        cursor += font.getlength(run)
+
+
+# === Встроенные иконки ===
+
+@functools.lru_cache(maxsize=None)
+def _master(key):
+    """
+    Встроенная иконка в масштабе MASTER_SIZE (общая - не изменять)
+    """
+    image = Image.new('RGBA', (MASTER_SIZE, MASTER_SIZE), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    scale = MASTER_SIZE / 128
+    DRAWERS[key](_ScaledDraw(draw, scale))
+    return image
+
+
+class _ScaledDraw:
+    """
+    ImageDraw в координатах 128x128
+    """
+
+    def __init__(self, draw, scale):
+        self.draw = draw
+        self.scale = scale
+
+    def _xy(self, values):
+        return [value * self.scale for value in values]
+
+    def _points(self, points):
+        return [(x * self.scale, y * self.scale) for x, y in points]
+
+    def rect(self, box, fill, radius=0):
+        self.draw.rounded_rectangle(self._xy(box), radius=radius * self.scale, fill=fill)
+
+    def ellipse(self, box, fill=None, outline=None, width=1):
+        self.draw.ellipse(self._xy(box), fill=fill, outline=outline, width=round(width * self.scale))
+
+    def pieslice(self, box, start, end, fill):
+        self.draw.pieslice(self._xy(box), start, end, fill=fill)
+
+    def polygon(self, points, fill, outline=None, width=1):
+        self.draw.polygon(self._points(points), fill=fill, outline=outline, width=round(width * self.scale))
+
+    def line(self, points, fill, width):
+        self.draw.line(self._points(points), fill=fill, width=round(width * self.scale), joint='curve')
+
+
+def _draw_cpu(d):
+    # Монитор на подставке
+    d.polygon([(54, 92), (74, 92), (80, 110), (48, 110)], fill=(150, 155, 165))
+    d.rect((34, 106, 94, 118), fill=(120, 125, 135), radius=5)
+    d.rect((8, 16, 120, 96), fill=(60, 64, 72), radius=10)
+    d.rect((16, 24, 112, 86), fill=(70, 150, 245))
+    d.polygon([(16, 86), (112, 24), (112, 86)], fill=(50, 120, 225))
+
+
+def _draw_gpu(d):
+    # Геймпад
+    body = (70, 72, 84)
+    d.ellipse((6, 54, 54, 114), fill=body)
+    d.ellipse((74, 54, 122, 114), fill=body)
+    d.rect((14, 38, 114, 92), fill=body, radius=26)
+    d.rect((28, 54, 40, 82), fill=(230, 230, 235))
+    d.rect((20, 62, 48, 74), fill=(230, 230, 235))
+    d.ellipse((84, 50, 98, 64), fill=(255, 80, 80))
+    d.ellipse((98, 62, 112, 76), fill=(80, 200, 120))
+    d.ellipse((70, 62, 84, 76), fill=(80, 150, 255))
+    d.ellipse((84, 74, 98, 88), fill=(255, 200, 60))
+
+
+def _draw_ram(d):
+    # Дискета
+    d.polygon([(10, 10), (104, 10), (118, 24), (118, 118), (10, 118)], fill=(40, 90, 200))
+    d.rect((34, 10, 92, 46), fill=(200, 205, 215))
+    d.rect((72, 16, 84, 40), fill=(40, 90, 200))
+    d.rect((24, 62, 104, 118), fill=(245, 245, 245), radius=4)
+    d.rect((34, 76, 94, 81), fill=(170, 180, 200))
+    d.rect((34, 92, 94, 97), fill=(170, 180, 200))
+
+
+def _draw_storage(d):
+    # Оптический диск с радужными бликами
+    d.ellipse((6, 6, 122, 122), fill=(190, 195, 205))
+    d.pieslice((10, 10, 118, 118), 200, 250, fill=(170, 220, 255))
+    d.pieslice((10, 10, 118, 118), 20, 70, fill=(255, 215, 160))
+    d.pieslice((10, 10, 118, 118), 290, 320, fill=(220, 180, 255))
+    d.ellipse((42, 42, 86, 86), fill=(235, 235, 240))
+    d.ellipse((56, 56, 72, 72), fill=(0, 0, 0, 0))
+
+
+def _draw_motherboard(d):
+    # Вилка с кабелем
+    d.line([(64, 96), (64, 112), (40, 124)], fill=(60, 60, 70), width=12)
+    d.rect((50, 8, 60, 42), fill=(215, 180, 90), radius=3)
+    d.rect((68, 8, 78, 42), fill=(215, 180, 90), radius=3)
+    d.rect((40, 38, 88, 58), fill=(120, 125, 135), radius=6)
+    d.rect((34, 52, 94, 100), fill=(90, 95, 105), radius=12)
+
+
+def _draw_psu(d):
+    # Молния
+    d.polygon(
+        [(74, 4), (22, 72), (58, 72), (46, 124), (106, 48), (68, 48), (86, 4)],
+        fill=(255, 200, 0), outline=(230, 140, 0), width=4
+    )
+
+
+def _draw_case(d):
+    # Картонная коробка
+    d.polygon([(10, 42), (80, 56), (80, 122), (10, 104)], fill=(200, 140, 80))
+    d.polygon([(80, 56), (118, 38), (118, 100), (80, 122)], fill=(165, 105, 55))
+    d.polygon([(10, 42), (50, 26), (118, 38), (80, 56)], fill=(225, 170, 110))
+    d.line([(30, 34), (99, 47)], fill=(245, 215, 165), width=8)
+
+
+def _draw_cooling(d):
+    # Снежинка
+    color = (120, 200, 255)
+    center = 64
+    for i in range(6):
+        angle = math.radians(90 + i * 60)
+        dx, dy = math.cos(angle), -math.sin(angle)
+        d.line([(center, center), (center + dx * 56, center + dy * 56)], fill=color, width=9)
+        # Веточки на двух третях луча
+        bx, by = center + dx * 36, center + dy * 36
+        for side in (-1, 1):
+            branch = angle + side * math.radians(45)
+            d.line(
+                [(bx, by), (bx + math.cos(branch) * 18, by - math.sin(branch) * 18)],
+                fill=color, width=7
+            )
+    d.ellipse((54, 54, 74, 74), fill=color)
+
+
+def _draw_gift(d):
+    # Подарок с бантом
+    ribbon = (255, 210, 60)
+    d.ellipse((28, 10, 64, 46), outline=ribbon, width=9)
+    d.ellipse((64, 10, 100, 46), outline=ribbon, width=9)
+    d.rect((14, 54, 114, 120), fill=(220, 45, 55), radius=4)
+    d.rect((8, 38, 120, 58), fill=(245, 70, 80), radius=4)
+    d.rect((56, 38, 72, 120), fill=ribbon)
+
+
+def _draw_sparkles(d):
+    # Три четырёхлучевые звёзды
+    for cx, cy, outer, inner in ((52, 70, 46, 11), (102, 28, 22, 6), (102, 102, 16, 5)):
+        points = []
+        for i in range(8):
+            radius = outer if i % 2 == 0 else inner
+            angle = math.radians(90 + i * 45)
+            points.append((cx + math.cos(angle) * radius, cy - math.sin(angle) * radius))
+        d.polygon(points, fill=(255, 205, 40))
+
+
+DRAWERS = {
+    'cpu': _draw_cpu,
+    'gpu': _draw_gpu,
+    'ram': _draw_ram,
+    'storage': _draw_storage,
+    'motherboard': _draw_motherboard,
+    'psu': _draw_psu,
+    'case': _draw_case,
+    'cooling': _draw_cooling,
+    'gift': _draw_gift,
+    'sparkles': _draw_sparkles,
+}
@@ -0,0 +1,249 @@
+"""
+Декларативные макеты карточек
+
+Макет - упорядоченный список элементов (слоёв) в координатах карточки
+1200x1200. Элемент либо статичный (фон, логотип, заголовок, декор), либо
+привязан к данным сборки: текст с полями '{cpu}', '{price}', фото сборки,
+список характеристик. Макет ничего не рисует сам - его компилирует
+render_plan в план рендеринга: статичный префикс растеризуется один раз,
+на каждую карточку выполняются только динамические операции.
+
+Текст с полями форматируется через str.format_map. Поля верхнего уровня -
+атрибуты PCBuild, '{price}' - уже отформатированная цена. Внутри Repeat
+доступны поля элемента списка: '{label}', '{value}' для source='specs',
+'{line}' для source='bonuses', ключи словарей для статичных data.
+"""
+
+from dataclasses import dataclass
+from string import Formatter
+
+
+def has_fields(text):
+    """
+    Есть ли в строке поля для подстановки ('{cpu}')
+    """
+    return any(field is not None for _, field, _, _ in Formatter().parse(text))
+
+
+@dataclass(frozen=True)
+class Fill:
+    """
+    Сплошной фон всей карточки
+    """
+    color: tuple
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Gradient:
+    """
+    Градиент (generators.gradients): фон всей карточки или полоса в box
+    colors: цвета или пары (позиция, цвет)
+    mode: 'RGBA' - полоса с прозрачностью (цвета RGBA), накладывается по своей альфе
+    """
+    colors: tuple
+    direction: str = 'vertical'
+    box: tuple = None
+    mode: str = 'RGB'
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Shadow:
+    """
+    Мягкая тень под фото (generators.shadows)
+    """
+    spread: int
+    offset: int = 0
+    blur: int = 15
+    opacity: int = 20
+
+
+@dataclass(frozen=True)
+class Photo:
+    """
+    Фото сборки размера size в точке xy
+    blur - размытое фото (общее на сборку), brightness/contrast - ImageEnhance,
+    fade - затемнение низа, начиная с этой доли высоты,
+    shadow - фото на холсте с тенью (xy - угол холста),
+    opacity - постоянная непрозрачность при наложении (0..255)
+    """
+    size: tuple
+    xy: tuple
+    blur: float = 0
+    brightness: float = None
+    contrast: float = None
+    fade: float = None
+    shadow: Shadow = None
+    opacity: int = None
+    name: str = 'photo'
+
+    static = False
+
+
+@dataclass(frozen=True)
+class Backing:
+    """
+    Подложка (скруглённый прямоугольник) под текстом
+    По умолчанию: от x - padding до x + ширина + padding, по высоте от
+    y - padding до y + (height или высота текста + extra) + padding.
+    bbox=True - по фактическим границам глифов (textbbox в точке текста)
+    """
+    padding: int
+    radius: int
+    fill: tuple = None
+    outline: tuple = None
+    width: int = 1
+    height: int = None
+    extra: int = 0
+    bbox: bool = False
+
+
+@dataclass(frozen=True)
+class Text:
+    """
+    Строка текста; эмодзи из атласа иконок рисуются цветными иконками
+    align: 'left' - x слева; 'center' - по центру карточки (x не нужен);
+    'right' - x отступ от правого края; 'middle' - xy центр текста
+    shadow: ((dx, dy), цвет) - тень под текстом
+    transform: функция str -> str после подстановки полей (first_word, truncate(25)...)
+    """
+    text: str
+    xy: tuple = (0, 0)
+    size: int = 20
+    bold: bool = False
+    fill: tuple = (255, 255, 255)
+    align: str = 'left'
+    shadow: tuple = None
+    backing: Backing = None
+    transform: object = None
+    name: str = ''
+
+    @property
+    def static(self):
+        return not has_fields(self.text)
+
+
+@dataclass(frozen=True)
+class Icon:
+    """
+    Цветная иконка из атласа (generators.icons) размера size x size в точке xy
+    key: ключ иконки ('cpu') или текст с эмодзи, в т.ч. с полями ('{label}'
+    с transform=first_word)
+    """
+    key: str
+    xy: tuple
+    size: int = 32
+    transform: object = None
+    name: str = ''
+
+    @property
+    def static(self):
+        return not has_fields(self.key)
+
+
+@dataclass(frozen=True)
+class Panel:
+    """
+    Прямоугольник со скруглёнными углами
+    """
+    box: tuple
+    radius: int
+    fill: tuple = None
+    outline: tuple = None
+    width: int = 1
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Rect:
+    box: tuple
+    fill: tuple = None
+    outline: tuple = None
+    width: int = 1
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Ellipse:
+    box: tuple
+    fill: tuple = None
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Polygon:
+    points: tuple
+    fill: tuple = None
+    name: str = ''
+
+    static = True
+
+
+@dataclass(frozen=True)
+class Repeat:
+    """
+    Элементы, повторённые для каждого элемента списка
+    source: 'specs' (build.get_specs_list) или 'bonuses' (строки build.bonuses);
+    data: статичный список словарей вместо source - такой Repeat статичен,
+    его тексты могут ссылаться только на поля data
+    Элемент i сдвигается на (i % columns * step[0], i // columns * step[1])
+    """
+    elements: tuple
+    source: str = None
+    data: tuple = ()
+    limit: int = None
+    columns: int = 1
+    step: tuple = (0, 0)
+    name: str = ''
+
+    @property
+    def static(self):
+        return self.source is None
+
+
+@dataclass(frozen=True)
+class Layout:
+    """
+    Макет одной карточки: элементы снизу вверх
+    Первым элементом должен идти фон всей карточки (Fill или Gradient без box)
+    """
+    elements: tuple
+    size: tuple = (1200, 1200)
+
+
+# === Преобразования текста ===
+
+def first_word(text):
+    return text.split()[0] if text.split() else text
+
+
+def rest_words(text):
+    """
+    Всё после первого слова (или весь текст, если слово одно)
+    """
+    return ' '.join(text.split()[1:]) if ' ' in text else text
+
+
+def last_word(text):
+    return text.split()[-1] if ' ' in text else text
+
+
+def truncate(length):
+    """
+    Обрезает текст длиннее length символов с многоточием
+    """
+    def transform(text):
+        return text[:length] + '...' if len(text) > length else text
+    transform.__name__ = f'truncate_{length}'
+    return transform
@@ -0,0 +1,131 @@
+"""
+Подготовка фото ПК: декодируем один раз, отдаём любые размеры
+
+Фото сборки декодируется один раз в "мастер" - сразу в уменьшенном масштабе
+(для JPEG через Image.draft(), для остальных форматов через reduce()), но не
+меньше, чем нужно для самой большой карточки. Все target_size строятся из
+мастера и тоже кэшируются, поэтому серия MIXPC и рендер всех стилей для одной
+сборки декодируют фото ровно один раз.
+
+Вместо пути можно передать PhotoData - фото в памяти (превью формы
+создания, которое ничего не сохраняет); ключ кэша - хэш содержимого.
+"""
+
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from PIL import Image
+
+from .cache import ImageCache
+
+
+# Наибольший размер, под который стили вписывают фото
+MASTER_SIZE = (1200, 1200)
+
+photos = ImageCache(
+    'photos',
+    maxsize=getattr(settings, 'CARDS_PHOTO_CACHE_SIZE', 16)
+)
+
+
+class PhotoData(bytes):
+    """
+    Содержимое файла фото без файла на диске
+    """
+
+    @property
+    def digest(self):
+        return hashlib.blake2b(self, digest_size=16).hexdigest()
+
+
+def load_photo(path, target_size, quality=None):
+    """
+    Фото, вписанное в target_size с сохранением пропорций и центрированное
+    на черном фоне
+    quality='draft' - билинейный ресемплинг вместо LANCZOS (превью)
+    """
+    key = _photo_key(path) + ('fit', tuple(target_size))
+    resample = Image.Resampling.LANCZOS
+    if quality == 'draft':
+        key += ('draft',)
+        resample = Image.Resampling.BILINEAR
+    return photos.get(key, lambda: _fit(load_master(path), target_size, resample))
+
+
+def load_derived(path, target_size, name, transform, quality=None):
+    """
+    Производное от фото изображение (например, размытый фон) - считается
+    один раз на сборку и переиспользуется всеми стилями и повторными рендерами
+    name: хэшируемый идентификатор преобразования, например ('blur', 15)
+    transform: функция photo -> image
+    quality: качество вписывания фото (см. load_photo)
+    """
+    key = _photo_key(path) + ('derived', tuple(target_size), name)
+    return photos.get(key, lambda: transform(load_photo(path, target_size, quality)))
+
+
+def load_master(path):
+    """
+    Декодированный мастер фото (только для чтения - не изменять)
+    """
+    key = _photo_key(path) + ('master',)
+    return photos.get(key, lambda: _decode(path, MASTER_SIZE), copy=False)
+
+
+def _photo_key(path):
+    """
+    Ключ фото: путь и время изменения, чтобы замена файла сбрасывала кэш
+    """
+    if isinstance(path, PhotoData):
+        return ('data', path.digest)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    return (str(path), mtime)
+
+
+def _decode(path, bound):
+    """
+    Декодирует фото в ближайшем масштабе не меньше нужного
+    """
+    photo = Image.open(io.BytesIO(path) if isinstance(path, PhotoData) else path)
+    needed = _fitted_size(photo.size, bound)
+
+    # JPEG умеет декодироваться сразу в масштабе 1/2, 1/4, 1/8
+    if photo.format == 'JPEG':
+        photo.draft('RGB', needed)
+
+    photo = photo.convert('RGB')
+
+    # Для остальных форматов - быстрое целочисленное уменьшение
+    factor = min(photo.width // needed[0], photo.height // needed[1])
+    if factor >= 2:
+        photo = photo.reduce(factor)
+
+    return photo
+
+
+def _fit(master, target_size, resample=Image.Resampling.LANCZOS):
+    """
+    Вписывает мастер в target_size и центрирует на черном фоне
+    """
+    photo = master.copy()
+    photo.thumbnail(target_size, resample)
+
+    result = Image.new('RGB', target_size, (0, 0, 0))
+    offset = ((target_size[0] - photo.width) // 2,
+              (target_size[1] - photo.height) // 2)
+    result.paste(photo, offset)
+
+    return result
+
+
+def _fitted_size(size, bound):
+    """
+    Размер изображения size, вписанного в bound с сохранением пропорций
+    """
+    scale = min(bound[0] / size[0], bound[1] / size[1], 1.0)
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
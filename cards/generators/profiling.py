@@ -0,0 +1,166 @@
+"""
+Замер времени этапов рендеринга
+
+Методы генераторов (generate*, load_*, create_*, _add_*, _draw_* и т.п.)
+оборачиваются автоматически. Пока в потоке нет активного замера, обёртка
+стоит одну проверку thread-local и вызывает метод как есть.
+
+Для этапа считается собственное время - без вложенных этапов, поэтому
+сумма по этапам равна общему времени рендеринга.
+
+Разовый замер:
+
+    with profiling.profile() as timings:
+        SteamStyleGenerator(build).generate()
+    print(timings.as_dict())
+
+При CARDS_PROFILE_STAGES рендеринг сохраняет разбивку в
+GeneratedCard.render_timings.
+"""
+
+from contextlib import contextmanager
+import functools
+import inspect
+import threading
+import time
+
+from django.conf import settings
+
+
+# Префиксы методов генераторов, которые считаются этапами
+STAGE_PREFIXES = (
+    'generate', 'load_', 'create_', '_create_', 'add_', '_add_', '_draw_',
+)
+
+_local = threading.local()
+
+
+def is_enabled():
+    return getattr(settings, 'CARDS_PROFILE_STAGES', False)
+
+
+class StageTimings:
+    """
+    Собственное время и количество вызовов по этапам
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.total = 0.0
+        self._stack = []
+
+    def start(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        name, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        else:
+            self.total += elapsed
+
+        stage = self.stages.setdefault(name, [0.0, 0])
+        stage[0] += elapsed - children
+        stage[1] += 1
+
+    def add(self, name, seconds):
+        """
+        Этап, замеренный вне генератора (например, кодирование в другом потоке)
+        """
+        stage = self.stages.setdefault(name, [0.0, 0])
+        stage[0] += seconds
+        stage[1] += 1
+        self.total += seconds
+
+    def as_dict(self):
+        """
+        {'total_ms': ..., 'stages': {этап: {'ms': ..., 'calls': ...}}}, этапы по убыванию времени
+        """
+        stages = sorted(self.stages.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            'total_ms': round(self.total * 1000, 2),
+            'stages': {
+                name: {'ms': round(seconds * 1000, 2), 'calls': calls}
+                for name, (seconds, calls) in stages
+            },
+        }
+
+
+@contextmanager
+def profile():
+    """
+    Замер этапов всего, что выполняется внутри блока в текущем потоке
+    """
+    previous = getattr(_local, 'timings', None)
+    timings = _local.timings = StageTimings()
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
+
+
+@contextmanager
+def stage(name):
+    """
+    Отдельный этап внутри метода; без активного замера ничего не делает
+    """
+    timings = getattr(_local, 'timings', None)
+    if timings is None:
+        yield
+        return
+
+    timings.start(name)
+    try:
+        yield
+    finally:
+        timings.stop()
+
+
+def run(func, *args, **kwargs):
+    """
+    Выполняет func с замером этапов, если он включен настройкой
+    Возвращает (результат, StageTimings или None)
+    """
+    if not is_enabled():
+        return func(*args, **kwargs), None
+
+    with profile() as timings:
+        result = func(*args, **kwargs)
+    return result, timings
+
+
+def timed(func):
+    """
+    Декоратор этапа с именем метода
+    """
+    if getattr(func, '_stage_timed', False):
+        return func
+
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = getattr(_local, 'timings', None)
+        if timings is None:
+            return func(*args, **kwargs)
+
+        timings.start(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.stop()
+
+    wrapper._stage_timed = True
+    return wrapper
+
+
+def instrument(cls):
+    """
+    Оборачивает методы-этапы, объявленные в самом классе
+    """
+    for name, value in list(vars(cls).items()):
+        if inspect.isfunction(value) and name.startswith(STAGE_PREFIXES):
+            setattr(cls, name, timed(value))
+    return cls
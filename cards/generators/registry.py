@@ -0,0 +1,220 @@
+"""
+Реестр стилей карточек
+
+Стиль задаётся путём к классу генератора, модуль стиля (а с ним Pillow и
+модули рендеринга) импортируется при первом обращении к этому стилю, а не
+при импорте URL или management-команды. Кроме встроенных стилей, реестр
+подхватывает:
+
+- entry points группы 'partmart_cards.styles' сторонних пакетов:
+
+      [project.entry-points."partmart_cards.styles"]
+      neon = "partmart_neon.styles:NeonStyleGenerator"
+
+- CARDS_STYLES из настроек: {стиль: 'module.Class'}, приоритетнее всех.
+
+Реестр - Mapping стиль -> класс: 'msi' in registry и list(registry) ничего
+не импортируют, registry['msi'] импортирует только msi_style. Метаданные
+стиля (размер, количество карточек, кэшируемые слои) - registry.info(style).
+Стили с несколькими карточками - серии: у них своя страница результата и
+ZIP-архив (registry.is_series).
+"""
+
+from collections.abc import Mapping
+from importlib import import_module, metadata
+import threading
+
+from django.conf import settings
+
+
+ENTRY_POINT_GROUP = 'partmart_cards.styles'
+
+# Встроенные стили; пути относительно пакета generators
+BUILTIN_STYLES = {
+    'msi': '.msi_style.MSIStyleGenerator',
+    'steam': '.steam_style.SteamStyleGenerator',
+    'apple': '.apple_style.AppleStyleGenerator',
+    'spotify': '.spotify_style.SpotifyStyleGenerator',
+    'mixpc': '.mixpc_series.MIXPCSeriesGenerator',
+}
+
+
+def import_generator(path):
+    """
+    Класс по пути 'module.Class' или 'module:Class' (относительные - от generators)
+    """
+    module_name, _, name = path.rpartition(':') if ':' in path else path.rpartition('.')
+    return getattr(import_module(module_name, __package__), name)
+
+
+class StyleInfo:
+    """
+    Стиль реестра: класс генератора загружается при первом обращении
+    source: 'builtin', 'entry_point', 'settings' или 'register'
+    """
+
+    def __init__(self, name, target, source):
+        self.name = name
+        self.source = source
+        if isinstance(target, str):
+            self.path = __package__ + target if target.startswith('.') else target
+            self._generator = None
+        else:
+            self.path = f'{target.__module__}.{target.__qualname__}'
+            self._generator = target
+
+    def __repr__(self):
+        return f'<StyleInfo {self.name}: {self.path}>'
+
+    @property
+    def is_loaded(self):
+        return self._generator is not None
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            self._generator = import_generator(self.path)
+        return self._generator
+
+    @property
+    def size(self):
+        """
+        Размер карточки при масштабе 1
+        """
+        return tuple(self.generator.CARD_SIZE)
+
+    @property
+    def card_count(self):
+        return len(self.generator.SERIES_CARDS) or 1
+
+    @property
+    def is_series(self):
+        """
+        Серия карточек: страница результата серии и ZIP-архив для скачивания
+        """
+        return self.card_count > 1
+
+    @property
+    def shared_cards(self):
+        """
+        Номера карточек, общих для всех сборок (рендерятся один раз на версию)
+        """
+        return tuple(self.generator.SHARED_CARDS)
+
+    def layers(self):
+        """
+        Кэшируемые слои макетов без их растеризации:
+        {макет: {'size', 'background', 'sprites', 'dynamic'}} - сколько
+        элементов попадает в фон (статичный префикс), в спрайты статичных
+        групп и рисуется на каждую карточку
+        """
+        result = {}
+        for name, layout in self.generator.layouts().items():
+            elements = list(layout.elements)
+            prefix = next((i for i, element in enumerate(elements) if not element.static), len(elements))
+            dynamic = sum(1 for element in elements[prefix:] if not element.static)
+            result[name] = {
+                'size': tuple(layout.size),
+                'background': prefix,
+                'sprites': len(elements) - prefix - dynamic,
+                'dynamic': dynamic,
+            }
+        return result
+
+    def as_dict(self):
+        generator = self.generator
+        return {
+            'style': self.name,
+            'generator': self.path,
+            'source': self.source,
+            'version': generator.VERSION,
+            'size': self.size,
+            'cards': self.card_count,
+            'shared_cards': self.shared_cards,
+            'layers': self.layers(),
+        }
+
+
+class GeneratorRegistry(Mapping):
+    """
+    Стиль -> класс генератора с ленивым импортом модулей стилей
+    """
+
+    def __init__(self, builtin=None, group=ENTRY_POINT_GROUP):
+        self.builtin = BUILTIN_STYLES if builtin is None else builtin
+        self.group = group
+        self._styles = None
+        self._registered = {}
+        self._lock = threading.Lock()
+
+    def styles(self):
+        """
+        {стиль: StyleInfo}; entry points и настройки читаются один раз
+        """
+        styles = self._styles
+        if styles is None:
+            with self._lock:
+                if self._styles is None:
+                    self._styles = self._discover()
+                styles = self._styles
+        return styles
+
+    def _discover(self):
+        styles = {name: StyleInfo(name, path, 'builtin') for name, path in self.builtin.items()}
+        for entry_point in metadata.entry_points(group=self.group):
+            styles[entry_point.name] = StyleInfo(entry_point.name, entry_point.value, 'entry_point')
+        for name, path in getattr(settings, 'CARDS_STYLES', {}).items():
+            styles[name] = StyleInfo(name, path, 'settings')
+        styles.update(self._registered)
+        return styles
+
+    def register(self, name, target):
+        """
+        Регистрирует стиль: target - класс генератора или путь 'module.Class'
+        """
+        info = StyleInfo(name, target, 'register')
+        with self._lock:
+            self._registered[name] = info
+            if self._styles is not None:
+                self._styles = {**self._styles, name: info}
+        return info
+
+    def info(self, name):
+        """
+        StyleInfo стиля; KeyError для неизвестного стиля
+        """
+        return self.styles()[name]
+
+    def is_series(self, name):
+        """
+        Стиль известен и рендерится серией карточек
+        """
+        return name in self and self.info(name).is_series
+
+    def series_styles(self):
+        """
+        Стили-серии по порядку реестра
+        """
+        return [name for name in self if self.is_series(name)]
+
+    def reset(self):
+        """
+        Перечитать entry points и CARDS_STYLES (например, после override_settings)
+        """
+        with self._lock:
+            self._styles = None
+
+    def __getitem__(self, name):
+        return self.info(name).generator
+
+    def __contains__(self, name):
+        return name in self.styles()
+
+    def __iter__(self):
+        return iter(self.styles())
+
+    def __len__(self):
+        return len(self.styles())
+
+
+registry = GeneratorRegistry()
@@ -0,0 +1,464 @@
+"""
+Компиляция макетов (generators.layout) в планы рендеринга
+
+План макета состоит из двух частей:
+
+- префикс: фон и все статичные элементы до первого динамического,
+  нарисованные прямо на фоне. Хранится в кэше backgrounds - карточка
+  начинается с одной копии готового изображения;
+- операции: динамические элементы рисуются по данным сборки, статичные
+  группы между ними накладываются готовыми спрайтами (кэш static_layers).
+
+Статичная группа растеризуется на чёрном и на белом холсте: по разнице
+восстанавливается альфа, чёрный холст - уже умноженный на альфу цвет, так
+что наложение спрайта даёт тот же результат, что и отрисовка элементов
+прямо на карточке. Стоимость наложения - площадь спрайта, поэтому спрайт
+группы режется на полосы по пустым строкам.
+
+План строится один раз на (класс, макет, масштаб) и изображений не держит:
+после очистки кэшей префикс и спрайты перерисовываются по макету.
+"""
+
+from collections import ChainMap
+import functools
+
+from PIL import Image, ImageChops, ImageDraw, ImageEnhance
+
+from . import cache, gradients, icons, profiling, shadows
+from .layout import Fill, Gradient
+
+
+# Высота (строк) блоков, по которым спрайт группы режется на полосы
+BAND_STEP = 8
+
+
+def scaled(value, scale):
+    """
+    Координаты и размеры макета (число или вложенные кортежи) в масштабе scale
+    """
+    if scale == 1 or value is None:
+        return value
+    if isinstance(value, (tuple, list)):
+        return tuple(scaled(item, scale) for item in value)
+    return round(value * scale)
+
+
+def shifted(value, offset):
+    """
+    Точка (x, y) или прямоугольник (x1, y1, x2, y2), сдвинутые на offset
+    """
+    dx, dy = offset
+    if len(value) == 4:
+        x1, y1, x2, y2 = value
+        return (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+    x, y = value
+    return (x + dx, y + dy)
+
+
+def stage_name(element):
+    return element.name or type(element).__name__.lower()
+
+
+@functools.lru_cache(maxsize=64)
+def compile_layout(generator_class, name, scale=1):
+    """
+    План рендеринга макета name генератора generator_class
+    """
+    return RenderPlan(generator_class(None, scale=scale), name)
+
+
+class BuildContext:
+    """
+    Поля сборки для подстановки в текст макета; 'price' - отформатированная цена
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def __getitem__(self, key):
+        build = self.generator.build
+        if key == 'price':
+            return self.generator.format_price(build.price)
+        try:
+            return getattr(build, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+class Painter:
+    """
+    Рисует элементы макета на карточке (в масштабе генератора)
+    """
+
+    def __init__(self, generator, card):
+        self.generator = generator
+        self.scale = generator.scale
+        self.card = card
+        self.draw = ImageDraw.Draw(card, 'RGBA')
+
+    def paint(self, element, context, offset=(0, 0)):
+        method = getattr(self, '_paint_' + type(element).__name__.lower())
+        method(element, context, offset)
+
+    def _s(self, value):
+        return scaled(value, self.scale)
+
+    def _stroke(self, width):
+        return max(1, self._s(width))
+
+    def _font(self, element):
+        return self.generator.get_font(max(1, self._s(element.size)), bold=element.bold)
+
+    def _paint_fill(self, element, context, offset):
+        self.card.paste(element.color, (0, 0) + self.card.size)
+
+    def _paint_gradient(self, element, context, offset):
+        if element.box is None:
+            self.card.paste(background(element, self.card.size))
+            return
+
+        x1, y1, x2, y2 = self._s(shifted(element.box, offset))
+        strip = gradients.gradient((x2 - x1, y2 - y1), element.colors, element.direction, mode=element.mode)
+        self.card.paste(strip, (x1, y1), strip if element.mode == 'RGBA' else None)
+
+    def _paint_rect(self, element, context, offset):
+        self.draw.rectangle(
+            self._s(shifted(element.box, offset)),
+            fill=element.fill, outline=element.outline, width=self._stroke(element.width)
+        )
+
+    def _paint_panel(self, element, context, offset):
+        self.generator.draw_rounded_rectangle(
+            self.draw,
+            self._s(shifted(element.box, offset)),
+            radius=self._s(element.radius),
+            fill=element.fill,
+            outline=element.outline,
+            width=self._stroke(element.width)
+        )
+
+    def _paint_ellipse(self, element, context, offset):
+        self.draw.ellipse(self._s(shifted(element.box, offset)), fill=element.fill)
+
+    def _paint_polygon(self, element, context, offset):
+        points = [self._s(shifted(point, offset)) for point in element.points]
+        self.draw.polygon(points, fill=element.fill)
+
+    def _paint_text(self, element, context, offset):
+        text = element.text.format_map(context)
+        if element.transform is not None:
+            text = element.transform(text)
+        font = self._font(element)
+        line = _Line(self, text, font)
+
+        x, y = self._s(shifted(element.xy, offset))
+
+        # Размер текста нужен только для выравнивания и подложки
+        text_width = text_height = None
+        if element.align != 'left' or (element.backing is not None and not element.backing.bbox):
+            left, top, right, bottom = line.bbox((0, 0))
+            text_width, text_height = right - left, bottom - top
+
+        if element.align == 'center':
+            x = (self.card.width - text_width) // 2
+        elif element.align == 'right':
+            x = self.card.width - text_width - x
+        elif element.align == 'middle':
+            x, y = x - text_width // 2, y - text_height // 2
+
+        if element.backing is not None:
+            self._paint_backing(element.backing, line, (x, y), (text_width, text_height))
+
+        if element.shadow is not None:
+            (dx, dy), color = element.shadow
+            line.draw((x + self._s(dx), y + self._s(dy)), color, with_icons=False)
+
+        line.draw((x, y), element.fill)
+
+    def _paint_backing(self, backing, line, xy, text_size):
+        padding = self._s(backing.padding)
+        x, y = xy
+
+        if backing.bbox:
+            left, top, right, bottom = line.bbox(xy)
+        else:
+            height = self._s(backing.height) if backing.height is not None else text_size[1] + self._s(backing.extra)
+            left, top, right, bottom = x, y, x + text_size[0], y + height
+
+        self.generator.draw_rounded_rectangle(
+            self.draw,
+            [left - padding, top - padding, right + padding, bottom + padding],
+            radius=self._s(backing.radius),
+            fill=backing.fill,
+            outline=backing.outline,
+            width=self._stroke(backing.width)
+        )
+
+    def _paint_icon(self, element, context, offset):
+        text = element.key.format_map(context)
+        if element.transform is not None:
+            text = element.transform(text)
+
+        key = icons.key_for(text)
+        if key is not None:
+            xy = self._s(shifted(element.xy, offset))
+            icons.paste(self.card, key, xy, max(1, self._s(element.size)))
+
+    def _paint_repeat(self, element, context, offset):
+        items = self._items(element)
+        if element.limit is not None:
+            items = items[:element.limit]
+
+        step_x, step_y = element.step
+        for i, item in enumerate(items):
+            item_offset = (
+                offset[0] + i % element.columns * step_x,
+                offset[1] + i // element.columns * step_y,
+            )
+            item_context = ChainMap(item, context)
+            for child in element.elements:
+                self.paint(child, item_context, item_offset)
+
+    def _items(self, element):
+        build = self.generator.build
+        if element.source == 'specs':
+            return [{'label': label, 'value': value} for label, value in build.get_specs_list()]
+        if element.source == 'bonuses':
+            bonuses = getattr(build, 'bonuses', '')
+            return [{'line': line} for line in bonuses.split('\n')] if bonuses else []
+        if element.source is not None:
+            raise ValueError(f"Неизвестный источник Repeat: {element.source}")
+        return list(element.data)
+
+    def _paint_photo(self, element, context, offset):
+        generator = self.generator
+        size = self._s(element.size)
+
+        if element.blur:
+            photo = generator.load_blurred_photo(size, element.blur * self.scale)
+        else:
+            photo = generator.load_and_prepare_photo(size)
+
+        if element.brightness is not None:
+            photo = ImageEnhance.Brightness(photo).enhance(element.brightness)
+        if element.contrast is not None:
+            photo = ImageEnhance.Contrast(photo).enhance(element.contrast)
+        if element.fade is not None:
+            # Затемнение к низу фото
+            photo = photo.copy()
+            photo.paste((0, 0, 0), None, gradients.alpha_ramp(photo.size, start=element.fade))
+
+        xy = self._s(shifted(element.xy, offset))
+
+        if element.shadow is not None:
+            shadow = element.shadow
+            photo = shadows.with_shadow(
+                photo,
+                spread=self._s(shadow.spread),
+                offset=self._s(shadow.offset),
+                blur=self._s(shadow.blur),
+                opacity=shadow.opacity
+            )
+            self.card.paste(photo, xy, photo)
+        elif element.opacity is not None:
+            self.card.paste(photo, xy, Image.new('L', photo.size, element.opacity))
+        else:
+            self.card.paste(photo, xy)
+
+
+class _Line:
+    """
+    Строка текста для Painter: обычный текст шрифтом или, если в ней есть
+    эмодзи или символы без глифа, прогоны текста и иконок (generators.icons)
+    """
+
+    def __init__(self, painter, text, font):
+        self.painter = painter
+        self.text = text
+        self.font = font
+        self.runs = icons.runs(font, text)
+        self.plain = icons.is_plain(self.runs, text)
+
+    def bbox(self, xy):
+        draw = self.painter.draw
+        if self.plain:
+            return draw.textbbox(xy, self.text, font=self.font)
+        return icons.runs_bbox(draw, xy, self.runs, self.font)
+
+    def draw(self, xy, fill, with_icons=True):
+        painter = self.painter
+        if self.plain:
+            painter.draw.text(xy, self.text, fill=fill, font=self.font)
+        else:
+            icons.draw_runs(painter.card, painter.draw, xy, self.runs, self.font, fill, icons=with_icons)
+
+
+def background(element, size):
+    """
+    Фон карточки из первого элемента макета
+    """
+    if isinstance(element, Fill):
+        return Image.new('RGB', size, element.color)
+    if isinstance(element, Gradient) and element.box is None:
+        return gradients.gradient(size, element.colors, element.direction)
+    raise ValueError(f"Макет должен начинаться с фона (Fill или Gradient), а не с {type(element).__name__}")
+
+
+def rasterize(generator, elements, size):
+    """
+    Статичные элементы в RGBA-изображение размера карточки (прозрачное вне элементов)
+    """
+    canvases = []
+    for color in ((0, 0, 0), (255, 255, 255)):
+        canvas = Image.new('RGB', size, color)
+        painter = Painter(generator, canvas)
+        for element in elements:
+            painter.paint(element, {})
+        canvases.append(canvas)
+    black, white = canvases
+
+    alpha = ImageChops.invert(ImageChops.subtract(white, black).convert('L'))
+    return Image.merge('RGBa', black.split() + (alpha,)).convert('RGBA')
+
+
+def bands(alpha, step=BAND_STEP):
+    """
+    Границы непрозрачного содержимого по горизонтальным полосам, разделённым пустыми строками
+    """
+    width, height = alpha.size
+    boxes = []
+    top = None
+
+    for y in range(0, height + step, step):
+        empty = y >= height or alpha.crop((0, y, width, min(y + step, height))).getbbox() is None
+        if not empty and top is None:
+            top = y
+        elif empty and top is not None:
+            bottom = min(y, height)
+            left, band_top, right, band_bottom = alpha.crop((0, top, width, bottom)).getbbox()
+            boxes.append((left, top + band_top, right, top + band_bottom))
+            top = None
+
+    return boxes
+
+
+class PaintOp:
+    """
+    Динамический элемент: рисуется на каждой карточке
+    """
+
+    def __init__(self, element):
+        self.element = element
+        self.stage = stage_name(element)
+
+    def run(self, painter, context):
+        with profiling.stage(self.stage):
+            painter.paint(self.element, context)
+
+
+class SpriteOp:
+    """
+    Полоса статичной группы: накладывается готовым спрайтом
+    """
+
+    stage = 'static_layer'
+
+    def __init__(self, plan, key, group, box):
+        self.plan = plan
+        self.key = key
+        self.group = group
+        self.box = box
+
+    def sprite(self, image=None):
+        """
+        Спрайт из кэша; image - уже растеризованная группа (при компиляции)
+        """
+        def factory():
+            source = image if image is not None else rasterize(self.plan.generator, self.group, self.plan.size)
+            return source.crop(self.box)
+
+        return cache.static_layers.get(self.key, factory, copy=False)
+
+    def run(self, painter, context):
+        with profiling.stage(self.stage):
+            sprite = self.sprite()
+            painter.card.paste(sprite, self.box[:2], sprite)
+
+
+class RenderPlan:
+    """
+    Скомпилированный макет: префикс и операции на каждую карточку
+    """
+
+    def __init__(self, generator, name):
+        self.generator = generator
+        self.name = name
+        self.layout = type(generator).layouts()[name]
+        self.size = scaled(self.layout.size, generator.scale)
+        self.key = (type(generator).__name__, name, self.size, generator.VERSION)
+
+        elements = list(self.layout.elements)
+        split = next((i for i, element in enumerate(elements) if not element.static), len(elements))
+        self.prefix = tuple(elements[:split])
+
+        self.ops = []
+        group = []
+        for element in elements[split:]:
+            if element.static:
+                group.append(element)
+                continue
+            self._add_group(group)
+            group = []
+            self.ops.append(PaintOp(element))
+        self._add_group(group)
+
+    def _add_group(self, group):
+        """
+        Статичная группа между динамическими элементами -> спрайты по полосам
+        """
+        if not group:
+            return
+
+        index = len(self.ops)
+        image = rasterize(self.generator, group, self.size)
+        for band, box in enumerate(bands(image.getchannel('A'))):
+            op = SpriteOp(self, self.key + (index, band), tuple(group), box)
+            op.sprite(image)
+            self.ops.append(op)
+
+    def _render_prefix(self):
+        card = background(self.prefix[0], self.size)
+        painter = Painter(self.generator, card)
+        for element in self.prefix[1:]:
+            painter.paint(element, {})
+        return card
+
+    def warm(self):
+        """
+        Заполняет кэши плана без рендеринга карточки: префикс и спрайты
+        статичных групп (вытесненные из кэша строятся заново)
+        """
+        cache.backgrounds.get(self.key, self._render_prefix, copy=False)
+        for op in self.ops:
+            if isinstance(op, SpriteOp):
+                op.sprite()
+
+    @property
+    def is_static(self):
+        """
+        Макет не зависит от сборки - вся карточка в префиксе
+        """
+        return not self.ops
+
+    def render(self, generator):
+        """
+        Карточка для сборки генератора generator
+        """
+        with profiling.stage('background'):
+            card = cache.backgrounds.get(self.key, self._render_prefix)
+
+        painter = Painter(generator, card)
+        context = BuildContext(generator)
+        for op in self.ops:
+            op.run(painter, context)
+        return card
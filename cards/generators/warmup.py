@@ -0,0 +1,180 @@
+"""
+Прогрев кэшей рендеринга при старте воркера
+
+Первая карточка свежего воркера платит за всё ленивое: загрузку шрифтов,
+инициализацию плагинов Pillow, компиляцию макетов, фоны, спрайты статичных
+слоёв, тени и листы иконок. warm_up() делает эту работу заранее - по
+макетам генераторов, поэтому прогреваются ровно те шрифты, фоны и спрайты,
+которые нужны карточкам.
+
+В pre-fork серверах (gunicorn --preload) прогрев выполняется в мастере до
+fork: пиксели фонов и спрайтов лежат в памяти Pillow вне объектов Python,
+дочерние процессы только читают их, и страницы остаются общими
+(copy-on-write). freeze=True дополнительно переносит прогретые объекты в
+gc.freeze(), чтобы сборщик мусора в воркерах не трогал их страницы.
+"""
+
+from collections import namedtuple
+import gc
+import logging
+import time
+
+from PIL import Image
+
+from . import encoders, fonts, icons, render_plan, shadows
+from .layout import Icon, Photo, Repeat, Text
+from .registry import registry
+
+
+logger = logging.getLogger(__name__)
+
+Step = namedtuple('Step', ['name', 'items', 'seconds'])
+
+
+class WarmupReport:
+    """
+    Шаги прогрева: сколько объектов подготовлено и за какое время
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    @property
+    def total(self):
+        return sum(step.seconds for step in self.steps)
+
+    def step(self, name, func):
+        """
+        Выполняет шаг func() -> количество объектов и записывает время
+        """
+        started = time.perf_counter()
+        items = func()
+        self.steps.append(Step(name, items, time.perf_counter() - started))
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total * 1000, 1),
+            'steps': {
+                step.name: {'items': step.items, 'ms': round(step.seconds * 1000, 1)}
+                for step in self.steps
+            },
+        }
+
+    def __str__(self):
+        steps = ', '.join(
+            f'{step.name} {step.items} за {step.seconds * 1000:.0f} мс' for step in self.steps
+        )
+        return f'{self.total * 1000:.0f} мс ({steps})'
+
+
+def walk(elements, source=None):
+    """
+    Элементы макета с раскрытыми Repeat: пары (элемент, source ближайшего Repeat)
+    """
+    for element in elements:
+        if isinstance(element, Repeat):
+            yield from walk(element.elements, element.source or source)
+        else:
+            yield element, source
+
+
+def elements(generator_classes):
+    """
+    Все элементы всех макетов генераторов (см. walk)
+    """
+    for generator_class in generator_classes:
+        for layout in generator_class.layouts().values():
+            yield from walk(layout.elements)
+
+
+def warm_fonts(generator_classes, scale=1):
+    """
+    Шрифты всех текстов макетов в масштабе scale
+    """
+    sizes = {'regular': set(), 'bold': set()}
+    for element, _ in elements(generator_classes):
+        if isinstance(element, Text):
+            sizes['bold' if element.bold else 'regular'].add(max(1, render_plan.scaled(element.size, scale)))
+    return fonts.registry.preload({weight: sorted(values) for weight, values in sizes.items()})
+
+
+def warm_pillow():
+    """
+    Плагины Pillow и кодеки всех доступных профилей вывода
+    """
+    Image.init()
+    image = Image.new('RGB', (8, 8))
+    profiles = {encoders.resolve(name) for name in encoders.PROFILES}
+    for name in profiles:
+        encoders.encode(image, name)
+    return len(profiles)
+
+
+def warm_layouts(generator_classes, scale=1):
+    """
+    Планы макетов: компиляция растеризует спрайты статичных слоёв,
+    plan.warm() строит фоны (префиксы)
+    """
+    count = 0
+    for generator_class in generator_classes:
+        for name in generator_class.layouts():
+            render_plan.compile_layout(generator_class, name, scale).warm()
+            count += 1
+    return count
+
+
+def warm_shadows(generator_classes, scale=1):
+    """
+    Тени под фото: размер и параметры известны из макета
+    """
+    keys = set()
+    for element, _ in elements(generator_classes):
+        if isinstance(element, Photo) and element.shadow is not None:
+            shadow = element.shadow
+            keys.add((
+                render_plan.scaled(element.size, scale),
+                render_plan.scaled(shadow.spread, scale),
+                render_plan.scaled(shadow.offset, scale),
+                render_plan.scaled(shadow.blur, scale),
+                shadow.opacity,
+            ))
+    for size, spread, offset, blur, opacity in keys:
+        shadows.drop_shadow(size, spread, offset, blur, opacity)
+    return len(keys)
+
+
+def warm_icons(generator_classes, scale=1):
+    """
+    Листы атласа иконок: для Icon и для текстов списков (эмодзи в данных)
+    """
+    sizes = set()
+    for element, source in elements(generator_classes):
+        if isinstance(element, Icon) or (isinstance(element, Text) and source is not None):
+            sizes.add(max(1, render_plan.scaled(element.size, scale)))
+    for size in sizes:
+        icons.sheet(size)
+    return len(sizes)
+
+
+def warm_up(generator_classes=None, scale=1, freeze=False):
+    """
+    Прогревает кэши рендеринга для генераторов (по умолчанию - всех стилей)
+    freeze=True - gc.freeze() после прогрева, для серверов с fork
+    Возвращает WarmupReport
+    """
+    if generator_classes is None:
+        generator_classes = list(dict.fromkeys(registry.values()))
+
+    report = WarmupReport()
+    report.step('fonts', lambda: warm_fonts(generator_classes, scale))
+    report.step('pillow', warm_pillow)
+    report.step('icons', lambda: warm_icons(generator_classes, scale))
+    report.step('layouts', lambda: warm_layouts(generator_classes, scale))
+    report.step('shadows', lambda: warm_shadows(generator_classes, scale))
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    logger.info('Кэши рендеринга прогреты: %s', report)
+    return report
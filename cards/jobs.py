@@ -0,0 +1,211 @@
+"""
+Локальная очередь задач рендеринга на базе основной БД
+
+Без внешнего брокера: задачи - это строки RenderJob, воркер
+(manage.py render_worker) забирает их по приоритету и времени доступности.
+"""
+
+from datetime import timedelta
+import logging
+import os
+import socket
+import time
+import traceback
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import GeneratedCard, RenderJob
+from . import rendering
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(build, style, priority=RenderJob.PRIORITY_INTERACTIVE):
+    """
+    Ставит рендеринг сборки в очередь
+    """
+    return RenderJob.objects.create(
+        build=build,
+        style=style,
+        priority=priority,
+        total=rendering.card_count(style),
+        max_attempts=getattr(settings, 'CARDS_JOB_MAX_ATTEMPTS', 3),
+    )
+
+
+def claim_next(worker_name):
+    """
+    Атомарно забирает следующую задачу из очереди или возвращает None
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        job = (
+            RenderJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=RenderJob.STATUS_QUEUED, available_at__lte=now)
+            .order_by('-priority', 'available_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+
+        # Условное обновление защищает от гонки на БД без SELECT FOR UPDATE (SQLite)
+        claimed = RenderJob.objects.filter(pk=job.pk, status=RenderJob.STATUS_QUEUED).update(
+            status=RenderJob.STATUS_RUNNING,
+            worker=worker_name,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+
+    if not claimed:
+        return None
+
+    job.refresh_from_db()
+    return job
+
+
+def run_inline(job):
+    """
+    Выполняет задачу прямо в текущем процессе (разработка без воркера)
+    """
+    claimed = RenderJob.objects.filter(pk=job.pk, status=RenderJob.STATUS_QUEUED).update(
+        status=RenderJob.STATUS_RUNNING,
+        worker='inline',
+        started_at=timezone.now(),
+        attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return False
+
+    job.refresh_from_db()
+    # Пользователь ждёт ответа прямо сейчас - без отложенных повторов
+    return run_job(job, retry=False)
+
+
+def run_job(job, retry=True):
+    """
+    Выполняет задачу; при ошибке ставит её на повтор или помечает как упавшую
+    Возвращает True при успехе
+    """
+    def progress(done, total):
+        RenderJob.objects.filter(pk=job.pk).update(progress=done, total=total)
+
+    try:
+        rendering.render_build(job.build, job.style, progress=progress)
+    except Exception:
+        _fail(job, traceback.format_exc(), retry=retry)
+        return False
+
+    RenderJob.objects.filter(pk=job.pk).update(
+        status=RenderJob.STATUS_DONE,
+        finished_at=timezone.now(),
+        error='',
+    )
+    return True
+
+
+def _fail(job, error, retry=True):
+    """
+    Повтор с экспоненциальной задержкой, пока не кончились попытки
+    """
+    now = timezone.now()
+    logger.warning('Render job %s failed (attempt %s/%s)', job.pk, job.attempts, job.max_attempts)
+
+    if retry and job.attempts < job.max_attempts:
+        delay = getattr(settings, 'CARDS_JOB_RETRY_DELAY', 5) * 2 ** (job.attempts - 1)
+        RenderJob.objects.filter(pk=job.pk).update(
+            status=RenderJob.STATUS_QUEUED,
+            available_at=now + timedelta(seconds=delay),
+            error=error,
+        )
+    else:
+        RenderJob.objects.filter(pk=job.pk).update(
+            status=RenderJob.STATUS_FAILED,
+            finished_at=now,
+            error=error,
+        )
+
+
+def requeue_stale(timeout):
+    """
+    Возвращает в очередь задачи, зависшие в статусе "выполняется"
+    (воркер умер посреди рендеринга). Задачи, исчерпавшие попытки, помечаются
+    упавшими: иначе задача, которая сама убивает воркер (OOM, падение в
+    Pillow), возвращалась бы в очередь бесконечно
+    Возвращает (возвращено в очередь, помечено упавшими)
+    """
+    now = timezone.now()
+    stale = RenderJob.objects.filter(
+        status=RenderJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=timeout),
+    )
+
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=RenderJob.STATUS_FAILED,
+        finished_at=now,
+        error=f'Воркер не завершил задачу за {timeout} с ни в одной из попыток (процесс упал или завис)',
+    )
+    requeued = stale.update(status=RenderJob.STATUS_QUEUED, available_at=now)
+    if failed:
+        logger.warning('Marked %s stale render jobs as failed: attempts exhausted', failed)
+    return requeued, failed
+
+
+def work(max_jobs=None, poll_interval=1.0, stop_when_empty=False, worker_name=None):
+    """
+    Цикл воркера: забирает и выполняет задачи
+    max_jobs: выйти после N задач (воркер перезапускается супервизором)
+    stop_when_empty: выйти, как только очередь опустела
+    Возвращает количество выполненных задач
+    """
+    worker_name = worker_name or f'{socket.gethostname()}:{os.getpid()}'
+    processed = 0
+
+    while not max_jobs or processed < max_jobs:
+        job = claim_next(worker_name)
+
+        if job is None:
+            if stop_when_empty and not _has_pending():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info('Worker %s: job %s (%s)', worker_name, job.pk, job.style)
+        run_job(job)
+        processed += 1
+
+    return processed
+
+
+def _has_pending():
+    return RenderJob.objects.filter(status=RenderJob.STATUS_QUEUED).exists()
+
+
+def result_url(job):
+    """
+    Куда вести пользователя после завершения задачи
+    """
+    if job.status != RenderJob.STATUS_DONE:
+        return None
+
+    if job.style == rendering.ALL_STYLES:
+        return reverse('cards:build_result', kwargs={'build_id': job.build_id})
+
+    if rendering.GENERATOR_MAP.is_series(job.style):
+        return reverse('cards:series_result', kwargs={'build_id': job.build_id, 'style': job.style})
+
+    card = (
+        GeneratedCard.objects
+        .filter(build_id=job.build_id, style=job.style)
+        .order_by('-created_at')
+        .first()
+    )
+    if card is None:
+        return None
+    return reverse('cards:card_detail', kwargs={'card_id': card.id})
@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import PIL
+from django.core.management.base import BaseCommand, CommandError
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Синтетические сборки: короткие строки и максимально заполненная карточка
+BUILDS = {
+    'budget': {
+        'name': 'Бюджетный ПК',
+        'cpu': 'AMD Ryzen 5 7500F',
+        'gpu': 'RTX 4060 8GB',
+        'ram': 'DDR5 16GB',
+        'storage': 'SSD M.2 512GB NVMe',
+        'motherboard': 'B650',
+        'psu': '650W',
+        'price': 45000,
+        'bonuses': '',
+    },
+    'top': {
+        'name': 'Топовый ПК',
+        'cpu': 'AMD Ryzen 9 7950X3D 16 ядер 32 потока',
+        'gpu': 'NVIDIA GeForce RTX 4090 24GB GDDR6X',
+        'ram': 'DDR5 64GB (2x32GB) 6000MHz CL30',
+        'storage': 'SSD M.2 2TB NVMe PCIe 4.0',
+        'motherboard': 'ASUS ROG Crosshair X670E Hero',
+        'psu': '1000W 80+ Platinum',
+        'case': 'Lian Li O11 Dynamic EVO',
+        'cooling': 'СЖО 360 мм ARGB',
+        'price': 250000,
+        'bonuses': 'Windows 11 Pro\nБесплатная доставка\nГарантия 3 года',
+    },
+}
+
+DEFAULT_RESOLUTIONS = '800x600,2000x1500,4000x3000'
+
+
+def _percentile(values, percent):
+    """
+    Перцентиль методом ближайшего ранга
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _peak_rss_kb():
+    """
+    Пиковый RSS процесса в КБ (None, если платформа не умеет)
+    Это максимум за всю жизнь процесса, а не за отдельный случай
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS отдаёт байты, Linux - килобайты
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк рендеринга карточек на синтетических сборках (без БД)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--styles', default='all',
+            help='Стили через запятую или all',
+        )
+        parser.add_argument(
+            '--builds', default=','.join(BUILDS),
+            help=f'Синтетические сборки через запятую ({", ".join(BUILDS)})',
+        )
+        parser.add_argument(
+            '--resolutions', default=DEFAULT_RESOLUTIONS,
+            help='Разрешения синтетического фото, например 800x600,4000x3000',
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=5,
+            help='Замеров на каждый случай',
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=1,
+            help='Прогревочных рендеров перед замерами',
+        )
+        parser.add_argument(
+            '--cold', action=argparse.BooleanOptionalAction, default=None,
+            help='Сбрасывать кэши фона и фото перед каждым рендером; по умолчанию - '
+                 'если задано несколько разрешений (с тёплым кэшем фото разрешение не влияет на время)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Сохранить результаты в JSON (подходит как --baseline для следующих запусков)',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON прошлого запуска для сравнения',
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.15,
+            help='Допустимое замедление p50 относительно baseline (доля, 0.15 = 15%%)',
+        )
+
+    def handle(self, *args, **options):
+        from cards import rendering
+
+        styles = self._parse_list(options['styles'], rendering.GENERATOR_MAP, 'стили')
+        builds = self._parse_list(options['builds'], BUILDS, 'сборки')
+        resolutions = self._parse_resolutions(options['resolutions'])
+        if options['iterations'] < 1:
+            raise CommandError('--iterations должен быть не меньше 1')
+        if options['cold'] is None:
+            options['cold'] = len(resolutions) > 1
+
+        results = {}
+        with tempfile.TemporaryDirectory(prefix='bench_render_') as tmp:
+            for width, height in resolutions:
+                photo = self._make_photo(tmp, width, height)
+
+                for build_name in builds:
+                    build = self._make_build(build_name, photo)
+
+                    for style, number, render in self._cases(build, styles):
+                        case = f'{style}:{number}/{build_name}/{width}x{height}'
+                        results[case] = self._measure(style, number, render, options)
+                        self._print_case(case, results[case])
+
+        # Пик RSS - один на весь запуск: ru_maxrss не сбрасывается между случаями
+        peak_rss = _peak_rss_kb()
+        self.stdout.write(f'Пиковый RSS процесса: {peak_rss // 1024 if peak_rss is not None else "?"} МБ')
+
+        report = {
+            'meta': {**self._meta(options), 'peak_rss_kb': peak_rss},
+            'results': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Результаты сохранены в {options["output"]}')
+
+        if options['baseline']:
+            self._compare(results, options['baseline'], options['tolerance'])
+
+    def _cases(self, build, styles):
+        """
+        (стиль, номер, функция рендеринга) для каждой карточки каждого стиля
+        Серия MIXPC меряется по карточкам - каждый generate_* отдельно
+        """
+        from cards import rendering
+
+        for style in styles:
+            generator_class = rendering.GENERATOR_MAP[style]
+            series = getattr(generator_class, 'SERIES_CARDS', None)
+
+            if not series:
+                yield style, 1, lambda cls=generator_class: cls(build).generate()
+                continue
+
+            for number, method in enumerate(series, 1):
+                yield style, number, lambda cls=generator_class, m=method: getattr(cls(build), m)()
+
+    def _measure(self, style, number, render, options):
+        from cards.generators import cache, encoders
+
+        for _ in range(options['warmup']):
+            render()
+
+        timings = []
+        image = None
+        for _ in range(options['iterations']):
+            if options['cold']:
+                cache.clear_all()
+            started = time.perf_counter()
+            image = render()
+            timings.append(time.perf_counter() - started)
+
+        encoded = encoders.encode(image, encoders.profile_for(style, number))
+
+        return {
+            'iterations': len(timings),
+            'p50_ms': round(_percentile(timings, 50) * 1000, 2),
+            'p95_ms': round(_percentile(timings, 95) * 1000, 2),
+            'mean_ms': round(statistics.fmean(timings) * 1000, 2),
+            'profile': encoded.profile,
+            'encoded_bytes': len(encoded.data),
+            'encode_ms': round(encoded.seconds * 1000, 2),
+        }
+
+    def _print_case(self, case, result):
+        self.stdout.write(
+            f'{case:<36} p50 {result["p50_ms"]:>8.1f} мс  p95 {result["p95_ms"]:>8.1f} мс  '
+            f'{result["profile"]:<8} {result["encoded_bytes"]:>8} байт'
+        )
+
+    def _compare(self, results, path, tolerance):
+        """
+        Сравнивает p50 с baseline; падает, если что-то замедлилось сильнее tolerance
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Не удалось прочитать baseline {path}: {e}')
+
+        regressions = []
+        self.stdout.write('')
+        self.stdout.write(f'Сравнение с {path} (допуск {tolerance:.0%}):')
+        for case, result in results.items():
+            if case not in baseline:
+                self.stdout.write(f'{case:<36} нет в baseline')
+                continue
+
+            before = baseline[case]['p50_ms']
+            change = (result['p50_ms'] - before) / before if before else 0
+            line = f'{case:<36} {before:>8.1f} -> {result["p50_ms"]:>8.1f} мс ({change:+.1%})'
+
+            if change > tolerance:
+                regressions.append(case)
+                self.stdout.write(self.style.ERROR(line))
+            elif change < -tolerance:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f'Замедление сверх допуска: {len(regressions)} случаев')
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
+
+    def _meta(self, options):
+        from cards import rendering
+
+        return {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+            'cold': options['cold'],
+            'generators': {
+                style: getattr(generator_class, 'VERSION', None)
+                for style, generator_class in rendering.GENERATOR_MAP.items()
+            },
+        }
+
+    def _make_photo(self, directory, width, height):
+        """
+        Детерминированное синтетическое фото с деталями (фрактал + градиент)
+        """
+        from PIL import Image
+
+        detail = Image.effect_mandelbrot((width, height), (-2.2, -1.2, 1.0, 1.2), 64)
+        shade = Image.linear_gradient('L').resize((width, height))
+        glow = Image.radial_gradient('L').resize((width, height))
+        photo = Image.merge('RGB', (detail, shade, glow))
+
+        path = os.path.join(directory, f'photo_{width}x{height}.jpg')
+        photo.save(path, 'JPEG', quality=90)
+        return path
+
+    def _make_build(self, name, photo_path):
+        """
+        PCBuild в памяти, без сохранения в БД
+        """
+        from cards.models import PCBuild
+
+        fields = dict(BUILDS[name])
+        bonuses = fields.pop('bonuses')
+
+        build = PCBuild(pk=0, **fields)
+        # Генераторы читают bonuses через getattr - у модели такого поля нет
+        build.bonuses = bonuses
+        # FieldFile требует файл внутри MEDIA_ROOT - генераторам достаточно path
+        build.photo = SimpleNamespace(path=photo_path, name=os.path.basename(photo_path))
+        return build
+
+    def _parse_list(self, value, known, label):
+        if value == 'all':
+            return list(known)
+
+        items = [item.strip() for item in value.split(',') if item.strip()]
+        unknown = [item for item in items if item not in known]
+        if unknown:
+            raise CommandError(f'Неизвестные {label}: {", ".join(unknown)}')
+        return items
+
+    def _parse_resolutions(self, value):
+        resolutions = []
+        for item in value.split(','):
+            try:
+                width, height = (int(part) for part in item.strip().lower().split('x'))
+            except ValueError:
+                raise CommandError(f'Разрешение должно иметь вид ШИРИНАxВЫСОТА: {item}')
+            resolutions.append((width, height))
+        return resolutions
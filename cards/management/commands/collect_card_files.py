@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Удаляет файлы карточек, на которые не ссылается ни одна GeneratedCard'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int,
+            help='Удалять файлы без ссылок старше стольких секунд (по умолчанию CARDS_FILE_GRACE_PERIOD)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, сколько файлов будет удалено',
+        )
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Сначала пересчитать счётчики ссылок по GeneratedCard',
+        )
+
+    def handle(self, *args, **options):
+        from django.db.models import Count, Sum
+        from cards import storage
+
+        if options['recount']:
+            fixed = self._recount()
+            self.stdout.write(f'Исправлено счётчиков: {fixed}')
+
+        if options['dry_run']:
+            summary = storage.garbage(options['grace']).aggregate(files=Count('id'), size=Sum('size'))
+            self.stdout.write(f"Будет удалено файлов: {summary['files']}, {summary['size'] or 0} байт")
+            return
+
+        deleted, freed = storage.collect(options['grace'])
+        self.stdout.write(self.style.SUCCESS(f'Удалено файлов: {deleted}, освобождено {freed} байт'))
+
+    def _recount(self):
+        """
+        Пересчитывает refcount по фактическим ссылкам (после queryset.update() и т.п.)
+        """
+        from django.db.models import Count
+        from cards.models import GeneratedCard, StoredFile
+        from cards import storage
+
+        actual = dict(
+            GeneratedCard.objects.exclude(image='').exclude(image__isnull=True)
+            .values_list('image').annotate(count=Count('id'))
+        )
+
+        fixed = 0
+        for stored in StoredFile.objects.only('id', 'name', 'refcount'):
+            count = actual.pop(stored.name, 0)
+            if stored.refcount != count:
+                StoredFile.objects.filter(pk=stored.pk).update(refcount=count)
+                fixed += 1
+
+        # Файлы, на которые ссылаются, но которые ещё не зарегистрированы
+        for name, count in actual.items():
+            storage.acquire(name, count)
+            fixed += 1
+
+        return fixed
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит сохранённые карточки, общие для всех сборок (доставка и трейд-ин MIXPC), '
+        'на один файл и удаляет дубликаты'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, сколько карточек затронет, ничего не рендерить и не удалять',
+        )
+
+    def handle(self, *args, **options):
+        from cards.models import GeneratedCard
+        from cards import render_cache, rendering
+
+        total_cards = total_files = 0
+
+        for style, generator_class in rendering.GENERATOR_MAP.items():
+            for number in generator_class.SHARED_CARDS:
+                cards = GeneratedCard.objects.filter(style=style, card_number=number).exclude(image='')
+
+                if options['dry_run']:
+                    name = render_cache.lookup(rendering.shared_card_key(style, number))
+                    count = cards.exclude(image=name).count() if name else cards.count()
+                    self.stdout.write(f'{style} #{number}: {count} карточек -> {name or "(ещё не отрендерена)"}')
+                    total_cards += count
+                    continue
+
+                name = rendering.shared_card(style, number)
+                count, deleted = self._relink(cards.exclude(image=name), name)
+                self.stdout.write(f'{style} #{number}: {count} карточек -> {name}, удалено файлов: {deleted}')
+                total_cards += count
+                total_files += deleted
+
+        self.stdout.write(self.style.SUCCESS(f'Готово: карточек {total_cards}, удалено файлов {total_files}'))
+
+    def _relink(self, cards, name):
+        """
+        Переводит карточки на общий файл и удаляет файлы, на которые больше никто не ссылается
+        Возвращает (карточек, удалено файлов)
+        """
+        from cards import storage, thumbnails
+
+        # update() не вызывает сигналы - ссылки переносим сами
+        references = Counter(cards.values_list('image', flat=True))
+        count = cards.update(image=name, thumbnails=thumbnails.generate(name))
+
+        storage.acquire(name, count)
+        for old_name, old_count in references.items():
+            storage.release(old_name, old_count)
+
+        deleted, _ = storage.collect(grace=0, names=list(references))
+        return count, deleted
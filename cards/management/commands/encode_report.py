@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Размер и время кодирования карточек сборки в разных форматах (без сохранения)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('build_id', type=int, help='id сборки PCBuild')
+        parser.add_argument(
+            '--styles', default='all',
+            help='Стили через запятую или all',
+        )
+        parser.add_argument(
+            '--profiles',
+            help='Профили вывода через запятую (по умолчанию все поддерживаемые)',
+        )
+
+    def handle(self, *args, **options):
+        from cards.models import PCBuild
+        from cards import rendering
+        from cards.generators import encoders
+        from cards.generators.card_generator import CardGenerator
+
+        try:
+            build = PCBuild.objects.get(pk=options['build_id'])
+        except PCBuild.DoesNotExist:
+            raise CommandError(f"Сборка {options['build_id']} не найдена")
+
+        styles = []
+        for style in options['styles'].split(','):
+            style = style.strip()
+            if style != rendering.ALL_STYLES and style not in rendering.GENERATOR_MAP:
+                raise CommandError(f'Неизвестный стиль: {style}')
+            styles.extend(rendering.expand_styles(style))
+
+        names = None
+        if options['profiles']:
+            names = [name.strip() for name in options['profiles'].split(',')]
+            unknown = [name for name in names if name not in encoders.PROFILES]
+            if unknown:
+                raise CommandError(f"Неизвестные профили: {', '.join(unknown)}")
+
+        generator = CardGenerator(build)
+        totals = {}
+
+        self.stdout.write(f"{'карточка':<12} {'профиль':<10} {'байт':>10} {'мс':>8}")
+        for style in styles:
+            for number, image in generator.render(style).items():
+                current = encoders.profile_for(style, number)
+                for row in encoders.report(image, names):
+                    marker = ' *' if row['profile'] == current else ''
+                    self.stdout.write(
+                        f"{style + ':' + str(number):<12} {row['profile']:<10} "
+                        f"{row['bytes']:>10} {row['seconds'] * 1000:>8.1f}{marker}"
+                    )
+                    total = totals.setdefault(row['profile'], [0, 0.0])
+                    total[0] += row['bytes']
+                    total[1] += row['seconds']
+
+        self.stdout.write('')
+        self.stdout.write('Итого по профилям (* - текущий профиль карточки):')
+        for name, (size, seconds) in totals.items():
+            self.stdout.write(f'{name:<10} {size:>10} байт {seconds * 1000:>8.1f} мс')
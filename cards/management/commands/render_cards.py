@@ -0,0 +1,281 @@
+from contextlib import nullcontext
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _init_worker():
+    """
+    Инициализация процесса пула
+    """
+    # При запуске через spawn/forkserver Django нужно инициализировать заново
+    django.setup()
+
+
+def _render_chunk(build_ids, styles):
+    """
+    Рендерит пачку сборок во всех стилях (выполняется в процессе пула)
+    Возвращает (готовые id, количество карточек, ошибки)
+    """
+    from cards.models import PCBuild
+    from cards import rendering
+
+    done, cards, errors = [], 0, []
+
+    # Одна выборка на пачку вместо запроса на каждую сборку
+    for build in PCBuild.objects.filter(id__in=build_ids):
+        try:
+            for style in styles:
+                # Параллельность уже на уровне процессов - серия рендерится в одном потоке
+                cards += len(rendering.render_build(build, style, workers=1))
+        except Exception as e:
+            errors.append((build.id, f'{type(e).__name__}: {e}'))
+            continue
+        done.append(build.id)
+
+    return done, cards, errors
+
+
+class Command(BaseCommand):
+    help = 'Массовый рендеринг карточек для каталога сборок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='FIELD=VALUE',
+            help='Фильтр queryset PCBuild, например created_at__gte=2026-01-01 (можно несколько)',
+        )
+        parser.add_argument(
+            '--ids-file',
+            help='CSV (колонка id или первая колонка) или JSON (список id или объектов с id)',
+        )
+        parser.add_argument(
+            '--styles', default='msi',
+            help='Стили через запятую или all',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Количество процессов рендеринга',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=50,
+            help='Сборок на одну выборку из БД / одну задачу пула',
+        )
+        parser.add_argument(
+            '--checkpoint', default='render_cards.checkpoint',
+            help='Файл с id готовых сборок; прерванный запуск с теми же аргументами '
+                 'продолжится с него. Удаляется после запуска без ошибок',
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Игнорировать чекпоинт и начать заново',
+        )
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Не рендерить, а поставить пакетные задачи в очередь render_worker',
+        )
+
+    def handle(self, *args, **options):
+        from cards.models import PCBuild, RenderJob
+        from cards import jobs, rendering
+
+        styles = self._parse_styles(options['styles'], rendering.GENERATOR_MAP)
+        ids = self._read_ids_file(options['ids_file']) if options['ids_file'] else None
+        queryset = self._build_queryset(PCBuild, options, ids)
+
+        checkpoint = options['checkpoint']
+        if options['restart'] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        run_key = self._run_key(styles, options, ids)
+        done_ids = self._read_checkpoint(checkpoint, run_key)
+
+        build_ids = [pk for pk in queryset.order_by('id').values_list('id', flat=True).iterator()
+                     if pk not in done_ids]
+        if done_ids:
+            self.stdout.write(f'Чекпоинт: пропускаем {len(done_ids)} готовых сборок')
+
+        if not build_ids:
+            # Прерванный запуск успел отрендерить всё - чекпоинт больше не нужен
+            if done_ids:
+                os.remove(checkpoint)
+            self.stdout.write(self.style.SUCCESS('Нечего рендерить'))
+            return
+
+        if options['enqueue']:
+            for build in queryset.filter(id__in=build_ids).iterator(chunk_size=options['chunk_size']):
+                for style in styles:
+                    jobs.enqueue(build, style, priority=RenderJob.PRIORITY_BATCH)
+            self.stdout.write(self.style.SUCCESS(
+                f'Поставлено в очередь: {len(build_ids) * len(styles)} задач'
+            ))
+            return
+
+        self._render(build_ids, styles, options, checkpoint, run_key, resume=bool(done_ids))
+
+    def _render(self, build_ids, styles, options, checkpoint, run_key, resume=False):
+        from cards import rendering
+
+        chunk_size = max(1, options['chunk_size'])
+        chunks = [build_ids[i:i + chunk_size] for i in range(0, len(build_ids), chunk_size)]
+        total_builds = len(build_ids)
+        total_cards = sum(rendering.card_count(style) for style in styles) * total_builds
+
+        self.stdout.write(
+            f'Сборок: {total_builds}, стилей: {", ".join(styles)}, '
+            f'карточек: ~{total_cards}, процессов: {options["processes"]}'
+        )
+
+        render_chunk = _RenderChunk(styles)
+        if options['processes'] > 1:
+            # Дочерние процессы открывают собственные соединения с БД
+            connections.close_all()
+            pool = multiprocessing.Pool(options['processes'], initializer=_init_worker)
+        else:
+            # Один процесс - без пула, в текущем процессе
+            pool = nullcontext()
+
+        started = time.monotonic()
+        builds_done = cards_done = failed = 0
+
+        with open(checkpoint, 'a' if resume else 'w') as checkpoint_file, pool as process_pool:
+            if not resume:
+                checkpoint_file.write(f'# {run_key}\n')
+            results = (
+                process_pool.imap_unordered(render_chunk, chunks) if process_pool
+                else map(render_chunk, chunks)
+            )
+
+            for done, cards, errors in results:
+                for build_id in done:
+                    checkpoint_file.write(f'{build_id}\n')
+                checkpoint_file.flush()
+
+                builds_done += len(done) + len(errors)
+                cards_done += cards
+                failed += len(errors)
+                for build_id, error in errors:
+                    self.stderr.write(f'Сборка {build_id}: {error}')
+
+                self._report(started, builds_done, total_builds, cards_done, failed)
+
+        # Следующий запуск - заново; с ошибками чекпоинт остаётся, повтор
+        # дорендерит только упавшие сборки
+        if not failed:
+            os.remove(checkpoint)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: {cards_done} карточек за {elapsed:.1f} с '
+            f'({cards_done / elapsed if elapsed else 0:.2f} карт./с), ошибок: {failed}'
+        ))
+
+    def _report(self, started, builds_done, total_builds, cards_done, failed):
+        """
+        Печатает пропускную способность и оставшееся время
+        """
+        elapsed = time.monotonic() - started
+        rate = cards_done / elapsed if elapsed else 0
+        builds_rate = builds_done / elapsed if elapsed else 0
+        eta = (total_builds - builds_done) / builds_rate if builds_rate else 0
+
+        self.stdout.write(
+            f'[{builds_done}/{total_builds}] {rate:.2f} карт./с, '
+            f'ошибок: {failed}, осталось ~{self._format_duration(eta)}'
+        )
+
+    def _parse_styles(self, value, generator_map):
+        if value == 'all':
+            return list(generator_map)
+
+        styles = [style.strip() for style in value.split(',') if style.strip()]
+        unknown = [style for style in styles if style not in generator_map]
+        if unknown:
+            raise CommandError(f'Неизвестные стили: {", ".join(unknown)}')
+        return styles
+
+    def _build_queryset(self, model, options, ids=None):
+        queryset = model.objects.all()
+
+        filters = {}
+        for item in options['filter']:
+            field, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Фильтр должен иметь вид FIELD=VALUE: {item}')
+            filters[field] = value
+        if filters:
+            queryset = queryset.filter(**filters)
+
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+
+        return queryset
+
+    def _read_ids_file(self, path):
+        try:
+            with open(path, newline='', encoding='utf-8') as f:
+                if path.lower().endswith('.json'):
+                    data = json.load(f)
+                    return [int(item['id'] if isinstance(item, dict) else item) for item in data]
+
+                rows = list(csv.reader(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CommandError(f'Не удалось прочитать {path}: {e}')
+
+        if not rows:
+            return []
+
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = header.index('id') if 'id' in header else 0
+        body = rows[1:] if not rows[0][column].strip().isdigit() else rows
+        return [int(row[column]) for row in body if row and row[column].strip().isdigit()]
+
+    def _run_key(self, styles, options, ids):
+        """
+        Ключ запуска для чекпоинта: стили, версии их генераторов, фильтры и id из файла
+        """
+        from cards.generators.registry import registry
+
+        data = {
+            'styles': styles,
+            'versions': [registry[style].VERSION for style in styles],
+            'filters': sorted(options['filter']),
+            'ids': sorted(ids) if ids is not None else None,
+        }
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _read_checkpoint(self, path, run_key):
+        """
+        id готовых сборок; чекпоинт запуска с другими аргументами не учитывается
+        """
+        if not os.path.exists(path):
+            return set()
+        with open(path) as f:
+            lines = f.read().splitlines()
+
+        if not lines or lines[0] != f'# {run_key}':
+            self.stdout.write('Чекпоинт от запуска с другими аргументами - начинаем заново')
+            return set()
+        return {int(line) for line in lines[1:] if line.strip().isdigit()}
+
+    def _format_duration(self, seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f'{hours:d}:{minutes:02d}:{seconds:02d}'
+
+
+class _RenderChunk:
+    """
+    Сериализуемая функция для пула: пачка id -> _render_chunk
+    """
+
+    def __init__(self, styles):
+        self.styles = styles
+
+    def __call__(self, build_ids):
+        return _render_chunk(build_ids, self.styles)
@@ -0,0 +1,116 @@
+import multiprocessing
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_process(max_jobs, poll_interval):
+    """
+    Точка входа дочернего процесса-воркера
+    """
+    # При запуске через spawn/forkserver Django нужно инициализировать заново
+    django.setup()
+    from cards import jobs
+
+    jobs.work(max_jobs=max_jobs, poll_interval=poll_interval)
+
+
+class Command(BaseCommand):
+    help = 'Фоновый воркер рендеринга карточек (очередь в БД, без внешнего брокера)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Количество процессов-воркеров',
+        )
+        parser.add_argument(
+            '--max-jobs', type=int,
+            default=getattr(settings, 'CARDS_WORKER_MAX_JOBS', 100),
+            help='Перезапускать воркер после N задач (0 - без перезапуска)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'CARDS_WORKER_POLL_INTERVAL', 1.0),
+            help='Пауза между опросами пустой очереди, секунд',
+        )
+        parser.add_argument(
+            '--stale-timeout', type=int,
+            default=getattr(settings, 'CARDS_JOB_STALE_TIMEOUT', 600),
+            help='Вернуть в очередь задачи, выполняющиеся дольше N секунд',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать очередь в текущем процессе и выйти',
+        )
+
+    def handle(self, *args, **options):
+        from cards import jobs
+
+        self._recover_stale(options['stale_timeout'])
+
+        if options['once']:
+            processed = jobs.work(poll_interval=options['poll_interval'], stop_when_empty=True)
+            self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {processed}'))
+            return
+
+        self._supervise(
+            options['processes'], options['max_jobs'] or None, options['poll_interval'],
+            options['stale_timeout'],
+        )
+
+    def _recover_stale(self, stale_timeout):
+        """
+        Возвращает в очередь (или помечает упавшими) зависшие задачи
+        """
+        from cards import jobs
+
+        requeued, failed = jobs.requeue_stale(stale_timeout)
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Возвращено в очередь зависших задач: {requeued}'))
+        if failed:
+            self.stdout.write(self.style.ERROR(f'Зависших задач без оставшихся попыток: {failed}'))
+
+    def _supervise(self, processes, max_jobs, poll_interval, stale_timeout):
+        """
+        Держит нужное число воркеров и перезапускает тех, кто отработал max_jobs задач
+        Зависшие задачи проверяются раз в половину stale_timeout: воркер может
+        умереть посреди рендеринга в любой момент, а не только до старта
+        """
+        self.stdout.write(
+            f'Запуск {processes} воркер(ов), перезапуск после {max_jobs or "∞"} задач'
+        )
+
+        # Дочерние процессы открывают собственные соединения с БД
+        connections.close_all()
+
+        check_interval = max(poll_interval, stale_timeout / 2)
+        next_check = time.monotonic() + check_interval
+
+        workers = []
+        try:
+            while True:
+                if time.monotonic() >= next_check:
+                    self._recover_stale(stale_timeout)
+                    # Соединение супервизора не должно наследоваться новыми воркерами
+                    connections.close_all()
+                    next_check = time.monotonic() + check_interval
+
+                workers = [worker for worker in workers if worker.is_alive()]
+                while len(workers) < processes:
+                    worker = multiprocessing.Process(
+                        target=_worker_process,
+                        args=(max_jobs, poll_interval),
+                        daemon=True,
+                    )
+                    worker.start()
+                    workers.append(worker)
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Остановка воркеров...')
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Прогревает кэши рендеринга (шрифты, плагины Pillow, фоны, спрайты, тени, иконки) и показывает время'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--styles',
+            help='Стили через запятую (по умолчанию все)',
+        )
+        parser.add_argument(
+            '--scale', type=float, default=1,
+            help='Масштаб карточек (по умолчанию 1)',
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Сначала очистить кэши, чтобы замерить прогрев с нуля',
+        )
+
+    def handle(self, *args, **options):
+        from cards.generators import cache, fonts, render_plan, warmup
+        from cards.generators.registry import registry
+
+        styles = options['styles'].split(',') if options['styles'] else list(registry)
+        unknown = [style for style in styles if style not in registry]
+        if unknown:
+            raise CommandError(f"Неизвестные стили: {', '.join(unknown)}")
+
+        if options['clear']:
+            cache.clear_all()
+            fonts.registry.clear()
+            render_plan.compile_layout.cache_clear()
+
+        report = warmup.warm_up([registry[style] for style in styles], scale=options['scale'])
+
+        for step in report.steps:
+            self.stdout.write(f'{step.name:<12} {step.items:>4}  {step.seconds * 1000:8.1f} мс')
+        self.stdout.write(self.style.SUCCESS(f'Кэши прогреты за {report.total * 1000:.0f} мс'))
+        self.stdout.write('Кэши: ' + ', '.join(
+            f"{name} {stats['size']}/{stats['maxsize']}" for name, stats in cache.stats().items()
+        ))
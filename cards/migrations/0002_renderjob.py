@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('style', models.CharField(choices=[('msi', 'MSI Gaming'), ('steam', 'Steam Library'), ('apple', 'Apple Premium'), ('spotify', 'Spotify Minimal'), ('mixpc', 'MIXPC Series')], default='msi', max_length=20, verbose_name='Стиль')),
+                ('status', models.CharField(choices=[('queued', 'В очереди'), ('running', 'Выполняется'), ('done', 'Готово'), ('failed', 'Ошибка')], default='queued', max_length=20, verbose_name='Статус')),
+                ('priority', models.IntegerField(choices=[(0, 'Пакетная'), (10, 'Интерактивная')], default=10, verbose_name='Приоритет')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Попыток')),
+                ('max_attempts', models.IntegerField(default=3, verbose_name='Максимум попыток')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Доступна с')),
+                ('progress', models.IntegerField(default=0, verbose_name='Готово карточек')),
+                ('total', models.IntegerField(default=0, verbose_name='Всего карточек')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Воркер')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Начало')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершение')),
+                ('build', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='cards.pcbuild', verbose_name='Конфигурация')),
+            ],
+            options={
+                'verbose_name': 'Задача рендеринга',
+                'verbose_name_plural': 'Задачи рендеринга',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', '-priority', 'available_at'], name='cards_job_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0002_renderjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='renderjob',
+            name='style',
+            field=models.CharField(choices=[('msi', 'MSI Gaming'), ('steam', 'Steam Library'), ('apple', 'Apple Premium'), ('spotify', 'Spotify Minimal'), ('mixpc', 'MIXPC Series'), ('all', 'Все стили')], default='msi', max_length=20, verbose_name='Стиль'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0004_generatedcard_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='generatedcard',
+            index=models.Index(fields=['-created_at', '-id'], name='cards_card_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='generatedcard',
+            index=models.Index(fields=['style', '-created_at', '-id'], name='cards_card_style_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='generatedcard',
+            index=models.Index(fields=['build', 'style', 'card_number'], name='cards_card_series_idx'),
+        ),
+    ]
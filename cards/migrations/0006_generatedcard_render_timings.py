@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0005_generatedcard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedcard',
+            name='render_timings',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Время этапов'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:21
+
+import os
+
+import django.db.models.deletion
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Каталоги, куда карточки сохранялись до хранилища по содержимому
+LEGACY_DIRS = ('generated', 'render_cache')
+
+
+def _legacy_files():
+    """
+    Имена файлов в старых каталогах (render_cache шардирован на один уровень)
+    """
+    for directory in LEGACY_DIRS:
+        if not default_storage.exists(directory):
+            continue
+        subdirs, files = default_storage.listdir(directory)
+        for name in files:
+            yield f'{directory}/{name}'
+        for subdir in subdirs:
+            for name in default_storage.listdir(f'{directory}/{subdir}')[1]:
+                yield f'{directory}/{subdir}/{name}'
+
+
+def register_existing_files(apps, schema_editor):
+    """
+    Заводит StoredFile на уже сохранённые карточки: со ссылками из GeneratedCard
+    и без них (такие удалит collect_card_files). Файлы старого кэша рендеринга
+    остаются доступны по ключу - ключ был именем файла
+    """
+    GeneratedCard = apps.get_model('cards', 'GeneratedCard')
+    StoredFile = apps.get_model('cards', 'StoredFile')
+    RenderCacheEntry = apps.get_model('cards', 'RenderCacheEntry')
+
+    references = dict(
+        GeneratedCard.objects.exclude(image='').exclude(image__isnull=True)
+        .values_list('image').annotate(count=Count('id'))
+    )
+    names = set(references) | set(_legacy_files())
+
+    for name in sorted(names):
+        size = default_storage.size(name) if default_storage.exists(name) else 0
+        stored = StoredFile.objects.create(name=name, size=size, refcount=references.get(name, 0))
+        if name.startswith('render_cache/'):
+            key = os.path.splitext(os.path.basename(name))[0]
+            RenderCacheEntry.objects.get_or_create(key=key, defaults={'file': stored})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0006_generatedcard_render_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя в хранилище')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='Размер, байт')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('released_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя ссылка снята')),
+            ],
+            options={
+                'verbose_name': 'Файл карточки',
+                'verbose_name_plural': 'Файлы карточек',
+                'indexes': [models.Index(fields=['refcount', 'released_at'], name='cards_file_gc_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RenderCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, verbose_name='Ключ')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cache_entries', to='cards.storedfile', verbose_name='Файл')),
+            ],
+            options={
+                'verbose_name': 'Запись кэша рендеринга',
+                'verbose_name_plural': 'Кэш рендеринга',
+            },
+        ),
+        migrations.RunPython(register_existing_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:02
+
+import cards.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0007_card_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedcard',
+            name='style',
+            field=models.CharField(choices=cards.models.style_choices, default='msi', max_length=20, verbose_name='Стиль'),
+        ),
+        migrations.AlterField(
+            model_name='renderjob',
+            name='style',
+            field=models.CharField(choices=cards.models.job_style_choices, default='msi', max_length=20, verbose_name='Стиль'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 
 
 class PCBuild(models.Model):
@@ -60,9 +61,28 @@ class PCBuild(models.Model):
         return specs
 
 
+def style_choices():
+    """
+    Стили реестра (generators.registry): встроенные с подписями, сторонние - по имени
+    Вызывается лениво, модули стилей не импортируются
+    """
+    from .generators.registry import registry
+    
+    labels = dict(GeneratedCard.STYLE_CHOICES)
+    return [(style, labels.get(style, style)) for style in registry]
+
+
+def job_style_choices():
+    """
+    Стили задачи рендеринга: стили реестра и 'all' - все за один проход
+    """
+    return style_choices() + [('all', 'Все стили')]
+
+
 class GeneratedCard(models.Model):
     """Сгенерированная карточка"""
     
+    # Подписи встроенных стилей (choices поля - style_choices)
     STYLE_CHOICES = [
         ('msi', 'MSI Gaming'),
         ('steam', 'Steam Library'),
@@ -81,7 +101,7 @@ class GeneratedCard(models.Model):
     style = models.CharField(
         'Стиль',
         max_length=20,
-        choices=STYLE_CHOICES,
+        choices=style_choices,
         default='msi'
     )
     
@@ -99,6 +119,12 @@ class GeneratedCard(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(10)]
     )
     
+    # Миниатюры для галерей: {'ширина': имя файла} (см. cards.thumbnails)
+    thumbnails = models.JSONField('Миниатюры', default=dict, blank=True)
+    
+    # Время этапов рендеринга (при CARDS_PROFILE_STAGES, см. generators.profiling)
+    render_timings = models.JSONField('Время этапов', default=dict, blank=True)
+    
     # Метаданные
     created_at = models.DateTimeField('Дата создания', auto_now_add=True)
     
@@ -106,6 +132,13 @@ class GeneratedCard(models.Model):
         verbose_name = 'Сгенерированная карточка'
         verbose_name_plural = 'Сгенерированные карточки'
         ordering = ['-created_at', 'card_number']
+        indexes = [
+            # Галерея: keyset-пагинация по (created_at, id), с фильтром по стилю и без
+            models.Index(fields=['-created_at', '-id'], name='cards_card_recent_idx'),
+            models.Index(fields=['style', '-created_at', '-id'], name='cards_card_style_idx'),
+            # Серия сборки: series_result, download_series
+            models.Index(fields=['build', 'style', 'card_number'], name='cards_card_series_idx'),
+        ]
     
     def __str__(self):
         if self.style == 'mixpc':
@@ -127,3 +160,154 @@ class GeneratedCard(models.Model):
         }
         
         return titles.get(self.card_number, f'Карточка #{self.card_number}')
+    
+    def thumbnail_url(self, width=None):
+        """URL миниатюры (создаётся при первом запросе, если её ещё нет)"""
+        from . import thumbnails
+        return thumbnails.url(self, width)
+    
+    def thumbnail_srcset(self):
+        """srcset со всеми размерами миниатюр"""
+        from . import thumbnails
+        return thumbnails.srcset(self)
+
+
+class StoredFile(models.Model):
+    """Файл карточки в хранилище, имя - хэш содержимого (см. cards.storage)"""
+    
+    name = models.CharField('Имя в хранилище', max_length=255, unique=True)
+    size = models.PositiveIntegerField('Размер, байт', default=0)
+    
+    # Сколько GeneratedCard ссылаются на файл (ведётся сигналами cards.signals);
+    # файлы без ссылок удаляет manage.py collect_card_files
+    refcount = models.PositiveIntegerField('Ссылок', default=0)
+    
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    released_at = models.DateTimeField('Последняя ссылка снята', blank=True, null=True)
+    
+    class Meta:
+        verbose_name = 'Файл карточки'
+        verbose_name_plural = 'Файлы карточек'
+        indexes = [
+            # Сборка мусора: файлы без ссылок
+            models.Index(fields=['refcount', 'released_at'], name='cards_file_gc_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+
+class RenderCacheEntry(models.Model):
+    """Кэш рендеринга: ключ входных данных карточки -> готовый файл"""
+    
+    key = models.CharField('Ключ', max_length=64, unique=True)
+    
+    # Файл удалён сборщиком мусора - запись кэша удаляется вместе с ним
+    file = models.ForeignKey(
+        StoredFile,
+        on_delete=models.CASCADE,
+        related_name='cache_entries',
+        verbose_name='Файл'
+    )
+    
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Запись кэша рендеринга'
+        verbose_name_plural = 'Кэш рендеринга'
+    
+    def __str__(self):
+        return self.key
+
+
+class RenderJob(models.Model):
+    """Задача фонового рендеринга карточек"""
+    
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'В очереди'),
+        (STATUS_RUNNING, 'Выполняется'),
+        (STATUS_DONE, 'Готово'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+    
+    # Интерактивные задачи (пользователь ждёт на странице) идут раньше пакетных
+    PRIORITY_BATCH = 0
+    PRIORITY_INTERACTIVE = 10
+    
+    PRIORITY_CHOICES = [
+        (PRIORITY_BATCH, 'Пакетная'),
+        (PRIORITY_INTERACTIVE, 'Интерактивная'),
+    ]
+    
+    build = models.ForeignKey(
+        PCBuild,
+        on_delete=models.CASCADE,
+        related_name='render_jobs',
+        verbose_name='Конфигурация'
+    )
+    
+    # 'all' - все стили за один проход
+    style = models.CharField(
+        'Стиль',
+        max_length=20,
+        choices=job_style_choices,
+        default='msi'
+    )
+    
+    status = models.CharField(
+        'Статус',
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED
+    )
+    
+    priority = models.IntegerField(
+        'Приоритет',
+        choices=PRIORITY_CHOICES,
+        default=PRIORITY_INTERACTIVE
+    )
+    
+    # Повторы при ошибках
+    attempts = models.IntegerField('Попыток', default=0)
+    max_attempts = models.IntegerField('Максимум попыток', default=3)
+    available_at = models.DateTimeField('Доступна с', default=timezone.now)
+    
+    # Прогресс - сколько карточек из скольких готово
+    progress = models.IntegerField('Готово карточек', default=0)
+    total = models.IntegerField('Всего карточек', default=0)
+    
+    error = models.TextField('Ошибка', blank=True)
+    worker = models.CharField('Воркер', max_length=100, blank=True)
+    
+    # Метаданные
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    started_at = models.DateTimeField('Начало', blank=True, null=True)
+    finished_at = models.DateTimeField('Завершение', blank=True, null=True)
+    
+    class Meta:
+        verbose_name = 'Задача рендеринга'
+        verbose_name_plural = 'Задачи рендеринга'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'available_at'], name='cards_job_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f'#{self.pk} {self.build.name} - {self.get_style_display()} ({self.get_status_display()})'
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+    
+    def progress_percent(self):
+        """Прогресс в процентах для страницы статуса"""
+        if self.status == self.STATUS_DONE:
+            return 100
+        if not self.total:
+            return 0
+        return int(100 * self.progress / self.total)
@@ -0,0 +1,135 @@
+"""
+Кэш готовых карточек, адресуемый содержимым входных данных
+
+Ключ - sha256 от полей сборки, которые читают генераторы и get_specs_list,
+хэша содержимого фото, стиля, номера карточки, версии генератора и
+профиля вывода.
+Одинаковые входы дают одинаковые байты (кодировщики не пишут метаданные),
+поэтому повторно опубликованная сборка не рендерится заново - карточка
+просто ссылается на уже сохранённый файл. Ключ указывает на файл в
+хранилище по содержимому (RenderCacheEntry -> StoredFile, см. cards.storage).
+Карточки из SHARED_CARDS генератора не зависят от сборки: их ключ не
+содержит входных данных, и все сборки ссылаются на один файл.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+import hashlib
+import json
+import os
+
+from django.conf import settings
+
+from .models import RenderCacheEntry
+from . import storage
+from .generators import encoders
+
+
+# Поля PCBuild, от которых зависит изображение карточки
+RENDER_FIELDS = (
+    'cpu', 'gpu', 'ram', 'storage', 'motherboard', 'psu', 'case', 'cooling',
+    'price', 'bonuses',
+)
+
+# Отпечаток вместо входных данных для карточек, общих для всех сборок
+SHARED = 'shared'
+
+
+def is_enabled():
+    return getattr(settings, 'CARDS_RENDER_CACHE', True)
+
+
+def build_fingerprint(build):
+    """
+    Хэш всех входных данных сборки, влияющих на рендеринг
+    """
+    data = {field: _field_value(getattr(build, field, '')) for field in RENDER_FIELDS}
+    data['specs'] = [list(spec) for spec in build.get_specs_list()]
+    data['photo'] = photo_hash(build)
+
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _field_value(value):
+    """
+    Строковое значение поля; цена одинакова и до, и после чтения из БД
+    """
+    if isinstance(value, (Decimal, int, float)):
+        return f'{Decimal(str(value)):.2f}'
+    return str(value or '')
+
+
+def photo_hash(build):
+    """
+    Хэш содержимого фото сборки ('' если фото нет)
+    """
+    if not build.photo:
+        return ''
+
+    path = build.photo.path
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return ''
+    return _file_hash(path, mtime)
+
+
+@lru_cache(maxsize=256)
+def _file_hash(path, mtime):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(fingerprint, style, card_number, generator_class, profile):
+    """
+    Ключ одной карточки: входные данные + стиль + номер + версия генератора
+    + профиль вывода (формат и параметры кодека)
+    """
+    version = f'{generator_class.__module__}.{generator_class.__name__}:{generator_class.VERSION}'
+    encoding = json.dumps([profile, encoders.PROFILES[profile]], sort_keys=True)
+    payload = f'{fingerprint}|{style}|{card_number}|{version}|{encoding}'
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def shared_key(style, card_number, generator_class, profile):
+    """
+    Ключ карточки из SHARED_CARDS: только стиль, номер, версия и профиль
+    """
+    return cache_key(SHARED, style, card_number, generator_class, profile)
+
+
+def is_shared(card_number, generator_class):
+    """
+    Карточка не зависит от сборки и хранится одним файлом на все сборки
+    """
+    return card_number in generator_class.SHARED_CARDS
+
+
+def lookup(key):
+    """
+    Имя готового файла или None, если карточку ещё не рендерили
+    """
+    return lookup_many([key]).get(key)
+
+
+def lookup_many(keys):
+    """
+    {ключ: имя файла} для уже отрендеренных ключей - одним запросом
+    """
+    return dict(
+        RenderCacheEntry.objects.filter(key__in=keys).values_list('key', 'file__name')
+    )
+
+
+def store(key, data, ext):
+    """
+    Сохраняет закодированную карточку в хранилище, запоминает её под ключом
+    и возвращает имя файла
+    """
+    stored = storage.save(data, ext)
+    RenderCacheEntry.objects.get_or_create(key=key, defaults={'file': stored})
+    return stored.name
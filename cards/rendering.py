@@ -0,0 +1,210 @@
+"""
+Рендеринг карточек сборки и сохранение результатов в GeneratedCard
+
+Общая точка входа для фонового воркера и представлений
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import GeneratedCard
+from . import archives, render_cache, storage, thumbnails
+from .generators import encoders
+from .generators.card_generator import CardGenerator
+from .generators.registry import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+# Стиль -> класс генератора (generators.registry, импорт стилей ленивый)
+GENERATOR_MAP = registry
+
+DEFAULT_STYLE = 'msi'
+
+# Профиль кодирования превью (generators.encoders)
+PREVIEW_PROFILE = 'preview'
+
+# Псевдостиль: все зарегистрированные стили за один проход
+ALL_STYLES = 'all'
+
+
+def expand_styles(style):
+    """
+    Список реальных стилей для стиля или псевдостиля 'all'
+    """
+    if style == ALL_STYLES:
+        return list(GENERATOR_MAP)
+    return [style]
+
+
+def card_count(style):
+    """
+    Сколько карточек получается в стиле
+    """
+    if style == ALL_STYLES:
+        return sum(card_count(s) for s in GENERATOR_MAP)
+    return GENERATOR_MAP.info(style).card_count
+
+
+def render_build(build, style, progress=None, workers=None):
+    """
+    Рендерит карточки сборки в выбранном стиле (или во всех - 'all') и сохраняет их
+    вместо прежних карточек сборки в этих стилях
+    Карточки, уже отрендеренные с теми же входными данными, берутся из кэша
+    progress: необязательный callback(done, total) для отображения прогресса
+    workers: потоков на серию MIXPC (см. MIXPCSeriesGenerator.generate_series)
+    Возвращает список созданных GeneratedCard
+    """
+    total = card_count(style)
+
+    if progress:
+        progress(0, total)
+
+    # Все стили за один проход: фото, шрифты и размытия общие
+    generator = CardGenerator(build)
+    use_cache = render_cache.is_enabled()
+    fingerprint = render_cache.build_fingerprint(build) if use_cache else None
+
+    # Кодирование идёт в фоне, пока рисуются следующие стили
+    styles = expand_styles(style)
+    pending = []
+    for style in styles:
+        pending.extend(_render_style(generator, build, style, fingerprint, workers))
+
+    generated_cards = []
+    for style, number, key, result in pending:
+        timings = generator.stage_timings.get((style, number))
+
+        if isinstance(result, str):
+            name = result
+        else:
+            encoded = result.result()
+            if timings is not None:
+                timings.add('encode', encoded.seconds)
+            name = _store(build, style, number, key, encoded)
+
+        card = GeneratedCard(
+            build=build,
+            style=style,
+            card_number=number
+        )
+        card.image.name = name
+        if timings is not None:
+            card.render_timings = timings.as_dict()
+        card.thumbnails = thumbnails.generate(name)
+        generated_cards.append(card)
+
+        if progress:
+            progress(len(generated_cards), total)
+
+    # Карточки сохраняются все вместе: упавший посреди рендеринг (и его
+    # повтор из очереди) не оставляет частичных карточек. Прежние карточки
+    # удаляются поштучно - сигналы снимают их ссылки на файлы хранилища
+    with transaction.atomic():
+        GeneratedCard.objects.filter(build=build, style__in=styles).delete()
+        for card in generated_cards:
+            card.save()
+
+    # Архивы серий собираются сразу, чтобы скачивание отдавало готовый файл
+    if archives.is_enabled():
+        for style in filter(GENERATOR_MAP.is_series, styles):
+            archives.build_series_archive([card for card in generated_cards if card.style == style])
+
+    return generated_cards
+
+
+def _render_style(generator, build, style, fingerprint, workers):
+    """
+    Рендерит недостающие карточки стиля и отправляет их на кодирование
+    Возвращает [(стиль, номер, ключ кэша, имя файла или Future с Encoded)]
+    fingerprint=None отключает кэш (кроме общих для всех сборок карточек)
+    """
+    numbers = range(1, card_count(style) + 1)
+    profiles = {number: encoders.profile_for(style, number) for number in numbers}
+
+    generator_class = GENERATOR_MAP[style]
+    keys = dict.fromkeys(numbers)
+    results = dict.fromkeys(numbers)
+    for number in numbers:
+        # Общие для всех сборок карточки кэшируются всегда, даже без кэша рендеринга
+        if render_cache.is_shared(number, generator_class):
+            keys[number] = render_cache.shared_key(style, number, generator_class, profiles[number])
+        elif fingerprint is not None:
+            keys[number] = render_cache.cache_key(
+                fingerprint, style, number, generator_class, profiles[number]
+            )
+
+    found = render_cache.lookup_many([key for key in keys.values() if key is not None])
+    for number, key in keys.items():
+        results[number] = found.get(key)
+
+    missing = [number for number, result in results.items() if result is None]
+    if missing:
+        images = generator.render(style, numbers=missing, workers=workers)
+        for number, image in images.items():
+            results[number] = encoders.submit(image, profiles[number])
+
+    return [(style, number, keys[number], results[number]) for number in numbers]
+
+
+def render_preview(build, style, number=1):
+    """
+    Превью карточки для формы создания: уменьшенный масштаб (CARDS_PREVIEW_SIZE)
+    и черновое качество фото. Ничего не сохраняет - ни в БД, ни в хранилище
+    Возвращает Encoded (generators.encoders)
+    """
+    info = GENERATOR_MAP.info(style)
+    if not 1 <= number <= info.card_count:
+        raise ValueError(f'В стиле {style} нет карточки #{number}')
+
+    scale = getattr(settings, 'CARDS_PREVIEW_SIZE', 360) / max(info.size)
+    generator = info.generator(build, scale=scale, quality='draft')
+    method = generator.SERIES_CARDS[number - 1] if generator.SERIES_CARDS else 'generate'
+    image = getattr(generator, method)()
+
+    return encoders.encode(image, PREVIEW_PROFILE)
+
+
+def shared_card_key(style, number):
+    """
+    Ключ кэша рендеринга для карточки, общей для всех сборок (SHARED_CARDS генератора)
+    """
+    generator_class = GENERATOR_MAP[style]
+    if not render_cache.is_shared(number, generator_class):
+        raise ValueError(f'Карточка {style} #{number} зависит от сборки')
+
+    profile = encoders.profile_for(style, number)
+    return render_cache.shared_key(style, number, generator_class, profile)
+
+
+def shared_card(style, number):
+    """
+    Имя файла общей для всех сборок карточки; при первом обращении для
+    текущей версии генератора карточка рендерится
+    """
+    key = shared_card_key(style, number)
+    name = render_cache.lookup(key)
+    if name is not None:
+        return name
+
+    # Такие карточки не читают сборку
+    image = CardGenerator(None, style).render(style, numbers=[number])[number]
+    encoded = encoders.encode(image, encoders.profile_for(style, number))
+    return render_cache.store(key, encoded.data, encoded.ext)
+
+
+def _store(build, style, number, key, encoded):
+    """
+    Сохраняет закодированную карточку (в кэш, если есть ключ) и возвращает имя файла
+    """
+    logger.info(
+        'Card %s/%s #%s: %s, %d bytes, encoded in %.0f ms',
+        build.pk, style, number, encoded.profile, len(encoded.data), encoded.seconds * 1000,
+    )
+
+    if key is not None:
+        return render_cache.store(key, encoded.data, encoded.ext)
+    return storage.save(encoded.data, encoded.ext).name
@@ -0,0 +1,66 @@
+"""
+Счётчик ссылок GeneratedCard на файлы хранилища (см. cards.storage)
+
+Подключается в CardsConfig.ready(). queryset.update() сигналы не вызывает -
+при массовой смене image ссылки нужно переносить вручную (storage.acquire/release)
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import GeneratedCard
+from . import archives, storage
+from .generators.registry import registry
+
+
+@receiver(pre_save, sender=GeneratedCard)
+def remember_image(sender, instance, **kwargs):
+    """
+    Запоминает прежний файл карточки, чтобы при замене снять с него ссылку
+    """
+    instance._previous_image = None
+    if instance.pk is not None:
+        instance._previous_image = (
+            sender.objects.filter(pk=instance.pk).values_list('image', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=GeneratedCard)
+def count_image_reference(sender, instance, created, **kwargs):
+    image = instance.image.name or ''
+    previous = getattr(instance, '_previous_image', None) or ''
+
+    if created:
+        storage.acquire(image)
+    elif previous != image:
+        storage.release(previous)
+        storage.acquire(image)
+
+
+@receiver(post_delete, sender=GeneratedCard)
+def release_image_reference(sender, instance, **kwargs):
+    storage.release(instance.image.name)
+
+
+@receiver(pre_delete, sender=GeneratedCard)
+def discard_series_archive(sender, instance, origin=None, **kwargs):
+    """
+    Готовый архив серии удаляется вместе с её карточками
+    Имя считается до удаления: после него серии уже нет
+    """
+    if not registry.is_series(instance.style):
+        return
+
+    # Сигнал приходит на каждую карточку: одно удаление (queryset.delete(),
+    # каскад от сборки) проверяет архив серии один раз
+    series = (instance.build_id, instance.style)
+    scheduled = getattr(origin, '_discarded_series', None)
+    if scheduled is None:
+        scheduled = set()
+        if origin is not None:
+            origin._discarded_series = scheduled
+    if series in scheduled:
+        return
+    scheduled.add(series)
+
+    archives.discard_series_archive(*series)
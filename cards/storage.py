@@ -0,0 +1,123 @@
+"""
+Хранилище файлов карточек, адресуемое содержимым
+
+Имя файла - sha256 от его байтов: cards/ab/cd/<hash>.<ext>. Одинаковые
+карточки хранятся одним файлом, файл под именем никогда не перезаписывается
+(его можно отдавать с Cache-Control: immutable), а два уровня шардирования
+держат каталоги небольшими. Запись и удаление идут через default_storage.
+
+На файлы ссылаются строки GeneratedCard: счётчик ссылок в StoredFile ведут
+сигналы (cards.signals). Файлы без ссылок удаляет collect() - не раньше,
+чем через CARDS_FILE_GRACE_PERIOD, чтобы кэш рендеринга успел их
+переиспользовать - а с ними и архивы серий, которых больше нет.
+"""
+
+from datetime import timedelta
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import StoredFile
+from . import archives, thumbnails
+
+
+CARD_DIR = 'cards'
+
+
+def content_name(data, ext):
+    """
+    Имя файла в хранилище для содержимого data
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    return f'{CARD_DIR}/{digest[:2]}/{digest[2:4]}/{digest}.{ext}'
+
+
+def save(data, ext):
+    """
+    Сохраняет содержимое (если такого файла ещё нет) и возвращает StoredFile
+    """
+    name = content_name(data, ext)
+    if not default_storage.exists(name):
+        saved = default_storage.save(name, ContentFile(data))
+        if saved != name:
+            # Другой воркер успел сохранить те же байты
+            default_storage.delete(saved)
+
+    stored, _ = StoredFile.objects.get_or_create(name=name, defaults={'size': len(data)})
+    return stored
+
+
+def acquire(name, count=1):
+    """
+    Добавляет count ссылок на файл
+    Файлы, сохранённые до хранилища по содержимому, регистрируются здесь же
+    """
+    if not name:
+        return
+
+    if not StoredFile.objects.filter(name=name).update(refcount=F('refcount') + count):
+        StoredFile.objects.get_or_create(name=name)
+        StoredFile.objects.filter(name=name).update(refcount=F('refcount') + count)
+
+
+def release(name, count=1):
+    """
+    Снимает count ссылок с файла; сам файл удаляется позже, в collect()
+    """
+    if not name:
+        return
+
+    StoredFile.objects.filter(name=name, refcount__gte=count).update(
+        refcount=F('refcount') - count,
+        released_at=timezone.now(),
+    )
+
+
+def grace_period():
+    return getattr(settings, 'CARDS_FILE_GRACE_PERIOD', 24 * 60 * 60)
+
+
+def garbage(grace=None, names=None):
+    """
+    Файлы без ссылок, с которых последнюю ссылку сняли больше grace секунд назад
+    (или которые так и не получили ни одной ссылки)
+    names: ограничить проверку этими именами
+    """
+    if grace is None:
+        grace = grace_period()
+    cutoff = timezone.now() - timedelta(seconds=grace)
+
+    files = StoredFile.objects.filter(refcount=0).filter(
+        Q(released_at__lte=cutoff) | Q(released_at__isnull=True, created_at__lte=cutoff)
+    )
+    if names is not None:
+        files = files.filter(name__in=names)
+    return files
+
+
+def collect(grace=None, names=None):
+    """
+    Удаляет файлы без ссылок вместе с миниатюрами и записями кэша рендеринга,
+    затем архивы серий, которых больше нет (archives.collect)
+    Возвращает (файлов, байт) удалено, включая архивы
+    """
+    deleted = freed = 0
+    for stored in list(garbage(grace, names)):
+        # Ссылка могла появиться после выборки - удаляем, только если её нет
+        _, per_model = StoredFile.objects.filter(pk=stored.pk, refcount=0).delete()
+        if not per_model.get(StoredFile._meta.label):
+            continue
+
+        for width in thumbnails.sizes():
+            default_storage.delete(thumbnails.thumbnail_name(stored.name, width))
+        default_storage.delete(stored.name)
+
+        deleted += 1
+        freed += stored.size
+
+    archives_deleted, archives_freed = archives.collect()
+    return deleted + archives_deleted, freed + archives_freed
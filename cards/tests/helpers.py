@@ -0,0 +1,56 @@
+"""
+Общие заготовки тестов: сборки с фото во временном MEDIA_ROOT
+"""
+
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+
+def photo_upload(size=(640, 480), name='pc.jpg'):
+    """
+    Небольшое JPEG-фото для поля PCBuild.photo
+    """
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.radial_gradient('L').resize(size).convert('RGB').save(buffer, 'JPEG', quality=85)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def make_build(**fields):
+    from cards.models import PCBuild
+
+    values = {
+        'name': 'Тестовый ПК',
+        'cpu': 'AMD Ryzen 7 7700X',
+        'gpu': 'RTX 4070 Super 12GB',
+        'ram': 'DDR5 32GB',
+        'storage': 'SSD 1TB',
+        'motherboard': 'B650',
+        'psu': '750W',
+        'price': 85000,
+        'photo': photo_upload(),
+    }
+    values.update(fields)
+    return PCBuild.objects.create(**values)
+
+
+class MediaTestCase(TestCase):
+    """
+    TestCase с отдельным временным MEDIA_ROOT на класс
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        media_settings.enable()
+        # Очистка классов идёт в обратном порядке: override_settings самого
+        # тестового класса снимается раньше, чем этот
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.addClassCleanup(media_settings.disable)
+        super().setUpClass()
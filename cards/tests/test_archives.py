@@ -0,0 +1,69 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from django.test import override_settings
+from django.urls import reverse
+
+from cards import archives, rendering, storage
+from cards.models import GeneratedCard
+
+from .helpers import MediaTestCase, make_build
+
+
+@override_settings(CARDS_SERIES_ARCHIVES=True, CARDS_FILE_GRACE_PERIOD=0)
+class SeriesArchiveTests(MediaTestCase):
+
+    def setUp(self):
+        self.build = make_build()
+        rendering.render_build(self.build, 'mixpc', workers=1)
+        self.archive = archives.find_series_archive(archives.series_cards(self.build.id, 'mixpc'))
+
+    def download(self):
+        return self.client.get(reverse('cards:download_mixpc_series', args=[self.build.id]))
+
+    def test_prebuilt_archive_is_served(self):
+        self.assertIsNotNone(self.archive)
+        self.assertIsInstance(self.download(), FileResponse)
+
+    def test_archive_is_ignored_when_disabled(self):
+        with override_settings(CARDS_SERIES_ARCHIVES=False):
+            response = self.download()
+
+        # FileResponse - тоже StreamingHttpResponse, проверяем именно его отсутствие
+        self.assertNotIsInstance(response, FileResponse)
+
+    def test_deleting_cards_deletes_archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            GeneratedCard.objects.filter(build=self.build).delete()
+
+        self.assertFalse(default_storage.exists(self.archive))
+
+    def test_series_delete_checks_archive_once(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            GeneratedCard.objects.filter(build=self.build).delete()
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_deleting_build_deletes_archive(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.build.delete()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(default_storage.exists(self.archive))
+
+    def test_rerender_keeps_archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rendering.render_build(self.build, 'mixpc', workers=1)
+
+        self.assertTrue(default_storage.exists(self.archive))
+        self.assertIsInstance(self.download(), FileResponse)
+
+    def test_collect_deletes_orphan_archives(self):
+        orphan = f'{archives.ARCHIVE_DIR}/00/{"0" * 64}.zip'
+        default_storage.save(orphan, ContentFile(b'stale'))
+        # Карточки удалены без коммита: архив серии остался, файлы - без ссылок
+        GeneratedCard.objects.filter(build=self.build).delete()
+
+        storage.collect(grace=0)
+
+        self.assertEqual(archives.archive_names(), [])
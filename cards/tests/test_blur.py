@@ -0,0 +1,83 @@
+from unittest import mock
+
+from PIL import Image, ImageChops, ImageFilter
+
+from django.test import SimpleTestCase
+
+from cards.generators import blur
+from cards.generators.base_generator import BaseCardGenerator
+
+
+class PlainGenerator(BaseCardGenerator):
+
+    CARD_SIZE = (64, 64)
+
+    def generate(self):
+        return Image.new('RGB', self.CARD_SIZE)
+
+
+class GlassEffectTests(SimpleTestCase):
+
+    def test_glass_effect_uses_generator_quality(self):
+        generator = PlainGenerator(None, quality='draft')
+        image = Image.new('RGBA', (64, 64), (200, 40, 40, 255))
+
+        with mock.patch.object(blur, 'blur', wraps=blur.blur) as blur_mock:
+            generator.add_glass_effect(image, blur_radius=12)
+
+        self.assertEqual(blur_mock.call_args.kwargs['quality'], 'draft')
+
+
+def max_difference(first, second, margin=0):
+    """
+    Наибольшее отличие по каналам, без полосы margin у краёв
+    """
+    box = (margin, margin, first.width - margin, first.height - margin)
+    diff = ImageChops.difference(first.crop(box), second.crop(box))
+    return max(high for _, high in diff.getextrema())
+
+
+class DownscaledBlurTests(SimpleTestCase):
+    """
+    Размытие в уменьшенном масштабе против точного GaussianBlur
+    (границы ошибки - из docstring generators.blur)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        size = (400, 320)
+        cls.photo = Image.merge('RGB', (
+            Image.effect_mandelbrot(size, (-2.2, -1.2, 1.0, 1.2), 64),
+            Image.linear_gradient('L').resize(size),
+            Image.radial_gradient('L').resize(size),
+        ))
+
+    def reference(self, radius):
+        return self.photo.filter(ImageFilter.GaussianBlur(radius))
+
+    def test_small_radius_is_exact(self):
+        self.assertEqual(blur.downscale_factor(5, blur.QUALITY['fast']), 1)
+        self.assertEqual(max_difference(blur.blur(self.photo, 5, 'fast'), self.reference(5)), 0)
+
+    def test_exact_quality_matches_gaussian(self):
+        self.assertEqual(max_difference(blur.blur(self.photo, 20, 'exact'), self.reference(20)), 0)
+
+    def test_fast_stays_close_to_gaussian(self):
+        for radius in (8, 15, 30):
+            with self.subTest(radius=radius):
+                result = blur.blur(self.photo, radius, 'fast')
+                self.assertEqual(result.size, self.photo.size)
+                self.assertLessEqual(max_difference(result, self.reference(radius), margin=3 * radius), 6)
+
+    def test_draft_error_is_bounded(self):
+        for radius in (6, 15):
+            with self.subTest(radius=radius):
+                result = blur.blur(self.photo, radius, 'draft')
+                self.assertLessEqual(max_difference(result, self.reference(radius)), 15)
+
+    def test_zero_radius_returns_copy(self):
+        result = blur.blur(self.photo, 0)
+
+        self.assertIsNot(result, self.photo)
+        self.assertEqual(max_difference(result, self.photo), 0)
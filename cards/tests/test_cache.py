@@ -0,0 +1,56 @@
+from unittest import mock
+
+from PIL import Image
+
+from django.test import SimpleTestCase
+
+from cards.generators.cache import ImageCache
+
+
+class ImageCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = ImageCache('tests', maxsize=2)
+
+    def image(self, color='red'):
+        return Image.new('RGB', (4, 4), color)
+
+    def test_factory_runs_once_per_key(self):
+        factory = mock.Mock(side_effect=self.image)
+
+        self.cache.get('a', factory)
+        self.cache.get('a', factory)
+
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_get_returns_copy(self):
+        first = self.cache.get('a', self.image)
+        first.putpixel((0, 0), (0, 0, 255))
+
+        self.assertEqual(self.cache.get('a', self.image).getpixel((0, 0)), (255, 0, 0))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.get('a', self.image)
+        self.cache.get('b', self.image)
+        # 'a' использован позже 'b' - вытесняется 'b'
+        self.cache.get('a', self.image)
+        self.cache.get('c', self.image)
+
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_failed_factory_is_not_cached(self):
+        with self.assertRaises(OSError):
+            self.cache.get('a', mock.Mock(side_effect=OSError))
+
+        self.assertNotIn('a', self.cache)
+        self.assertEqual(self.cache.get('a', self.image).size, (4, 4))
+
+    def test_clear_resets_stats(self):
+        self.cache.get('a', self.image)
+        self.cache.clear()
+
+        self.assertEqual(self.cache.stats()['size'], 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
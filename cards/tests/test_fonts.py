@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+
+from PIL import ImageFont
+
+from django.test import SimpleTestCase, override_settings
+
+from cards.generators.fonts import FONT_FAMILIES, FontRegistry
+
+
+class FontRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.registry = FontRegistry()
+
+    def test_font_is_loaded_once_per_size(self):
+        font = self.registry.get(24, weight='bold')
+
+        self.assertIs(self.registry.get(24, weight='bold'), font)
+        self.assertIsNot(self.registry.get(25, weight='bold'), font)
+
+    def test_path_is_resolved_once(self):
+        with override_settings(CARDS_FONT_DIRS=[]):
+            path = self.registry.resolve()
+
+        # Каталоги не перечитываются - путь уже в кэше
+        with override_settings(CARDS_FONT_DIRS=['/nonexistent']):
+            self.assertEqual(self.registry.resolve(), path)
+
+    def test_project_font_dirs_take_priority(self):
+        system = self.registry.resolve()
+        if system is None:
+            self.skipTest('В системе нет шрифта для копирования')
+
+        font_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, font_dir)
+        target = f'{font_dir}/{FONT_FAMILIES["sans"]["regular"]["files"][0]}'
+        shutil.copy(system, target)
+
+        with override_settings(CARDS_FONT_DIRS=[font_dir]):
+            self.assertEqual(FontRegistry().resolve(), target)
+
+    def test_unknown_family_falls_back_to_default_font(self):
+        font = self.registry.get(20, family='missing')
+
+        self.assertIsInstance(font, (ImageFont.FreeTypeFont, ImageFont.ImageFont))
+        self.assertIsNone(self.registry.resolve('missing'))
+
+    def test_preload_loads_every_size(self):
+        count = self.registry.preload({'regular': [10, 12], 'bold': [14]})
+
+        self.assertEqual(count, 3)
+        self.assertEqual(len(self.registry._fonts), 3)
@@ -0,0 +1,79 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from cards.models import GeneratedCard
+from cards.views import _encode_cursor
+
+from .helpers import make_build
+
+
+def make_cards(build, count, style='msi'):
+    """
+    Карточки без рендеринга с одинаковым created_at - худший случай для курсора
+    """
+    cards = [
+        GeneratedCard.objects.create(build=build, style=style, image=f'cards/00/00/{build.pk}-{i}.jpg')
+        for i in range(count)
+    ]
+    GeneratedCard.objects.filter(pk__in=[card.pk for card in cards]).update(created_at=timezone.now())
+    return list(GeneratedCard.objects.filter(pk__in=[card.pk for card in cards]).order_by('-id'))
+
+
+@override_settings(CARDS_GALLERY_PAGE_SIZE=2)
+class GalleryTests(TestCase):
+
+    def setUp(self):
+        self.build = make_build(photo='builds/pc.jpg')
+
+    def gallery(self, **params):
+        return self.client.get(reverse('cards:gallery'), params)
+
+    def test_style_is_urlencoded_in_pagination_links(self):
+        # Стиль из запроса попадает в ссылки как есть, даже если такого стиля нет
+        cards = make_cards(self.build, 4, style='msi&after=evil')
+
+        response = self.gallery(style='msi&after=evil', after=_encode_cursor(cards[0]))
+
+        self.assertContains(response, 'style=msi%26after%3Devil')
+        self.assertNotContains(response, 'style=msi&amp;after=evil')
+
+    def walk(self, **params):
+        """
+        Все страницы галереи по курсорам: список id карточек по страницам
+        """
+        pages = []
+        while True:
+            response = self.gallery(**params)
+            pages.append([card.id for card in response.context['cards']])
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                return pages
+            params['after'] = cursor
+
+    def test_pages_cover_every_card_once_with_equal_timestamps(self):
+        cards = make_cards(self.build, 5)
+
+        pages = self.walk()
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), [card.id for card in cards])
+
+    def test_full_last_page_has_no_next_cursor(self):
+        make_cards(self.build, 4)
+
+        self.assertEqual([len(page) for page in self.walk()], [2, 2])
+
+    def test_style_filter_applies_to_every_page(self):
+        msi = make_cards(self.build, 3)
+        make_cards(self.build, 3, style='steam')
+
+        self.assertEqual(sum(self.walk(style='msi'), []), [card.id for card in msi])
+
+    def test_broken_cursor_shows_first_page(self):
+        cards = make_cards(self.build, 3)
+
+        response = self.gallery(after='not-a-cursor')
+
+        self.assertTrue(response.context['is_first_page'])
+        self.assertEqual([card.id for card in response.context['cards']], [card.id for card in cards[:2]])
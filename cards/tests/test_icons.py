@@ -0,0 +1,65 @@
+import shutil
+import tempfile
+
+from PIL import Image
+
+from django.test import SimpleTestCase, override_settings
+
+from cards.generators import fonts, icons
+
+
+class IconAtlasTests(SimpleTestCase):
+
+    def setUp(self):
+        icons.atlas.clear()
+        self.addCleanup(icons.atlas.clear)
+
+    def test_builtin_icon_is_drawn_without_png(self):
+        with override_settings(CARDS_ICON_DIRS=[]):
+            sprite = icons.sprite('cpu', 32)
+
+        self.assertEqual(sprite.size, (32, 32))
+        self.assertIsNotNone(sprite.getchannel('A').getbbox())
+
+    def test_png_from_icon_dirs_replaces_builtin(self):
+        icon_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, icon_dir)
+        Image.new('RGBA', (64, 64), (255, 0, 0, 255)).save(f'{icon_dir}/gpu.png')
+
+        with override_settings(CARDS_ICON_DIRS=[icon_dir]):
+            sprite = icons.sprite('gpu', 16)
+
+        self.assertEqual(sprite.getpixel((8, 8)), (255, 0, 0, 255))
+
+    def test_sheet_is_built_once_per_size(self):
+        self.assertIs(icons.sheet(24), icons.sheet(24))
+        self.assertEqual(icons.sheet(24).size, (24 * len(icons.ICONS), 24))
+
+    def test_key_for_ignores_variation_selector(self):
+        self.assertEqual(icons.key_for(' ❄️ '), 'cooling')
+        self.assertEqual(icons.key_for('psu'), 'psu')
+        self.assertIsNone(icons.key_for('🚀'))
+
+
+class TextRunTests(SimpleTestCase):
+
+    def setUp(self):
+        self.font = fonts.get_font(20)
+        if getattr(self.font, 'path', None) is None:
+            self.skipTest('Нет TrueType-шрифта: проверка глифов недоступна')
+
+    def test_emoji_become_icon_runs(self):
+        text_runs = icons.runs(self.font, '🎮 RTX 4070')
+
+        self.assertEqual(text_runs, (icons.IconRun('gpu'), ' RTX 4070'))
+        self.assertIsInstance(text_runs[0], icons.IconRun)
+
+    def test_characters_without_glyph_are_skipped(self):
+        self.assertTrue(icons.has_glyph(self.font, 'Ж'))
+        self.assertFalse(icons.has_glyph(self.font, '\ue000'))
+
+        self.assertEqual(icons.runs(self.font, 'Ж\ue000Ж'), ('ЖЖ',))
+
+    def test_plain_text_is_detected(self):
+        self.assertTrue(icons.is_plain(icons.runs(self.font, 'DDR5 32GB'), 'DDR5 32GB'))
+        self.assertFalse(icons.is_plain(icons.runs(self.font, '💾 DDR5'), '💾 DDR5'))
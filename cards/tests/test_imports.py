@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class LazyImportTests(SimpleTestCase):
+
+    def run_fresh(self, code):
+        """
+        Выполняет код в свежем процессе с настройками проекта по умолчанию:
+        в тестовом процессе Pillow уже загружен другими тестами
+        """
+        code = textwrap.dedent(f'''
+            import os, sys
+            os.environ['DJANGO_SETTINGS_MODULE'] = {os.environ['DJANGO_SETTINGS_MODULE']!r}
+            import django
+            django.setup()
+        ''') + textwrap.dedent(code)
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        )
+        return result.stdout.strip()
+
+    def test_setup_does_not_import_pillow(self):
+        self.assertEqual(self.run_fresh("print('PIL' in sys.modules)"), 'False')
+
+    def test_urlconf_does_not_import_pillow(self):
+        output = self.run_fresh('''
+            import cards.urls, cards.models
+            print('PIL' in sys.modules)
+        ''')
+
+        self.assertEqual(output, 'False')
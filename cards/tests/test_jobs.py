@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from cards import jobs, rendering
+from cards.models import GeneratedCard, RenderJob
+
+from .helpers import MediaTestCase, make_build
+
+
+class RenderAtomicityTests(MediaTestCase):
+
+    def test_failed_render_leaves_no_cards(self):
+        build = make_build()
+
+        with mock.patch('cards.rendering.thumbnails.generate', side_effect=[{}, {}, OSError('disk full')]):
+            with self.assertRaises(OSError):
+                rendering.render_build(build, 'mixpc', workers=1)
+
+        self.assertFalse(GeneratedCard.objects.filter(build=build).exists())
+
+    def test_retried_job_does_not_duplicate_cards(self):
+        build = make_build()
+        job = jobs.enqueue(build, 'mixpc')
+
+        with mock.patch('cards.rendering.thumbnails.generate', side_effect=[{}, {}, OSError('disk full')]):
+            self.assertFalse(jobs.run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, RenderJob.STATUS_QUEUED)
+
+        self.assertTrue(jobs.run_job(job))
+        self.assertEqual(GeneratedCard.objects.filter(build=build).count(), rendering.card_count('mixpc'))
+
+
+class StaleJobTests(MediaTestCase):
+
+    def setUp(self):
+        self.build = make_build()
+
+    def stale_job(self, attempts):
+        job = jobs.enqueue(self.build, 'msi')
+        RenderJob.objects.filter(pk=job.pk).update(
+            status=RenderJob.STATUS_RUNNING,
+            attempts=attempts,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+        return job
+
+    def test_stale_job_is_requeued(self):
+        job = self.stale_job(attempts=1)
+
+        self.assertEqual(jobs.requeue_stale(600), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, RenderJob.STATUS_QUEUED)
+
+    def test_stale_job_without_attempts_left_fails(self):
+        job = self.stale_job(attempts=RenderJob._meta.get_field('max_attempts').default)
+
+        self.assertEqual(jobs.requeue_stale(600), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, RenderJob.STATUS_FAILED)
+        self.assertTrue(job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_running_job_is_left_alone(self):
+        job = self.stale_job(attempts=1)
+        RenderJob.objects.filter(pk=job.pk).update(started_at=timezone.now())
+
+        self.assertEqual(jobs.requeue_stale(600), (0, 0))
+
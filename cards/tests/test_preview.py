@@ -0,0 +1,34 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from .helpers import photo_upload
+
+
+class PreviewCardTests(TestCase):
+
+    def preview(self, **data):
+        return self.client.post(reverse('cards:preview'), {'style': 'msi', 'name': 'Превью', **data})
+
+    def test_preview_without_photo(self):
+        response = self.preview()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+
+    def test_truncated_photo_is_bad_request(self):
+        data = photo_upload(size=(800, 600)).read()
+        photo = SimpleUploadedFile('pc.jpg', data[:len(data) // 2], content_type='image/jpeg')
+
+        response = self.preview(photo=photo)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_not_an_image_is_bad_request(self):
+        photo = SimpleUploadedFile('pc.jpg', b'not an image', content_type='image/jpeg')
+
+        self.assertEqual(self.preview(photo=photo).status_code, 400)
+
+    def test_unknown_style_is_bad_request(self):
+        self.assertEqual(self.preview(style='neon').status_code, 400)
@@ -0,0 +1,95 @@
+from PIL import Image
+
+from django.http import FileResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from cards import jobs
+from cards.generators.base_generator import BaseCardGenerator
+from cards.generators.card_generator import CardGenerator
+from cards.generators.registry import GeneratorRegistry, registry
+
+from .helpers import MediaTestCase, make_build
+
+
+class TwoCardSeries(BaseCardGenerator):
+    """
+    Сторонний стиль-серия без собственного generate_series
+    """
+
+    CARD_SIZE = (40, 30)
+    SERIES_CARDS = ('generate_first', 'generate_second')
+
+    def generate(self):
+        return self.generate_first()
+
+    def generate_first(self):
+        return Image.new('RGB', self.CARD_SIZE, 'red')
+
+    def generate_second(self):
+        return Image.new('RGB', self.CARD_SIZE, 'blue')
+
+
+class RegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.registry = GeneratorRegistry(builtin={'msi': '.msi_style.MSIStyleGenerator'}, group='tests.none')
+        self.registry.register('pair', TwoCardSeries)
+
+    def test_listing_styles_does_not_import_them(self):
+        self.assertEqual(sorted(self.registry), ['msi', 'pair'])
+        self.assertFalse(self.registry.info('msi').is_loaded)
+
+    def test_series_metadata(self):
+        info = self.registry.info('pair')
+
+        self.assertEqual(info.card_count, 2)
+        self.assertEqual(info.size, (40, 30))
+
+    def test_series_style_renders_with_base_generator(self):
+        generator = CardGenerator(None, 'pair')
+        generator.GENERATORS = self.registry
+
+        images = generator.render('pair', workers=1)
+
+        self.assertEqual(sorted(images), [1, 2])
+        self.assertEqual(images[2].getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(list(generator.render('pair', numbers=[2], workers=2)), [2])
+
+
+@override_settings(
+    CARDS_STYLES={'pair': f'{__name__}.TwoCardSeries'},
+    CARDS_SERIES_ARCHIVES=True,
+)
+class SeriesStyleTests(MediaTestCase):
+    """
+    Стиль-серия из CARDS_STYLES получает страницу серии и архив, как MIXPC
+    """
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.build = make_build()
+
+    def test_registry_marks_series(self):
+        self.assertTrue(registry.is_series('pair'))
+        self.assertTrue(registry.is_series('mixpc'))
+        self.assertFalse(registry.is_series('msi'))
+        self.assertFalse(registry.is_series('unknown'))
+
+    def test_series_job_leads_to_series_page_and_archive(self):
+        job = jobs.enqueue(self.build, 'pair')
+        self.assertTrue(jobs.run_job(job))
+        job.refresh_from_db()
+
+        url = jobs.result_url(job)
+        self.assertEqual(url, reverse('cards:series_result', args=[self.build.id, 'pair']))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.get(reverse('cards:download_series', args=[self.build.id, 'pair']))
+        self.assertIsInstance(response, FileResponse)
+
+    def test_single_card_style_has_no_series_page(self):
+        response = self.client.get(reverse('cards:series_result', args=[self.build.id, 'msi']))
+
+        self.assertEqual(response.status_code, 404)
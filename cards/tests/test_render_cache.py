@@ -0,0 +1,53 @@
+from decimal import Decimal
+from unittest import mock
+
+from cards import render_cache, rendering
+from cards.generators.card_generator import CardGenerator
+from cards.generators.registry import registry
+
+from .helpers import MediaTestCase, make_build
+
+
+class RenderCacheTests(MediaTestCase):
+
+    def test_fingerprint_ignores_price_type(self):
+        build = make_build(price=85000)
+        before = render_cache.build_fingerprint(build)
+
+        build.refresh_from_db()
+        build.price = Decimal('85000.00')
+
+        self.assertEqual(render_cache.build_fingerprint(build), before)
+
+    def test_fingerprint_changes_with_inputs(self):
+        build = make_build()
+        before = render_cache.build_fingerprint(build)
+
+        build.gpu = 'RTX 4080 Super 16GB'
+
+        self.assertNotEqual(render_cache.build_fingerprint(build), before)
+
+    def test_key_depends_on_generator_version(self):
+        generator_class = registry['msi']
+        key = render_cache.cache_key('fp', 'msi', 1, generator_class, 'jpeg')
+
+        with mock.patch.object(generator_class, 'VERSION', generator_class.VERSION + 1):
+            self.assertNotEqual(render_cache.cache_key('fp', 'msi', 1, generator_class, 'jpeg'), key)
+
+    def test_same_inputs_reuse_rendered_file(self):
+        first = rendering.render_build(make_build(), 'msi')
+
+        with mock.patch.object(CardGenerator, 'render', wraps=None) as render:
+            second = rendering.render_build(make_build(), 'msi')
+
+        render.assert_not_called()
+        self.assertEqual(second[0].image.name, first[0].image.name)
+
+    def test_shared_cards_are_rendered_once_for_all_builds(self):
+        first = rendering.render_build(make_build(), 'mixpc', workers=1)
+        second = rendering.render_build(make_build(gpu='RTX 4090 24GB'), 'mixpc', workers=1)
+
+        names = lambda cards: {card.card_number: card.image.name for card in cards}
+        for number in registry.info('mixpc').shared_cards:
+            self.assertEqual(names(first)[number], names(second)[number])
+        self.assertNotEqual(names(first)[1], names(second)[1])
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+
+from django.core.management import call_command
+
+from cards.models import GeneratedCard
+
+from .helpers import MediaTestCase, make_build
+
+
+class RenderCardsCommandTests(MediaTestCase):
+
+    def setUp(self):
+        self.builds = [make_build(name=f'ПК {i}') for i in range(2)]
+        directory = tempfile.mkdtemp(dir=self.media_root)
+        self.checkpoint = os.path.join(directory, 'render_cards.checkpoint')
+
+    def render(self, **options):
+        stdout = io.StringIO()
+        call_command(
+            'render_cards', processes=1, checkpoint=self.checkpoint,
+            stdout=stdout, stderr=io.StringIO(), **options
+        )
+        return stdout.getvalue()
+
+    def test_second_run_renders_again(self):
+        self.render(styles='msi')
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        output = self.render(styles='msi')
+
+        self.assertNotIn('Нечего рендерить', output)
+        self.assertIn('Готово: 2 карточек', output)
+        # Повторный рендеринг заменяет карточки, а не добавляет
+        self.assertEqual(GeneratedCard.objects.filter(style='msi').count(), len(self.builds))
+
+    def test_checkpoint_of_other_arguments_is_ignored(self):
+        with open(self.checkpoint, 'w') as f:
+            f.write('# other-run\n')
+            f.writelines(f'{build.id}\n' for build in self.builds)
+
+        output = self.render(styles='spotify')
+
+        self.assertIn('Готово: 2 карточек', output)
+        self.assertEqual(GeneratedCard.objects.filter(style='spotify').count(), len(self.builds))
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        self.render(styles='msi')
+        first = self.builds[0]
+
+        # Чекпоинт прерванного запуска с теми же аргументами
+        command_key = self._run_key('msi')
+        with open(self.checkpoint, 'w') as f:
+            f.write(f'# {command_key}\n{first.id}\n')
+
+        output = self.render(styles='msi')
+
+        self.assertIn('пропускаем 1 готовых сборок', output)
+        self.assertIn('Готово: 1 карточек', output)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def _run_key(self, styles):
+        from cards.management.commands.render_cards import Command
+
+        return Command()._run_key([styles], {'filter': []}, None)
@@ -0,0 +1,113 @@
+import io
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+
+from cards import storage, thumbnails
+from cards.models import GeneratedCard, StoredFile
+
+from .helpers import MediaTestCase, make_build
+
+
+class ContentStorageTests(MediaTestCase):
+
+    def setUp(self):
+        self.build = make_build()
+
+    def stored(self, data=b'card'):
+        return storage.save(data, 'jpg')
+
+    def card(self, name):
+        card = GeneratedCard(build=self.build, style='msi')
+        card.image.name = name
+        card.save()
+        return card
+
+    def refcount(self, name):
+        return StoredFile.objects.get(name=name).refcount
+
+    def test_name_is_sharded_content_hash(self):
+        name = storage.content_name(b'card', 'jpg')
+        digest = name.rsplit('/', 1)[1].split('.')[0]
+
+        self.assertEqual(name, f'cards/{digest[:2]}/{digest[2:4]}/{digest}.jpg')
+
+    def test_same_bytes_are_stored_once(self):
+        first = self.stored()
+        second = self.stored()
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(StoredFile.objects.count(), 1)
+        with default_storage.open(first.name, 'rb') as f:
+            self.assertEqual(f.read(), b'card')
+
+    def test_cards_count_references(self):
+        name = self.stored().name
+        first = self.card(name)
+        self.card(name)
+        self.assertEqual(self.refcount(name), 2)
+
+        first.delete()
+        self.assertEqual(self.refcount(name), 1)
+
+    def test_replacing_image_moves_reference(self):
+        old = self.stored(b'old').name
+        new = self.stored(b'new').name
+        card = self.card(old)
+
+        card.image.name = new
+        card.save()
+
+        self.assertEqual(self.refcount(old), 0)
+        self.assertEqual(self.refcount(new), 1)
+
+    def test_release_never_goes_negative(self):
+        name = self.stored().name
+
+        storage.release(name)
+
+        self.assertEqual(self.refcount(name), 0)
+
+    def test_collect_waits_for_grace_period(self):
+        name = self.stored().name
+        self.card(name).delete()
+
+        self.assertEqual(storage.collect(grace=3600), (0, 0))
+        self.assertTrue(default_storage.exists(name))
+
+        StoredFile.objects.filter(name=name).update(released_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(storage.collect(grace=3600), (1, len(b'card')))
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_collect_removes_thumbnails(self):
+        name = self.stored().name
+        thumbnail = thumbnails.thumbnail_name(name, thumbnails.sizes()[0])
+        default_storage.save(thumbnail, ContentFile(b'thumb'))
+
+        storage.collect(grace=0)
+
+        self.assertFalse(default_storage.exists(thumbnail))
+
+    def test_collect_keeps_referenced_files(self):
+        name = self.stored().name
+        self.card(name)
+
+        storage.collect(grace=0)
+
+        self.assertTrue(default_storage.exists(name))
+
+    def test_recount_fixes_counts_after_bulk_update(self):
+        old = self.stored(b'old').name
+        new = self.stored(b'new').name
+        self.card(old)
+        # update() не вызывает сигналы - счётчики расходятся
+        GeneratedCard.objects.update(image=new)
+
+        call_command('collect_card_files', recount=True, dry_run=True, stdout=io.StringIO())
+
+        self.assertEqual(self.refcount(old), 0)
+        self.assertEqual(self.refcount(new), 1)
@@ -0,0 +1,106 @@
+"""
+Миниатюры карточек для галерей (WebP 200/400/800 px)
+
+Миниатюры строятся при сохранении карточки рендерингом, их имена хранятся
+в GeneratedCard.thumbnails. Для карточек без миниатюр шаблоны ссылаются на
+cards:card_thumbnail, который создаёт их при первом запросе.
+Имя миниатюры выводится из имени исходного файла, поэтому карточки,
+разделяющие файл через кэш рендеринга, делят и миниатюры.
+"""
+
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+
+THUMBNAIL_DIR = 'thumbs'
+
+# Размер для src (браузеры без srcset)
+DEFAULT_WIDTH = 400
+
+
+def sizes():
+    return tuple(getattr(settings, 'CARDS_THUMBNAIL_SIZES', (200, 400, 800)))
+
+
+def thumbnail_name(image_name, width):
+    """
+    Имя миниатюры ширины width для исходного файла
+    """
+    stem = os.path.splitext(image_name)[0]
+    return f'{THUMBNAIL_DIR}/{width}/{stem}.webp'
+
+
+def generate(image_name, widths=None):
+    """
+    Создаёт недостающие миниатюры исходного файла
+    Возвращает {'ширина': имя файла} для всех запрошенных ширин
+    """
+    widths = sorted(widths or sizes(), reverse=True)
+    names = {str(width): thumbnail_name(image_name, width) for width in widths}
+
+    missing = [width for width in widths if not default_storage.exists(names[str(width)])]
+    if not missing:
+        return names
+
+    from PIL import Image
+
+    with default_storage.open(image_name, 'rb') as f:
+        source = Image.open(f)
+        source.load()
+    source = source.convert('RGB')
+
+    # От большей к меньшей: каждая следующая уменьшается из предыдущей
+    current = source
+    for width in widths:
+        if width < current.width:
+            height = max(1, round(current.height * width / current.width))
+            current = current.resize((width, height), Image.Resampling.LANCZOS)
+
+        if width in missing:
+            _save(names[str(width)], current)
+
+    return names
+
+
+def _save(name, image):
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=80, method=4)
+    saved = default_storage.save(name, ContentFile(buffer.getvalue()))
+    if saved != name:
+        # Параллельная генерация той же миниатюры
+        default_storage.delete(saved)
+
+
+def ensure(card):
+    """
+    Достраивает миниатюры карточки и записывает их в модель
+    """
+    if not card.image:
+        return {}
+
+    if set(card.thumbnails) >= {str(width) for width in sizes()}:
+        return card.thumbnails
+
+    card.thumbnails = generate(card.image.name)
+    type(card).objects.filter(pk=card.pk).update(thumbnails=card.thumbnails)
+    return card.thumbnails
+
+
+def url(card, width=None):
+    """
+    URL миниатюры: файл, если она уже есть, иначе ленивая генерация
+    """
+    width = width or DEFAULT_WIDTH
+    name = card.thumbnails.get(str(width))
+    if name:
+        return default_storage.url(name)
+    return reverse('cards:card_thumbnail', kwargs={'card_id': card.pk, 'width': width})
+
+
+def srcset(card):
+    return ', '.join(f'{url(card, width)} {width}w' for width in sizes())
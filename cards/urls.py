@@ -13,12 +13,25 @@ urlpatterns = [
     
     # Создание
     path('create/', views.create_card, name='create'),
+    path('create/preview/', views.preview_card, name='preview'),
     path('presets/', views.presets, name='presets'),
     
+    # Фоновый рендеринг
+    path('job/<int:job_id>/', views.job_status, name='job_status'),
+    path('job/<int:job_id>/progress/', views.job_progress, name='job_progress'),
+    
     # Просмотр
     path('card/<int:card_id>/', views.card_detail, name='card_detail'),
+    path('card/<int:card_id>/thumb/<int:width>/', views.card_thumbnail, name='card_thumbnail'),
+    
+    # Все карточки сборки
+    path('build/<int:build_id>/', views.build_result, name='build_result'),
+    
+    # Серии карточек (стили с несколькими карточками)
+    path('series/<int:build_id>/<str:style>/', views.series_result, name='series_result'),
+    path('series/<int:build_id>/<str:style>/download/', views.download_series, name='download_series'),
     
-    # MIXPC Series
-    path('mixpc/<int:build_id>/', views.mixpc_result, name='mixpc_result'),
-    path('mixpc/<int:build_id>/download/', views.download_mixpc_series, name='download_mixpc_series'),
+    # MIXPC Series - прежние адреса
+    path('mixpc/<int:build_id>/', views.series_result, {'style': 'mixpc'}, name='mixpc_result'),
+    path('mixpc/<int:build_id>/download/', views.download_series, {'style': 'mixpc'}, name='download_mixpc_series'),
 ]
@@ -1,26 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponse, FileResponse, JsonResponse
-from .models import PCBuild, GeneratedCard
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, FileResponse, JsonResponse, StreamingHttpResponse
+from django.core.files.storage import default_storage
+from django.utils.http import content_disposition_header
+from .models import PCBuild, GeneratedCard, RenderJob
 from .forms import PCBuildForm
-from .generators import (
-    MSIStyleGenerator,
-    SteamStyleGenerator,
-    AppleStyleGenerator,
-    SpotifyStyleGenerator,
-    MIXPCSeriesGenerator
-)
-from PIL import Image
-import zipfile
+from . import archives, jobs, rendering, thumbnails
+from django.db.models import Q
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from types import SimpleNamespace
+import base64
+import functools
 import io
-import os
 import json
+import time
 from django.conf import settings
 
 
 def index(request):
     """Главная страница с недавними карточками"""
-    recent_cards = GeneratedCard.objects.select_related('build').order_by('-created_at')[:6]
+    recent_cards = GeneratedCard.objects.select_related('build').order_by('-created_at', '-id')[:6]
     
     context = {
         'recent_cards': recent_cards,
@@ -28,22 +28,70 @@ def index(request):
     return render(request, 'cards/index.html', context)
 
 
+# Колонки, которые нужны шаблону галереи
+GALLERY_FIELDS = (
+    'id', 'style', 'card_number', 'image', 'thumbnails', 'created_at',
+    'build__id', 'build__name', 'build__cpu', 'build__price',
+)
+
+
 def gallery(request):
-    """Галерея всех сгенерированных карточек"""
-    cards = GeneratedCard.objects.select_related('build').order_by('-created_at')
+    """Галерея всех сгенерированных карточек (keyset-пагинация по created_at, id)"""
+    page_size = getattr(settings, 'CARDS_GALLERY_PAGE_SIZE', 24)
+    
+    cards = (
+        GeneratedCard.objects
+        .select_related('build')
+        .only(*GALLERY_FIELDS)
+        .order_by('-created_at', '-id')
+    )
     
     # Фильтр по стилю
     style = request.GET.get('style')
     if style:
         cards = cards.filter(style=style)
     
+    # Курсор - последняя карточка предыдущей страницы
+    cursor = _decode_cursor(request.GET.get('after'))
+    if cursor:
+        created_at, card_id = cursor
+        cards = cards.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=card_id))
+    
+    # Лишняя карточка показывает, есть ли следующая страница
+    cards = list(cards[:page_size + 1])
+    next_cursor = None
+    if len(cards) > page_size:
+        cards = cards[:page_size]
+        next_cursor = _encode_cursor(cards[-1])
+    
     context = {
         'cards': cards,
         'current_style': style,
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
     }
     return render(request, 'cards/gallery.html', context)
 
 
+def _encode_cursor(card):
+    value = f'{card.created_at.isoformat()}|{card.id}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(value):
+    """
+    (created_at, id) из курсора или None, если курсора нет или он испорчен
+    """
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        created_at, card_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(card_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
 def mixpc_gallery(request):
     """Специальная галерея для MIXPC Series"""
     return render(request, 'cards/mixpc_gallery.html')
@@ -55,71 +103,21 @@ def create_card(request):
         form = PCBuildForm(request.POST, request.FILES)
         
         if form.is_valid():
-            try:
-                # Создаём PCBuild
-                build = form.save()
-                
-                # Стиль
-                style = request.POST.get('style', 'msi')
-                
-                # Генерируем карточку
-                generator_map = {
-                    'msi': MSIStyleGenerator,
-                    'steam': SteamStyleGenerator,
-                    'apple': AppleStyleGenerator,
-                    'spotify': SpotifyStyleGenerator,
-                    'mixpc': MIXPCSeriesGenerator,
-                }
-                
-                generator_class = generator_map.get(style, MSIStyleGenerator)
-                generator = generator_class(build)
-                
-                # Генерация серии или одной карточки
-                if style == 'mixpc':
-                    cards = generator.generate_series()
-                    
-                    # Сохраняем все карточки
-                    generated_cards = []
-                    for i, card_image in enumerate(cards, 1):
-                        # Сохраняем во временный файл
-                        temp_path = os.path.join(settings.MEDIA_ROOT, 'generated', f'{build.id}_card_{i}.png')
-                        os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-                        card_image.save(temp_path, 'PNG')
-                        
-                        # Создаём запись в БД
-                        card = GeneratedCard.objects.create(
-                            build=build,
-                            style=style,
-                            card_number=i
-                        )
-                        card.image.name = f'generated/{build.id}_card_{i}.png'
-                        card.save()
-                        generated_cards.append(card)
-                    
-                    messages.success(request, f'✅ Серия из {len(cards)} карточек успешно создана!')
-                    return redirect('cards:mixpc_result', build_id=build.id)
-                else:
-                    # Одна карточка
-                    card_image = generator.generate()
-                    
-                    # Сохраняем
-                    temp_path = os.path.join(settings.MEDIA_ROOT, 'generated', f'{build.id}_card.png')
-                    os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-                    card_image.save(temp_path, 'PNG')
-                    
-                    card = GeneratedCard.objects.create(
-                        build=build,
-                        style=style
-                    )
-                    card.image.name = f'generated/{build.id}_card.png'
-                    card.save()
-                    
-                    messages.success(request, '✅ Карточка успешно создана!')
-                    return redirect('cards:card_detail', card_id=card.id)
-                    
-            except Exception as e:
-                messages.error(request, f'❌ Ошибка при создании карточки: {str(e)}')
-                return redirect('cards:create')
+            # Создаём PCBuild
+            build = form.save()
+            
+            # Стиль
+            style = request.POST.get('style', rendering.DEFAULT_STYLE)
+            if style not in rendering.GENERATOR_MAP and style != rendering.ALL_STYLES:
+                style = rendering.DEFAULT_STYLE
+            
+            # Рендеринг идёт в фоновом воркере, страница статуса опрашивает прогресс
+            job = jobs.enqueue(build, style)
+            
+            if getattr(settings, 'CARDS_RENDER_IN_REQUEST', False):
+                jobs.run_inline(job)
+            
+            return redirect('cards:job_status', job_id=job.id)
         else:
             # Ошибки валидации
             for field, errors in form.errors.items():
@@ -161,42 +159,189 @@ def create_card(request):
     return render(request, 'cards/create.html', context)
 
 
-def mixpc_result(request, build_id):
-    """Страница результата для MIXPC Series"""
+# Поля формы создания, из которых собирается сборка для превью
+PREVIEW_FIELDS = ('name', 'cpu', 'gpu', 'ram', 'storage', 'motherboard', 'psu', 'case', 'cooling')
+
+
+def preview_card(request):
+    """Превью карточки по данным формы создания: ни сборка, ни файлы не сохраняются"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    
+    # Pillow и модули рендеринга - только для этого представления, не при импорте URL
+    from PIL import Image
+    from .generators import photos
+    
+    started = time.perf_counter()
+    
+    # Для 'все стили' показываем стиль по умолчанию
+    style = request.POST.get('style', rendering.DEFAULT_STYLE)
+    if style == rendering.ALL_STYLES:
+        style = rendering.DEFAULT_STYLE
+    if style not in rendering.GENERATOR_MAP:
+        return JsonResponse({'error': f'Неизвестный стиль: {style}'}, status=400)
+    
+    # Сборка только в памяти, длина полей - как у модели
+    build = PCBuild(
+        price=_parse_price(request.POST.get('price')),
+        **{
+            field: request.POST.get(field, '')[:PCBuild._meta.get_field(field).max_length]
+            for field in PREVIEW_FIELDS
+        }
+    )
+    upload = request.FILES.get('photo')
+    photo = photos.PhotoData(upload.read()) if upload else _placeholder_photo()
+    # Генераторам достаточно path (см. generators.photos.PhotoData)
+    build.photo = SimpleNamespace(path=photo, name='preview')
+    
+    try:
+        number = int(request.POST.get('number', 1))
+        encoded = rendering.render_preview(build, style, number)
+    # Битое или обрезанное фото: Pillow бросает OSError при декодировании
+    except (ValueError, OSError, Image.DecompressionBombError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    response = HttpResponse(encoded.data, content_type=Image.MIME[encoded.format])
+    response['Cache-Control'] = 'no-store'
+    response['Server-Timing'] = f'render;dur={(time.perf_counter() - started) * 1000:.1f}'
+    return response
+
+
+def _parse_price(value):
+    """
+    Цена из поля формы; пустая или некорректная - 0
+    """
+    try:
+        price = Decimal(value or 0)
+    except InvalidOperation:
+        return Decimal(0)
+    return price if price.is_finite() else Decimal(0)
+
+
+@functools.lru_cache(maxsize=1)
+def _placeholder_photo():
+    """
+    Заглушка вместо фото, пока оно не выбрано в форме
+    """
+    from PIL import Image
+    from .generators import photos
+    
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), (40, 40, 48)).save(buffer, 'PNG')
+    return photos.PhotoData(buffer.getvalue())
+
+
+def job_status(request, job_id):
+    """Страница ожидания фонового рендеринга"""
+    job = get_object_or_404(RenderJob.objects.select_related('build'), id=job_id)
+    
+    # Уже готово - сразу к результату
+    url = jobs.result_url(job)
+    if url:
+        if job.style == rendering.ALL_STYLES:
+            messages.success(request, f'✅ Карточки во всех стилях ({job.total} шт.) успешно созданы!')
+        elif rendering.GENERATOR_MAP.is_series(job.style):
+            messages.success(request, f'✅ Серия из {job.total} карточек успешно создана!')
+        else:
+            messages.success(request, '✅ Карточка успешно создана!')
+        return redirect(url)
+    
+    context = {
+        'job': job,
+    }
+    return render(request, 'cards/job_status.html', context)
+
+
+def job_progress(request, job_id):
+    """JSON с прогрессом задачи для опроса со страницы статуса"""
+    job = get_object_or_404(RenderJob, id=job_id)
+    
+    return JsonResponse({
+        'id': job.id,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress,
+        'total': job.total,
+        'percent': job.progress_percent(),
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'error': job.error.strip().splitlines()[-1] if job.error else '',
+        'result_url': jobs.result_url(job),
+    })
+
+
+def _series_style(style):
+    """Стиль-серия из URL; для остальных стилей страницы серии нет"""
+    if not rendering.GENERATOR_MAP.is_series(style):
+        raise Http404('Стиль не рендерится серией')
+    return style
+
+
+def series_result(request, build_id, style):
+    """Страница результата для серии карточек (MIXPC Series и другие стили-серии)"""
+    style = _series_style(style)
     build = get_object_or_404(PCBuild, id=build_id)
-    cards = GeneratedCard.objects.filter(build=build, style='mixpc').order_by('card_number')
+    cards = GeneratedCard.objects.filter(build=build, style=style).order_by('card_number')
     
     context = {
         'build': build,
         'cards': cards,
+        'series_style': style,
     }
     return render(request, 'cards/mixpc_result.html', context)
 
 
-def download_mixpc_series(request, build_id):
-    """Скачать всю серию MIXPC в ZIP"""
+def build_result(request, build_id):
+    """Все карточки сборки (после рендеринга во всех стилях)"""
     build = get_object_or_404(PCBuild, id=build_id)
-    cards = GeneratedCard.objects.filter(build=build, style='mixpc').order_by('card_number')
+    cards = GeneratedCard.objects.filter(build=build).select_related('build').order_by('style', 'card_number')
     
-    # Создаём ZIP в памяти
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for card in cards:
-            if card.image:
-                # Добавляем файл в архив
-                file_path = card.image.path
-                arcname = f'card_{card.card_number}.png'
-                zip_file.write(file_path, arcname)
+    # ZIP - по первой серии среди карточек сборки
+    styles = set(cards.values_list('style', flat=True))
+    context = {
+        'build': build,
+        'cards': cards,
+        'series_style': next((style for style in rendering.GENERATOR_MAP.series_styles() if style in styles), None),
+    }
+    return render(request, 'cards/mixpc_result.html', context)
+
+
+def download_series(request, build_id, style):
+    """Скачать всю серию в ZIP (потоком, без сборки архива в памяти)"""
+    style = _series_style(style)
+    build = get_object_or_404(PCBuild, id=build_id)
+    cards = archives.series_cards(build.id, style)
+    filename = f'{build.name}_{style.upper()}_Series.zip'
     
-    zip_buffer.seek(0)
+    # Готовый архив - обычный файл, отдаётся через file_wrapper/sendfile
+    name = archives.find_series_archive(cards) if archives.is_enabled() else None
+    if name:
+        return FileResponse(
+            default_storage.open(name, 'rb'),
+            as_attachment=True,
+            filename=filename,
+            content_type='application/zip',
+        )
     
-    response = HttpResponse(zip_buffer, content_type='application/zip')
-    response['Content-Disposition'] = f'attachment; filename="{build.name}_MIXPC_Series.zip"'
+    response = StreamingHttpResponse(archives.stream_zip(cards), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
     
     return response
 
 
+def card_thumbnail(request, card_id, width):
+    """Миниатюра карточки; при первом запросе создаётся и сохраняется"""
+    if width not in thumbnails.sizes():
+        raise Http404('Неизвестный размер миниатюры')
+    
+    card = get_object_or_404(GeneratedCard.objects.only('id', 'image', 'thumbnails'), id=card_id)
+    names = thumbnails.ensure(card)
+    if str(width) not in names:
+        raise Http404('У карточки нет изображения')
+    
+    return redirect(default_storage.url(names[str(width)]))
+
+
 def card_detail(request, card_id):
     """Детали одной карточки"""
     card = get_object_or_404(GeneratedCard, id=card_id)
@@ -132,3 +132,79 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
+
+# Рендеринг карточек
+# Сколько фонов макетов (фон со статичным префиксом) держать в кэше каждого воркера.
+# Ключ включает размер: превью формы создания добавляют свои (маленькие) фоны
+CARDS_BACKGROUND_CACHE_SIZE = 24
+
+# Прогревать все кэши рендеринга при старте (шрифты, фоны, спрайты, тени, иконки).
+# Без прогрева старт приложения не загружает Pillow: шрифты грузятся при первом рендеринге
+# С gunicorn --preload прогрев делается один раз в мастере и общий для воркеров
+CARDS_WARM_UP = False
+
+# Дополнительные стили карточек: {стиль: 'module.Class'} (также entry points 'partmart_cards.styles')
+CARDS_STYLES = {}
+
+# Дополнительные каталоги со шрифтами (приоритетнее cards/fonts/ и системных)
+CARDS_FONT_DIRS = []
+
+# Дополнительные каталоги с PNG иконками характеристик <ключ>.png (приоритетнее cards/icons/)
+CARDS_ICON_DIRS = []
+
+# Сколько подготовленных фото (мастер + размеры под стили) держать в кэше воркера
+CARDS_PHOTO_CACHE_SIZE = 16
+
+# Сколько карточек серии MIXPC рендерить параллельно (None - по числу ядер, 1 - последовательно)
+CARDS_RENDER_WORKERS = None
+
+# Очередь рендеринга (manage.py render_worker)
+CARDS_JOB_MAX_ATTEMPTS = 3
+CARDS_JOB_RETRY_DELAY = 5          # секунд, удваивается с каждой попыткой
+CARDS_JOB_STALE_TIMEOUT = 600      # задачи "выполняется" дольше этого возвращаются в очередь
+CARDS_WORKER_MAX_JOBS = 100        # перезапуск процесса воркера после N задач
+CARDS_WORKER_POLL_INTERVAL = 1.0
+
+# Рендерить прямо в запросе, без воркера (удобно для runserver)
+CARDS_RENDER_IN_REQUEST = DEBUG
+
+# Кэш готовых карточек по хэшу входных данных: ключ (RenderCacheEntry) ссылается на файл
+# в хранилище по содержимому media/cards/ab/cd/<sha256>.<ext> (см. cards.storage)
+CARDS_RENDER_CACHE = True
+
+# Профили вывода: {'стиль' или 'стиль:номер': 'jpeg' | 'webp' | 'avif' | 'png' | 'palette'}
+# (по умолчанию - cards.generators.encoders.DEFAULT_STYLE_PROFILES)
+CARDS_OUTPUT_PROFILES = {}
+
+# Потоков кодирования изображений (None - по числу ядер)
+CARDS_ENCODE_WORKERS = None
+
+# Собирать ZIP серии MIXPC сразу после рендеринга (media/archives/) и отдавать готовым файлом
+CARDS_SERIES_ARCHIVES = False
+
+# Ширины WebP-миниатюр для галерей (srcset)
+CARDS_THUMBNAIL_SIZES = (200, 400, 800)
+
+# Карточек на странице галереи
+CARDS_GALLERY_PAGE_SIZE = 24
+
+# Замер времени этапов рендеринга в GeneratedCard.render_timings (разбивка в админке)
+CARDS_PROFILE_STAGES = False
+
+# Спрайтов теней в кэше процесса (по размеру фото и параметрам тени)
+CARDS_SHADOW_CACHE_SIZE = 16
+
+# Листов атласа иконок в кэше процесса (по одному на размер иконки)
+CARDS_ICON_CACHE_SIZE = 16
+
+# Размер превью карточки в форме создания (по большей стороне), пикселей
+CARDS_PREVIEW_SIZE = 360
+
+# Качество размытия стеклянных эффектов: 'draft', 'fast' (по умолчанию) или 'exact'
+CARDS_BLUR_QUALITY = 'fast'
+
+# Спрайтов статичных слоёв макетов (логотипы, заголовки поверх фото) в кэше процесса
+CARDS_STATIC_LAYER_CACHE_SIZE = 32
+
+# Файлы карточек без ссылок удаляются collect_card_files не раньше, чем через столько секунд
+CARDS_FILE_GRACE_PERIOD = 24 * 60 * 60
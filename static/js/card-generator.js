@@ -40,8 +40,74 @@ forms.forEach(form => {
     });
 });
 
-// Notification auto-hide
-const messages = document.querySelectorAll('.glass-panel[class*="border"]');
+// Live card preview: debounced low-resolution renders, nothing is saved on the server
+const previewForm = document.querySelector('form[data-preview-url]');
+if (previewForm) {
+    const previewImage = document.getElementById('card-preview');
+    const PREVIEW_DELAY = 300;
+    const PREVIEW_PHOTO_SIZE = 800;
+    let previewTimer = null;
+    let previewRequest = null;
+    let previewPhoto = null;
+
+    // Photo is downscaled once in the browser, previews never upload the original file
+    const downscalePhoto = async (file) => {
+        const bitmap = await createImageBitmap(file);
+        const scale = Math.min(1, PREVIEW_PHOTO_SIZE / Math.max(bitmap.width, bitmap.height));
+        const canvas = document.createElement('canvas');
+        canvas.width = Math.round(bitmap.width * scale);
+        canvas.height = Math.round(bitmap.height * scale);
+        canvas.getContext('2d').drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+        bitmap.close();
+        return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.85));
+    };
+
+    const updatePreview = async () => {
+        // Only the latest form state matters
+        if (previewRequest) previewRequest.abort();
+        previewRequest = new AbortController();
+
+        const data = new FormData(previewForm);
+        data.delete('photo');
+        if (previewPhoto) data.append('photo', previewPhoto, 'preview.jpg');
+
+        previewImage.style.opacity = '0.6';
+        try {
+            const response = await fetch(previewForm.dataset.previewUrl, {
+                method: 'POST',
+                body: data,
+                signal: previewRequest.signal,
+            });
+            if (!response.ok) return;
+
+            const blob = await response.blob();
+            if (previewImage.src.startsWith('blob:')) URL.revokeObjectURL(previewImage.src);
+            previewImage.src = URL.createObjectURL(blob);
+            previewImage.style.opacity = '1';
+        } catch (error) {
+            if (error.name !== 'AbortError') console.warn('Card preview failed:', error);
+        }
+    };
+
+    const schedulePreview = () => {
+        clearTimeout(previewTimer);
+        previewTimer = setTimeout(updatePreview, PREVIEW_DELAY);
+    };
+
+    previewForm.addEventListener('input', schedulePreview);
+    previewForm.addEventListener('change', async (e) => {
+        if (e.target.type === 'file') {
+            const file = e.target.files[0];
+            previewPhoto = file ? await downscalePhoto(file).catch(() => null) : null;
+        }
+        schedulePreview();
+    });
+
+    schedulePreview();
+}
+
+// Notification auto-hide (messages markup of base.html and base_steam.html)
+const messages = document.querySelectorAll('.glass-panel[class*="message-"], .glass-card.border-l-4');
 messages.forEach(msg => {
     setTimeout(() => {
         msg.style.transition = 'all 0.5s ease';
@@ -68,8 +134,10 @@ images.forEach(img => {
     });
 });
 
-// Add parallax effect to hero section
+// Add parallax effect to hero section (not on the create form: its panels are inputs)
 window.addEventListener('scroll', () => {
+    if (previewForm) return;
+
     const scrolled = window.pageYOffset;
     const parallaxElements = document.querySelectorAll('.glass-panel');
     